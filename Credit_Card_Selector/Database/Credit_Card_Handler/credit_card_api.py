@@ -3,13 +3,22 @@ from Credit_Card_Selector.Database.general_utils import get_logger
 from Credit_Card_Selector.Database.Credit_Card_Handler.credit_card_handler import (
     find_existing_credit_card, CREDIT_CARDS_COLLECTION
 )
-from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.database_operations import fetch_all_cards
-from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.card_filtering import apply_manual_filters
-from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import CARD_FETCH_LIMIT
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.card_catalogue import card_catalogue
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.card_filtering import filter_catalogue_cards
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.database_operations import fetch_page
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
+    INTERNAL_CARD_FIELDS
+)
 
 # Configure module logger
 logger = get_logger(__file__)
 
+
+def public_card_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a card payload without the fields that only exist for storage, such as Card_ID_lower."""
+    return {key: value for key, value in payload.items() if key not in INTERNAL_CARD_FIELDS}
+
+
 def get_all_credit_cards() -> Tuple[List[Dict[str, Any]], Optional[str]]:
     """
     Get all credit cards from the database.
@@ -20,14 +29,14 @@ def get_all_credit_cards() -> Tuple[List[Dict[str, Any]], Optional[str]]:
         - Error message if an error occurred, None otherwise
     """
     try:
-        cards = fetch_all_cards(CREDIT_CARDS_COLLECTION, CARD_FETCH_LIMIT)
+        cards = card_catalogue.get_cards()
 
         if not cards:
             logger.info("No credit cards found in the database.")
             return [], "No credit cards found."
 
         # Convert Qdrant points to dictionaries
-        card_dicts = [card.payload for card in cards if hasattr(card, "payload")]
+        card_dicts = [public_card_payload(card.payload) for card in cards if hasattr(card, "payload")]
 
         logger.info(f"Retrieved {len(card_dicts)} credit cards.")
         return card_dicts, None
@@ -38,6 +47,36 @@ def get_all_credit_cards() -> Tuple[List[Dict[str, Any]], Optional[str]]:
         return [], error_msg
 
 
+def get_credit_cards_page(limit: int, offset: Optional[Any] = None
+                          ) -> Tuple[List[Dict[str, Any]], Optional[Any], Optional[str]]:
+    """
+    Get one page of credit cards from the database.
+
+    Args:
+        limit: Maximum number of credit cards on the page
+        offset: Offset returned for the previous page; None for the first page
+
+    Returns:
+        Tuple containing:
+        - List of credit card dictionaries
+        - Offset of the next page, None on the last page
+        - Error message if an error occurred, None otherwise
+    """
+    try:
+        cards, next_offset = fetch_page(CREDIT_CARDS_COLLECTION, limit, offset)
+
+        # Convert Qdrant points to dictionaries
+        card_dicts = [public_card_payload(card.payload) for card in cards if hasattr(card, "payload")]
+
+        logger.info(f"Retrieved page of {len(card_dicts)} credit cards.")
+        return card_dicts, next_offset, None
+
+    except Exception as e:
+        error_msg = f"Error retrieving credit cards: {str(e)}"
+        logger.error(f"❌ {error_msg}")
+        return [], None, error_msg
+
+
 def get_credit_card_by_id(card_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     """
     Get a specific credit card by ID.
@@ -51,15 +90,17 @@ def get_credit_card_by_id(card_id: str) -> Tuple[Optional[Dict[str, Any]], Optio
         - Error message if an error occurred, None otherwise
     """
     try:
-        # Find the credit card by ID
-        card = find_existing_credit_card(card_id, None)
+        # Find the credit card by ID, in the cached catalogue first
+        card = card_catalogue.get_card(card_id)
+        if not card:
+            card = find_existing_credit_card(card_id, None)
 
         if not card:
             logger.warning(f"Credit card with ID '{card_id}' not found.")
             return None, f"Credit card with ID '{card_id}' not found."
 
         logger.info(f"Retrieved credit card with ID '{card_id}'.")
-        return card.payload, None
+        return public_card_payload(card.payload), None
 
     except Exception as e:
         error_msg = f"Error retrieving credit card with ID '{card_id}': {str(e)}"
@@ -89,22 +130,19 @@ def filter_credit_cards(filter_params: Dict[str, Any]) -> Tuple[List[Dict[str, A
             }
             logger.info("No filter parameters provided, applying default filter example")
 
-        # Fetch all cards
-        cards = fetch_all_cards(CREDIT_CARDS_COLLECTION, CARD_FETCH_LIMIT)
-
-        if not cards:
+        if not card_catalogue.get_snapshot().cards:
             logger.info("No credit cards found in the database.")
             return [], "No credit cards found."
 
-        # Apply filters
-        filtered_cards = apply_manual_filters(cards, filter_params)
+        # Apply filters to the cached catalogue
+        filtered_cards = filter_catalogue_cards(filter_params)
 
         if not filtered_cards:
             logger.info("No credit cards match the filter criteria.")
             return [], "No credit cards match the filter criteria."
 
         # Convert Qdrant points to dictionaries
-        card_dicts = [card.payload for card in filtered_cards if hasattr(card, "payload")]
+        card_dicts = [public_card_payload(card.payload) for card in filtered_cards if hasattr(card, "payload")]
 
         logger.info(f"Retrieved {len(card_dicts)} credit cards after filtering.")
         return card_dicts, None
@@ -1,33 +1,138 @@
+import hashlib
+import json
 import numpy as np
 import os
+import time
+import uuid
 from typing import Dict, Any, List, Tuple, Optional
-from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue, PointIdsList
-from Credit_Card_Selector.Database.general_utils import get_logger, encode_text, generate_unique_id, load_csv_data, \
-    normalize_value, create_collection_if_not_exists, create_snapshot
+from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue, PointIdsList, \
+    OverwritePayloadOperation, SetPayload
+from Credit_Card_Selector.Database.general_utils import get_logger, encode_text, encode_texts, \
+    iter_records, count_rows, normalize_value, create_collection_if_not_exists, create_snapshot, \
+    ensure_payload_index
 from Credit_Card_Selector.Database.qdrant_config import qdrant_client
 from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.card_filtering import apply_manual_filters
-from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.database_operations import fetch_all_cards
-from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import CARD_FETCH_LIMIT
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.card_catalogue import card_catalogue
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.database_operations import (
+    fetch_all_cards, fetch_points_by_ids, scroll_all_points
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
+    CARD_FETCH_LIMIT, BULK_SYNC_ENABLED, UPSERT_BATCH_SIZE, CSV_CHUNK_SIZE, CARD_ID_INDEX_FIELD, PAYLOAD_HASH_FIELD,
+    EMBEDDING_HASH_FIELD
+)
 
 CREDIT_CARDS_COLLECTION = "credit_cards"
+# Namespace voor de deterministische point ID's (UUIDv5) van creditcards
+CARD_POINT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "credit-card-selector/credit_cards")
 # Get the directory of the current script
 current_dir = os.path.dirname(os.path.abspath(__file__))
 # Get the root directory (three levels up from current script)
 root_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
-# Define path to CSV file
+# Define path to CSV file and the typed Parquet file the PreProcessor writes next to it
 CSV_PATH = os.path.join(root_dir, 'Data_Handler', 'PreProcessor', 'merged_credit_cards.csv')
+PARQUET_PATH = os.path.splitext(CSV_PATH)[0] + '.parquet'
 logger = get_logger(__file__)
 
 
-def update_or_add_credit_card(credit_card):
-    """Voegt een nieuwe creditcard toe of update een bestaande als er verschillen zijn."""
+def build_card_embedding_text(credit_card):
+    """Bouwt de tekst waarmee een creditcard geëncodeerd wordt."""
+    card_id = credit_card.get("Card_ID", "")
+    card_type = credit_card.get('Card_Type', '')
+    card_network = credit_card.get('Card_Network', '')
+    eligibility = credit_card.get('Eligibility_Requirements', '')
+    return f"{card_id} {card_type} {card_network} {eligibility}"
+
+
+def is_valid_identifier(value):
+    """Controleert of een Card_ID of Card_Link bruikbaar is (niet leeg en geen NaN)."""
+    return bool(value) and not (isinstance(value, float) and np.isnan(value))
+
+
+def card_point_id(credit_card):
+    """
+    Deterministische point ID (UUIDv5) van een creditcard, afgeleid van de Card_ID of anders de Card_Link.
+
+    Dezelfde kaart krijgt dus altijd dezelfde point ID, zodat een upsert zonder opzoeking
+    de bestaande kaart overschrijft.
+
+    Returns:
+        str: De point ID, of None als de kaart geen bruikbare Card_ID of Card_Link heeft
+    """
+    card_id = credit_card.get("Card_ID")
+    if is_valid_identifier(card_id):
+        return str(uuid.uuid5(CARD_POINT_NAMESPACE, f"Card_ID:{card_id}"))
+    card_link = credit_card.get("Card_Link")
+    if is_valid_identifier(card_link):
+        return str(uuid.uuid5(CARD_POINT_NAMESPACE, f"Card_Link:{card_link}"))
+    return None
+
+
+def normalize_card_id(card_id):
+    """Genormaliseerde Card_ID voor opzoekingen (zonder witruimte, kleine letters), of None."""
+    if not is_valid_identifier(card_id):
+        return None
+    return str(card_id).strip().lower()
+
+
+def _canonical_value(value):
+    value = normalize_value(value)
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def card_payload_hash(credit_card):
+    """SHA-256 van de canonieke payload van een kaart (genormaliseerde waarden, gesorteerde sleutels)."""
+    canonical = {key: _canonical_value(value) for key, value in credit_card.items()}
+    text = json.dumps(canonical, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def card_embedding_hash(credit_card):
+    """SHA-256 van de tekst waarmee een kaart geëncodeerd wordt (zie build_card_embedding_text)."""
+    return hashlib.sha256(build_card_embedding_text(credit_card).encode("utf-8")).hexdigest()
+
+
+def build_card_payload(credit_card):
+    """
+    Payload waarmee een creditcard opgeslagen wordt: de CSV rij plus de geïndexeerde
+    Card_ID_lower en de hashes waarmee wijzigingen herkend worden.
+    """
+    payload = dict(credit_card)
+    payload[CARD_ID_INDEX_FIELD] = normalize_card_id(credit_card.get("Card_ID"))
+    payload[PAYLOAD_HASH_FIELD] = card_payload_hash(credit_card)
+    payload[EMBEDDING_HASH_FIELD] = card_embedding_hash(credit_card)
+    return payload
+
+
+def update_or_add_credit_card(credit_card, vector=None, stored_hashes=None):
+    """
+    Voegt een creditcard toe of overschrijft de bestaande versie.
+
+    The point ID is derived from the card (see card_point_id), so the stored version
+    is read by ID without a search. Its payload and embedding hashes decide what is
+    written: nothing, only the payload, or the payload with a new vector.
+
+    Args:
+        credit_card (dict): Card data, one CSV row
+        vector (list, optional): Precomputed embedding of the card (see encode_texts).
+            When omitted the card is encoded on its own.
+        stored_hashes (dict, optional): Payload and embedding hash of the stored version,
+            empty if the card is not stored (see _stored_card_hashes). When omitted they
+            are read from Qdrant.
+
+    Returns:
+        str: The point ID of the card, or None if it could not be stored
+    """
     try:
         create_collection_if_not_exists(CREDIT_CARDS_COLLECTION)
+        ensure_payload_index(CREDIT_CARDS_COLLECTION, CARD_ID_INDEX_FIELD)
 
-        # Get card identifiers for lookup
+        # Get card identifiers for logging
         card_id = credit_card.get("Card_ID", "")
         card_link = credit_card.get("Card_Link", "")
-        existing_card = find_existing_credit_card(card_id, card_link)
+        point_id = card_point_id(credit_card)
+        if point_id is None:
+            logger.warning(f"Geen geldige Card_ID of Card_Link, creditcard overgeslagen: {credit_card}")
+            return None
 
         # Use .get() with default values to handle missing fields for encoding
         card_type = credit_card.get('Card_Type', '')
@@ -49,52 +154,56 @@ def update_or_add_credit_card(credit_card):
             logger.warning(f"Ontbrekende velden in creditcard data: {', '.join(missing_fields)}")
             logger.warning(f"Creditcard data: {credit_card}")
 
-        # Create encoded text with available fields
-        encoded_text = f"{card_id} {card_type} {card_network} {eligibility}"
+        payload = build_card_payload(credit_card)
 
-        try:
-            new_vector = encode_text(encoded_text)
-        except Exception as e:
-            logger.error(f"Fout bij het encoderen van tekst: {e}")
-            return
-
-        if existing_card:
+        # Compare the hashes of the stored version: skip unchanged cards and only
+        # re-encode when the embedded text changed
+        if stored_hashes is None:
+            existing = qdrant_client.retrieve(
+                collection_name=CREDIT_CARDS_COLLECTION,
+                ids=[point_id],
+                with_payload=[PAYLOAD_HASH_FIELD, EMBEDDING_HASH_FIELD],
+                with_vectors=False
+            )
+            stored_hashes = (existing[0].payload or {}) if existing else {}
+        if stored_hashes.get(PAYLOAD_HASH_FIELD) == payload[PAYLOAD_HASH_FIELD]:
+            logger.info(f"✅ '{card_id or card_link}' is al up-to-date. Geen update nodig.")
+            return point_id
+        if stored_hashes.get(EMBEDDING_HASH_FIELD) == payload[EMBEDDING_HASH_FIELD]:
             try:
-                existing_payload = existing_card.payload
-                differences = [
-                    f"{key}: '{normalize_value(existing_payload.get(key))}' -> '{normalize_value(credit_card[key])}'"
-                    for key in credit_card if
-                    str(normalize_value(existing_payload.get(key))) != str(normalize_value(credit_card[key]))
-                ]
-
-                if differences:
-                    logger.info(f"🔄 Verschil gevonden! Updaten van '{card_id or card_link}'...")
-
-                    updated_card = PointStruct(
-                        id=existing_card.id,
-                        vector=new_vector,
-                        payload=credit_card
-                    )
-
-                    qdrant_client.upsert(collection_name=CREDIT_CARDS_COLLECTION, points=[updated_card])
-                    logger.info(f"✅ Creditcard '{card_id or card_link}' geüpdatet in de database.")
-                else:
-                    logger.info(f"✅ '{card_id or card_link}' is al up-to-date. Geen update nodig.")
+                qdrant_client.overwrite_payload(
+                    collection_name=CREDIT_CARDS_COLLECTION, payload=payload, points=[point_id]
+                )
+                logger.info(f"✅ Payload van creditcard '{card_id or card_link}' geüpdatet (vector ongewijzigd).")
+                return point_id
             except Exception as e:
-                logger.error(f"Fout bij het updaten van creditcard '{card_id or card_link}': {e}")
+                logger.error(f"Fout bij het updaten van payload van creditcard '{card_id or card_link}': {e}")
+                return None
+
+        # Create encoded text with available fields
+        if vector is not None:
+            new_vector = vector
         else:
             try:
-                new_card = PointStruct(
-                    id=generate_unique_id(),
-                    vector=new_vector,
-                    payload=credit_card
-                )
-                qdrant_client.upsert(collection_name=CREDIT_CARDS_COLLECTION, points=[new_card])
-                logger.info(f"✅ Nieuwe creditcard '{card_id or card_link}' toegevoegd!")
+                new_vector = encode_text(build_card_embedding_text(credit_card))
             except Exception as e:
-                logger.error(f"Fout bij het toevoegen van nieuwe creditcard '{card_id or card_link}': {e}")
+                logger.error(f"Fout bij het encoderen van tekst: {e}")
+                return None
+
+        try:
+            card_point = PointStruct(
+                id=point_id,
+                vector=new_vector,
+                payload=payload
+            )
+            qdrant_client.upsert(collection_name=CREDIT_CARDS_COLLECTION, points=[card_point])
+            logger.info(f"✅ Creditcard '{card_id or card_link}' opgeslagen.")
+            return point_id
+        except Exception as e:
+            logger.error(f"Fout bij het opslaan van creditcard '{card_id or card_link}': {e}")
     except Exception as e:
         logger.error(f"Onverwachte fout in update_or_add_credit_card: {e}")
+    return None
 
 
 def find_existing_credit_card(card_id, card_link):
@@ -124,34 +233,33 @@ def find_existing_credit_card(card_id, card_link):
                 collection_name=CREDIT_CARDS_COLLECTION,
                 limit=1,
                 with_payload=True,
-                with_vectors=True,
+                with_vectors=False,
                 scroll_filter=Filter(should=conditions)
             )
 
             if results and results[0]:
                 return results[0][0]
 
-            # If exact match fails and we have a card_id, try to get all cards and find a case-insensitive match
-            if card_id and not (isinstance(card_id, float) and np.isnan(card_id)):
+            # If exact match fails and we have a card_id, try a case-insensitive match through the index
+            card_id_lower = normalize_card_id(card_id)
+            if card_id_lower:
                 logger.info(f"Exact match failed for '{card_id}', trying case-insensitive match...")
-                all_cards = qdrant_client.scroll(
+                ensure_payload_index(CREDIT_CARDS_COLLECTION, CARD_ID_INDEX_FIELD)
+                results = qdrant_client.scroll(
                     collection_name=CREDIT_CARDS_COLLECTION,
-                    limit=1000,  # Adjust based on your expected number of cards
+                    limit=1,
                     with_payload=True,
-                    with_vectors=True
+                    with_vectors=False,
+                    scroll_filter=Filter(must=[
+                        FieldCondition(key=CARD_ID_INDEX_FIELD, match=MatchValue(value=card_id_lower))
+                    ])
                 )
 
-                if all_cards and all_cards[0]:
-                    # Try to find a case-insensitive match
-                    card_id_lower = card_id.lower()
-                    for card in all_cards[0]:
-                        if hasattr(card, "payload") and "Card_ID" in card.payload:
-                            stored_card_id = card.payload["Card_ID"]
-                            if stored_card_id and stored_card_id.lower() == card_id_lower:
-                                logger.info(f"Found card with case-insensitive match: '{stored_card_id}'")
-                                return card
+                if results and results[0]:
+                    logger.info(f"Found card with case-insensitive match: '{results[0][0].payload.get('Card_ID')}'")
+                    return results[0][0]
 
-                    logger.warning(f"No case-insensitive match found for '{card_id}'")
+                logger.warning(f"No case-insensitive match found for '{card_id}'")
 
             return None
         else:
@@ -166,53 +274,288 @@ def delete_credit_card(card_id):
     try:
         qdrant_client.delete(
             collection_name=CREDIT_CARDS_COLLECTION,
-            points_selector=PointIdsList(ids=[str(card_id)])  # Correct formaat voor Qdrant
+            points_selector=PointIdsList(points=[str(card_id)])  # Correct formaat voor Qdrant
         )
         logger.info(f"🗑️ Creditcard met ID '{card_id}' verwijderd.")
+        card_catalogue.invalidate()
     except Exception as e:
         logger.error(f"Fout bij verwijderen creditcard met ID '{card_id}': {e}")
 
 
-def remove_outdated_credit_cards(existing_card_ids):
-    """Verwijdert creditcards die niet in de CSV staan op basis van hun Point ID."""
-    try:
-        # Haal alle opgeslagen creditcards op
-        results = qdrant_client.scroll(
-            collection_name=CREDIT_CARDS_COLLECTION,
-            limit=10000,
-            with_payload=True,  # We hebben de payload nodig om `Card_ID` te checken
-            with_vectors=False
-        )
-
-        # Maak een mapping van Card_ID → Point ID
-        card_id_to_point_id = {
-            point.payload.get("Card_ID"): point.id for point in results[0] if "Card_ID" in point.payload
-        }
+def remove_outdated_credit_cards(current_point_ids):
+    """
+    Verwijdert creditcards die niet in de CSV staan op basis van hun Point ID.
 
-        # Zoek welke kaarten niet meer in de CSV staan
-        outdated_card_ids = set(card_id_to_point_id.keys()) - set(existing_card_ids)
+    Args:
+        current_point_ids (set): Point ID's van de kaarten die behouden moeten blijven
 
-        # Zoek bijhorende Point ID's
-        outdated_point_ids = [card_id_to_point_id[card_id] for card_id in outdated_card_ids]
+    Returns:
+        int: Aantal verwijderde creditcards
+    """
+    try:
+        # Alleen de ID's zijn nodig, geen payload of vectoren
+        stored_point_ids = {
+            str(point.id) for point in
+            scroll_all_points(CREDIT_CARDS_COLLECTION, with_payload=False, with_vectors=False)
+        }
+        outdated_point_ids = list(stored_point_ids - {str(point_id) for point_id in current_point_ids})
 
         if outdated_point_ids:
             qdrant_client.delete(
                 collection_name=CREDIT_CARDS_COLLECTION,
-                points_selector=PointIdsList(ids=outdated_point_ids)  # 🔥 Nu verwijderen we met Point ID's
+                points_selector=PointIdsList(points=outdated_point_ids)
             )
             logger.info(f"🗑️ {len(outdated_point_ids)} verouderde creditcards verwijderd.")
         else:
             logger.info("✅ Geen verouderde creditcards gevonden.")
+        return len(outdated_point_ids)
 
     except Exception as e:
         logger.error(f"Fout bij verwijderen verouderde creditcards: {e}")
+        return 0
+
+
+def _stored_card_hashes(point_ids):
+    """
+    Payload_Hash en Embedding_Hash van de opgeslagen versie van de gegeven kaarten.
+
+    Returns:
+        dict: Point ID -> {PAYLOAD_HASH_FIELD: hash, EMBEDDING_HASH_FIELD: hash}, without
+            the cards that are not stored (a hash is None for cards stored without hashes);
+            empty if the lookup failed, so every card is encoded and written
+    """
+    if not point_ids:
+        return {}
+    try:
+        points = qdrant_client.retrieve(
+            collection_name=CREDIT_CARDS_COLLECTION,
+            ids=list(dict.fromkeys(point_ids)),
+            with_payload=[PAYLOAD_HASH_FIELD, EMBEDDING_HASH_FIELD],
+            with_vectors=False
+        )
+    except Exception as e:
+        logger.error(f"Fout bij het ophalen van opgeslagen hashes: {e}")
+        return {}
+    return {
+        str(point.id): {key: (point.payload or {}).get(key) for key in (PAYLOAD_HASH_FIELD, EMBEDDING_HASH_FIELD)}
+        for point in points
+    }
+
+
+def _sync_chunk(credit_cards, stored_hashes, stats, batch_size, report_progress):
+    """
+    Vergelijkt een chunk creditcards met de opgeslagen hashes en schrijft de wijzigingen weg.
+
+    stored_hashes is updated with what was written, so a card that appears again in a
+    later chunk is compared with its latest version.
+
+    Returns:
+        set: The point ID's of the cards in the chunk
+    """
+    timings = stats["timings"]
+
+    # Compare hashes in memory; point ID's are derived from the cards
+    phase_start = time.perf_counter()
+    latest = {}  # point id -> credit_card; later rows with the same identifier replace earlier ones
+    for credit_card in credit_cards:
+        point_id = card_point_id(credit_card)
+        if point_id is None:
+            stats["error_count"] += 1
+            logger.warning(f"Geen geldige Card_ID of Card_Link, creditcard overgeslagen: {credit_card}")
+            continue
+        latest[point_id] = credit_card
+
+    to_encode = {}  # point id -> (payload, is_new)
+    payload_only = {}  # point id -> payload
+    without_hashes = []  # stored by an older version, compared on their full payload below
+    for point_id, credit_card in latest.items():
+        try:
+            payload = build_card_payload(credit_card)
+            stored = stored_hashes.get(point_id)
+            if stored is None:
+                to_encode[point_id] = (payload, True)
+            elif not stored.get(PAYLOAD_HASH_FIELD) or not stored.get(EMBEDDING_HASH_FIELD):
+                without_hashes.append(point_id)
+                payload_only[point_id] = payload
+            elif stored[EMBEDDING_HASH_FIELD] != payload[EMBEDDING_HASH_FIELD]:
+                to_encode[point_id] = (payload, False)
+            elif stored[PAYLOAD_HASH_FIELD] != payload[PAYLOAD_HASH_FIELD]:
+                payload_only[point_id] = payload
+            else:
+                stats["unchanged"] += 1
+        except Exception as e:
+            stats["error_count"] += 1
+            logger.error(f"Fout bij vergelijken van creditcard rij: {e}")
+
+    # Cards without hashes get them through a payload update, unless their embedded text changed
+    for point in fetch_points_by_ids(CREDIT_CARDS_COLLECTION, without_hashes):
+        point_id = str(point.id)
+        if build_card_embedding_text(point.payload or {}) != build_card_embedding_text(latest[point_id]):
+            to_encode[point_id] = (payload_only.pop(point_id), False)
+    timings["diff"] += time.perf_counter() - phase_start
+
+    report_progress(len(credit_cards) - len(to_encode) - len(payload_only))
+
+    # Encode only the new cards and those whose embedded text changed, and upsert them in batches
+    point_ids = list(to_encode)
+    for start in range(0, len(point_ids), batch_size):
+        batch_ids = point_ids[start:start + batch_size]
+
+        phase_start = time.perf_counter()
+        vectors = encode_texts([build_card_embedding_text(latest[point_id]) for point_id in batch_ids])
+        timings["embed"] += time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        points = [
+            PointStruct(id=point_id, vector=vector, payload=to_encode[point_id][0])
+            for point_id, vector in zip(batch_ids, vectors)
+        ]
+        # Qdrant applies the operations of a collection in order, so only the last call of a chunk waits
+        is_last = start + batch_size >= len(point_ids) and not payload_only
+        qdrant_client.upsert(collection_name=CREDIT_CARDS_COLLECTION, points=points, wait=is_last)
+        timings["upsert"] += time.perf_counter() - phase_start
+
+        report_progress(len(batch_ids))
+
+    # Replace the payload of cards whose vector is still valid
+    point_ids = list(payload_only)
+    for start in range(0, len(point_ids), batch_size):
+        batch_ids = point_ids[start:start + batch_size]
+        phase_start = time.perf_counter()
+        qdrant_client.batch_update_points(
+            collection_name=CREDIT_CARDS_COLLECTION,
+            update_operations=[
+                OverwritePayloadOperation(overwrite_payload=SetPayload(payload=payload_only[point_id], points=[point_id]))
+                for point_id in batch_ids
+            ],
+            wait=start + batch_size >= len(point_ids)
+        )
+        timings["payload_update"] += time.perf_counter() - phase_start
+        report_progress(len(batch_ids))
+
+    for point_id, (payload, is_new) in to_encode.items():
+        stats["added" if is_new else "updated"] += 1
+        stored_hashes[point_id] = {key: payload[key] for key in (PAYLOAD_HASH_FIELD, EMBEDDING_HASH_FIELD)}
+    for point_id, payload in payload_only.items():
+        stats["payload_updated"] += 1
+        stored_hashes[point_id] = {key: payload[key] for key in (PAYLOAD_HASH_FIELD, EMBEDDING_HASH_FIELD)}
+    return set(latest)
 
-def update_credit_cards_from_csv(csv_path=CSV_PATH):
+
+def sync_credit_cards_chunks(chunks, total=None, batch_size=UPSERT_BATCH_SIZE, progress_callback=None):
     """
-    Update the credit card database with data from a CSV file.
+    Synchroniseert de database met creditcards die per chunk aangeleverd worden.
+
+    Only the point ID's and hashes of the stored catalogue are kept in memory; the
+    cards themselves are diffed, encoded and written one chunk at a time, so memory
+    use does not grow with the size of the data. Cards that appear in no chunk are
+    removed at the end.
 
     Args:
-        csv_path (str, optional): Path to the CSV file. Defaults to CSV_PATH.
+        chunks (iterable): Lists of card dictionaries, e.g. from iter_records
+        total (int, optional): Total number of cards, reported to progress_callback
+        batch_size (int, optional): Number of cards per encode, upsert and payload update call
+        progress_callback (callable, optional): Called as progress_callback(processed, total)
+            after every diff and every write
+
+    Returns:
+        dict: Counts of rows, added, updated (re-encoded), payload_updated, unchanged, removed
+            and failed cards plus the duration of every phase in seconds under "timings"
+    """
+    stats = {
+        "rows": 0, "added": 0, "updated": 0, "payload_updated": 0, "unchanged": 0, "removed": 0,
+        "error_count": 0, "timings": {"diff": 0.0, "embed": 0.0, "upsert": 0.0, "payload_update": 0.0}
+    }
+    timings = stats["timings"]
+
+    # Load the hashes of the existing catalogue once (no other payload, no vectors)
+    phase_start = time.perf_counter()
+    existing_points = scroll_all_points(
+        CREDIT_CARDS_COLLECTION, with_payload=[PAYLOAD_HASH_FIELD, EMBEDDING_HASH_FIELD], with_vectors=False
+    )
+    stored_hashes = {str(point.id): point.payload or {} for point in existing_points}
+    existing_point_ids = set(stored_hashes)
+    del existing_points
+    timings["load_existing"] = round(time.perf_counter() - phase_start, 3)
+
+    processed = 0
+
+    def report_progress(count):
+        nonlocal processed
+        processed += count
+        if progress_callback:
+            progress_callback(processed, total if total is not None else processed)
+
+    current_point_ids = set()
+    for credit_cards in chunks:
+        stats["rows"] += len(credit_cards)
+        current_point_ids |= _sync_chunk(credit_cards, stored_hashes, stats, max(1, batch_size), report_progress)
+
+    # Remove cards that are no longer in the data: a set difference on point ID's
+    phase_start = time.perf_counter()
+    outdated_point_ids = list(existing_point_ids - current_point_ids)
+    if outdated_point_ids:
+        qdrant_client.delete(
+            collection_name=CREDIT_CARDS_COLLECTION,
+            points_selector=PointIdsList(points=outdated_point_ids)
+        )
+    stats["removed"] = len(outdated_point_ids)
+    timings["prune"] = round(time.perf_counter() - phase_start, 3)
+
+    for phase in ("diff", "embed", "upsert", "payload_update"):
+        timings[phase] = round(timings[phase], 3)
+
+    logger.info(f"✅ Bulk sync: {stats['added']} toegevoegd, {stats['updated']} geüpdatet, "
+                f"{stats['payload_updated']} alleen payload geüpdatet, {stats['unchanged']} ongewijzigd, "
+                f"{stats['removed']} verwijderd.")
+    return stats
+
+
+def sync_credit_cards_bulk(credit_cards, batch_size=UPSERT_BATCH_SIZE, progress_callback=None):
+    """
+    Synchroniseert de database in bulk met een lijst creditcards.
+
+    Same as sync_credit_cards_chunks with all cards in a single chunk: only new cards
+    and cards whose embedded text changed are encoded, cards of which only other fields
+    changed get their payload replaced, and cards that are no longer present are removed.
+
+    Args:
+        credit_cards (list): Card dictionaries, one per CSV row
+        batch_size (int, optional): Number of cards per encode, upsert and payload update call
+        progress_callback (callable, optional): Called as progress_callback(processed, total)
+
+    Returns:
+        dict: See sync_credit_cards_chunks
+    """
+    return sync_credit_cards_chunks(
+        [credit_cards], total=len(credit_cards), batch_size=batch_size, progress_callback=progress_callback
+    )
+
+
+def default_data_path():
+    """
+    Bestand waaruit de creditcards geladen worden: het Parquet-bestand als de PreProcessor
+    het samen met (of na) de CSV geschreven heeft, anders de CSV.
+    """
+    try:
+        if os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(CSV_PATH):
+            return PARQUET_PATH
+    except OSError:
+        pass
+    return CSV_PATH
+
+
+def update_credit_cards_from_csv(csv_path=None, bulk=None, progress_callback=None):
+    """
+    Update the credit card database with data from a CSV, Parquet or Arrow IPC file.
+
+    Args:
+        csv_path (str, optional): Path to the data file; Parquet (.parquet) and Arrow IPC
+            (.arrow, .feather) files are read memory-mapped. Defaults to default_data_path().
+        bulk (bool, optional): Use the bulk sync (see sync_credit_cards_bulk) instead of
+            updating card by card. Defaults to BULK_SYNC_ENABLED.
+        progress_callback (callable, optional): Called as progress_callback(processed, total)
+            while the cards are processed
 
     Returns:
         tuple: (success, message, stats) where:
@@ -221,11 +564,16 @@ def update_credit_cards_from_csv(csv_path=CSV_PATH):
             - stats (dict): Statistics about the update operation (cards processed, errors, etc.)
     """
     logger.info("🔹 Database update started...")
+    if csv_path is None:
+        csv_path = default_data_path()
+    if bulk is None:
+        bulk = BULK_SYNC_ENABLED
     stats = {
         "success_count": 0,
         "error_count": 0,
         "outdated_removed": 0
     }
+    update_start = time.perf_counter()
 
     try:
         # Create a snapshot for backup
@@ -241,43 +589,90 @@ def update_credit_cards_from_csv(csv_path=CSV_PATH):
         except Exception as e:
             logger.error(f"Fout bij het controleren/aanmaken van collectie: {e}")
             return False, "Failed to create or check collection", stats
+        ensure_payload_index(CREDIT_CARDS_COLLECTION, CARD_ID_INDEX_FIELD)
 
-        # Load and process CSV data
-        data = load_csv_data(csv_path)
-        if data is not None:
-            existing_card_ids = set()
-
-            for _, row in data.iterrows():
-                try:
-                    credit_card = row.to_dict()
-                    update_or_add_credit_card(credit_card)
-                    card_id = credit_card.get("Card_ID")
-                    if card_id:
-                        existing_card_ids.add(card_id)
-                    stats["success_count"] += 1
-                except Exception as e:
-                    stats["error_count"] += 1
-                    logger.error(f"Fout bij verwerken van creditcard rij: {e}")
-                    # Continue with the next card even if this one fails
-
-            logger.info(f"✅ {stats['success_count']} creditcards succesvol verwerkt.")
-            if stats["error_count"] > 0:
-                logger.warning(f"⚠️ {stats['error_count']} creditcards konden niet worden verwerkt vanwege fouten.")
-
-            # Remove outdated cards
+        # Count the rows for progress reporting; this also checks that the file can be read
+        try:
+            total = count_rows(csv_path)
+            logger.info(f"{os.path.basename(csv_path)} met {total} rijen gevonden, "
+                        f"verwerken per {CSV_CHUNK_SIZE} rijen.")
+        except Exception as e:
+            logger.error(f"Fout bij het laden van CSV: {e}")
+            error_msg = "Geen data geladen uit CSV bestand."
+            logger.error(error_msg)
+            return False, error_msg, stats
+
+        # Stream the file in chunks, so memory use does not grow with the number of cards
+        chunks = iter_records(csv_path, CSV_CHUNK_SIZE)
+        if bulk:
             try:
-                remove_outdated_credit_cards(existing_card_ids)
-                # Note: We don't have a way to count how many were removed here
-                # This would require modifying remove_outdated_credit_cards to return the count
+                bulk_stats = sync_credit_cards_chunks(chunks, total=total, progress_callback=progress_callback)
             except Exception as e:
-                logger.error(f"Fout bij het verwijderen van verouderde creditcards: {e}")
+                error_msg = f"Fout tijdens bulk synchronisatie: {e}"
+                logger.error(error_msg)
+                return False, error_msg, stats
 
+            stats.update(bulk_stats)
+            stats["success_count"] = bulk_stats["rows"] - bulk_stats["error_count"]
+            stats["outdated_removed"] = bulk_stats["removed"]
+            stats["timings"]["total"] = round(time.perf_counter() - update_start, 3)
+
+            # Serve the new cards from memory right away
+            card_catalogue.refresh()
             logger.info("🔹 Database-update voltooid!")
             return True, f"Successfully processed {stats['success_count']} credit cards", stats
-        else:
-            error_msg = "Geen data geladen uit CSV bestand."
+
+        current_point_ids = set()
+        processed = 0
+        try:
+            for credit_cards in chunks:
+                point_ids = [card_point_id(card) for card in credit_cards]
+                vectors = [None] * len(credit_cards)
+
+                # Only encode the cards whose embedded text differs from the stored version, in
+                # batches; update_or_add_credit_card skips the others or only replaces their payload.
+                # The hashes of the whole chunk are read once and handed to every card.
+                stored_hashes = _stored_card_hashes([point_id for point_id in point_ids if point_id])
+                to_encode = [
+                    index for index, (credit_card, point_id) in enumerate(zip(credit_cards, point_ids))
+                    if point_id
+                    and stored_hashes.get(point_id, {}).get(EMBEDDING_HASH_FIELD) != card_embedding_hash(credit_card)
+                ]
+                if to_encode:
+                    try:
+                        encoded = encode_texts([build_card_embedding_text(credit_cards[index]) for index in to_encode])
+                        for index, vector in zip(to_encode, encoded):
+                            vectors[index] = vector
+                    except Exception as e:
+                        logger.error(f"Fout bij het batchgewijs encoderen, terugval op encoderen per kaart: {e}")
+
+                for credit_card, point_id, vector in zip(credit_cards, point_ids, vectors):
+                    # Cards that are still in the CSV are kept, also when storing them failed
+                    if point_id:
+                        current_point_ids.add(point_id)
+                    if update_or_add_credit_card(credit_card, vector=vector,
+                                                 stored_hashes=stored_hashes.get(point_id, {})):
+                        stats["success_count"] += 1
+                    else:
+                        stats["error_count"] += 1
+                    processed += 1
+                    if progress_callback:
+                        progress_callback(processed, total)
+        except Exception as e:
+            error_msg = f"Fout bij het lezen van CSV: {e}"
             logger.error(error_msg)
             return False, error_msg, stats
+
+        logger.info(f"✅ {stats['success_count']} creditcards succesvol verwerkt.")
+        if stats["error_count"] > 0:
+            logger.warning(f"⚠️ {stats['error_count']} creditcards konden niet worden verwerkt vanwege fouten.")
+
+        # Remove outdated cards
+        stats["outdated_removed"] = remove_outdated_credit_cards(current_point_ids)
+
+        card_catalogue.refresh()
+        logger.info("🔹 Database-update voltooid!")
+        return True, f"Successfully processed {stats['success_count']} credit cards", stats
     except Exception as e:
         error_msg = f"Onverwachte fout tijdens uitvoering: {e}"
         logger.error(error_msg)
@@ -0,0 +1,146 @@
+"""
+Async Survey Pipeline
+
+asyncio variant of handle_survey_response. The independent steps run concurrently
+in worker threads:
+
+- ensuring the survey collection exists and embedding the survey, followed by the
+  similar-survey lookup (which needs both);
+- fetching and filtering the candidate cards.
+
+The recommendations are the same as with handle_survey_response; only the card
+fetch is no longer skipped when a similar survey is found. Storing the
+recommendation is handed to a background writer, so the client does not wait for
+the Qdrant upsert.
+"""
+
+import asyncio
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from Credit_Card_Selector.Database.general_utils import (
+    get_logger, generate_unique_id, create_collection_if_not_exists
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
+    SURVEY_COLLECTION
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.database_operations import (
+    store_recommendation_in_qdrant
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.survey_processing import (
+    build_survey_vector, is_similar_survey_existing, recommendations_from_similar_survey
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.card_filtering import (
+    retrieve_filtered_cards
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.llm_interaction import (
+    generate_top_5_with_llm
+)
+
+# Configure module logger
+logger = get_logger(__file__)
+
+
+class RecommendationWriter:
+    """
+    Background thread that stores recommendations in Qdrant in submission order.
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[Tuple[List[Dict[str, Any]], Dict[str, Any], List[float]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _run(self) -> None:
+        while True:
+            recommended_cards, survey_response, survey_vector = self._queue.get()
+            try:
+                if store_recommendation_in_qdrant(recommended_cards, survey_response, survey_vector):
+                    logger.info(f"Successfully stored {len(recommended_cards)} recommendations")
+                else:
+                    logger.warning("Failed to store recommendations")
+            except Exception as e:
+                logger.error(f"Error in recommendation writer: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def submit(self, recommended_cards: List[Dict[str, Any]], survey_response: Dict[str, Any],
+               survey_vector: List[float]) -> None:
+        """Queue a recommendation for storage and return immediately."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="recommendation-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((recommended_cards, survey_response, survey_vector))
+
+    def flush(self) -> None:
+        """Block until every queued recommendation has been stored."""
+        self._queue.join()
+
+    def pending(self) -> int:
+        """Number of recommendations waiting to be stored."""
+        return self._queue.unfinished_tasks
+
+
+# Shared writer for the async pipeline
+recommendation_writer = RecommendationWriter()
+
+
+async def _find_similar_recommendations(response: Dict[str, Any]) -> Tuple[List[float], List[Dict[str, Any]]]:
+    """Embed the survey and return its vector with the recommendations of a similar survey, if any."""
+    _, survey_vector = await asyncio.gather(
+        asyncio.to_thread(create_collection_if_not_exists, SURVEY_COLLECTION),
+        asyncio.to_thread(build_survey_vector, response)
+    )
+
+    existing_survey = await asyncio.to_thread(is_similar_survey_existing, survey_vector)
+    return survey_vector, recommendations_from_similar_survey(existing_survey)
+
+
+async def handle_survey_response_async(response: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Process a survey response and return recommended cards, running independent steps concurrently.
+
+    Args:
+        response: Dictionary containing survey responses
+
+    Returns:
+        List of recommended card dictionaries
+    """
+    if not isinstance(response, dict):
+        logger.warning(f"Invalid response type: {type(response)}, expected dict")
+        return []
+
+    try:
+        # Add a Survey_ID if it doesn't exist
+        if "Survey_ID" not in response:
+            response["Survey_ID"] = generate_unique_id()
+            logger.info(f"Generated Survey_ID: {response['Survey_ID']}")
+
+        (survey_vector, similar_cards), filtered_cards = await asyncio.gather(
+            _find_similar_recommendations(response),
+            asyncio.to_thread(retrieve_filtered_cards, response)
+        )
+        if similar_cards:
+            return similar_cards
+
+        if not filtered_cards:
+            logger.warning("No cards match the survey criteria")
+            return []
+
+        # Generate top 5 recommendations using LLM
+        logger.info(f"Generating recommendations from {len(filtered_cards)} filtered cards")
+        best_cards = await asyncio.to_thread(generate_top_5_with_llm, filtered_cards, response)
+
+        # Store recommendations in the background
+        if best_cards:
+            recommendation_writer.submit(best_cards, response, survey_vector)
+        else:
+            logger.warning("No recommendations were generated")
+
+        return best_cards
+
+    except Exception as e:
+        logger.error(f"Error handling survey response: {str(e)}")
+        return []
@@ -0,0 +1,183 @@
+"""
+Card Catalogue
+
+Process-wide, in-memory snapshot of the credit card collection. Read endpoints and
+the survey pipeline serve cards from the snapshot instead of scrolling Qdrant on
+every request.
+
+The snapshot is loaded on first use and replaced atomically when it is refreshed:
+after a database update, when it is older than CARD_CACHE_TTL seconds, or after an
+explicit invalidate(). Readers always see either the old or the new snapshot,
+never a partially loaded one.
+
+Next to the snapshot the catalogue keeps a text index for search_term queries. It
+survives refreshes and only re-indexes the cards whose payload changed.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from Credit_Card_Selector.Database.general_utils import get_logger
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
+    CARDS_COLLECTION, CARD_CACHE_TTL
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.database_operations import scroll_all_points
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.filter_engine import CompiledCards
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.text_index import TextIndex, card_search_texts
+
+# Configure module logger
+logger = get_logger(__file__)
+
+
+class CatalogueSnapshot:
+    """
+    Immutable view of the card collection at one moment.
+
+    Args:
+        cards: Card points as returned by Qdrant
+        loaded_at: time.monotonic() timestamp of the load
+    """
+
+    def __init__(self, cards: List[Any], loaded_at: float):
+        self.cards = tuple(card for card in cards if hasattr(card, "payload") and card.payload is not None)
+        self.loaded_at = loaded_at
+
+        self.by_card_id: Dict[str, Any] = {}
+        self.by_card_id_lower: Dict[str, Any] = {}
+        self.by_card_link: Dict[str, Any] = {}
+        self.positions: Dict[Any, int] = {}
+        for position, card in enumerate(self.cards):
+            self.positions.setdefault(card.id, position)
+            card_id = card.payload.get("Card_ID")
+            if isinstance(card_id, str) and card_id:
+                self.by_card_id.setdefault(card_id, card)
+                self.by_card_id_lower.setdefault(card_id.strip().lower(), card)
+            card_link = card.payload.get("Card_Link")
+            if isinstance(card_link, str) and card_link:
+                self.by_card_link.setdefault(card_link, card)
+
+        self._compiled: Optional[CompiledCards] = None
+        self._compile_lock = threading.Lock()
+
+    def age(self) -> float:
+        """Seconds since the snapshot was loaded."""
+        return time.monotonic() - self.loaded_at
+
+    def compiled(self) -> CompiledCards:
+        """Return the cards compiled for vectorized filtering, compiling them on first use."""
+        if self._compiled is None:
+            with self._compile_lock:
+                if self._compiled is None:
+                    self._compiled = CompiledCards(list(self.cards))
+        return self._compiled
+
+
+class CardCatalogue:
+    """
+    Cached catalogue of one card collection.
+
+    Args:
+        collection_name: Name of the Qdrant collection holding the cards
+        ttl_seconds: Maximum age of the snapshot before it is reloaded; 0 or less
+            disables caching so every read loads the collection
+    """
+
+    def __init__(self, collection_name: str, ttl_seconds: float):
+        self.collection_name = collection_name
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[CatalogueSnapshot] = None
+        self._refresh_lock = threading.Lock()
+        self.text_index = TextIndex()
+
+    def _is_fresh(self, snapshot: Optional[CatalogueSnapshot]) -> bool:
+        return snapshot is not None and self.ttl_seconds > 0 and snapshot.age() < self.ttl_seconds
+
+    def _load(self) -> CatalogueSnapshot:
+        """Load the collection into a new snapshot; the caller holds the refresh lock."""
+        try:
+            cards = scroll_all_points(self.collection_name, with_payload=True, with_vectors=False)
+            snapshot = CatalogueSnapshot(cards, time.monotonic())
+            indexed, removed = self.text_index.sync(
+                {card.id: card_search_texts(card.payload) for card in snapshot.cards}
+            )
+            self._snapshot = snapshot
+            logger.info(f"📚 Card catalogue loaded: {len(snapshot.cards)} cards "
+                        f"({indexed} indexed, {removed} removed from text index)")
+        except Exception as e:
+            logger.error(f"Failed to load card catalogue from '{self.collection_name}': {str(e)}")
+            if self._snapshot is None:
+                return CatalogueSnapshot([], time.monotonic())
+        return self._snapshot
+
+    def refresh(self) -> CatalogueSnapshot:
+        """
+        Load the collection and atomically replace the snapshot.
+
+        If loading fails, the previous snapshot (if any) stays in place.
+
+        Returns:
+            The current snapshot after the refresh
+        """
+        with self._refresh_lock:
+            return self._load()
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next read loads the collection again."""
+        self._snapshot = None
+        logger.info("Card catalogue invalidated")
+
+    def get_snapshot(self) -> CatalogueSnapshot:
+        """Return the current snapshot, loading it first if it is missing or expired."""
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+
+        with self._refresh_lock:
+            # Another thread may have refreshed while we waited for the lock
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                return snapshot
+            return self._load()
+
+    def get_cards(self) -> List[Any]:
+        """Return all cards of the catalogue."""
+        return list(self.get_snapshot().cards)
+
+    def search_cards(self, term: str) -> List[Any]:
+        """
+        Find the cards with a field value that contains the term (case-insensitive).
+
+        Args:
+            term: Search term
+
+        Returns:
+            Matching cards, in catalogue order
+        """
+        snapshot = self.get_snapshot()
+        positions = snapshot.positions
+        matches = [positions[card_id] for card_id in self.text_index.search(term) if card_id in positions]
+        return [snapshot.cards[position] for position in sorted(matches)]
+
+    def get_card(self, card_id: str) -> Optional[Any]:
+        """
+        Find a card by Card_ID (exact first, then case-insensitive) or Card_Link.
+
+        Args:
+            card_id: Card_ID or Card_Link to look up
+
+        Returns:
+            The card point, or None if the catalogue does not contain it
+        """
+        if not isinstance(card_id, str) or not card_id:
+            return None
+        snapshot = self.get_snapshot()
+        return (
+            snapshot.by_card_id.get(card_id)
+            or snapshot.by_card_link.get(card_id)
+            or snapshot.by_card_id_lower.get(card_id.strip().lower())
+        )
+
+
+# Shared catalogue of the credit card collection
+card_catalogue = CardCatalogue(CARDS_COLLECTION, CARD_CACHE_TTL)
@@ -3,9 +3,10 @@ from typing import Any, Dict, List
 
 from Credit_Card_Selector.Database.general_utils import get_logger
 from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
-    FILTER_CONFIG, CARDS_COLLECTION, CARD_FETCH_LIMIT
+    FILTER_CONFIG, INTERNAL_CARD_FIELDS
 )
-from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.database_operations import fetch_all_cards
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.card_catalogue import card_catalogue
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.filter_engine import CompiledCards
 
 # Configure module logger
 logger = get_logger(__file__)
@@ -47,6 +48,8 @@ def apply_manual_filters(cards: List[Any], survey_response: Dict[str, Any]) -> L
                 # Search in all card fields
                 found = False
                 for key, value in card.payload.items():
+                    if key in INTERNAL_CARD_FIELDS:
+                        continue
                     if isinstance(value, (str, int, float)) and str(value).lower().find(search_term) != -1:
                         found = True
                         break
@@ -57,52 +60,52 @@ def apply_manual_filters(cards: List[Any], survey_response: Dict[str, Any]) -> L
             logger.info(f"Text search found {len(filtered_cards)} matching cards")
             return filtered_cards
 
-        # Standard filtering
-        for card in cards:
-            is_match = True
+        # Standard filtering, evaluated column-wise over all cards
+        filtered_cards = CompiledCards(cards).filter(survey_response)
 
-            # Skip cards without payload
-            if not hasattr(card, "payload"):
-                continue
+        logger.info(f"📉 Manual filtering: {len(cards)} → {len(filtered_cards)} cards remaining")
+        return filtered_cards
 
-            for field, filter_type in FILTER_CONFIG.items():
-                # Get values safely
-                survey_value = survey_response.get(field)
-                card_value = card.payload.get(field)
+    except Exception as e:
+        logger.error(f"Error during manual filtering: {str(e)}")
+        return []
 
-                # Skip comparison if either value is empty
-                if survey_value in [None, 0, ""] or card_value in [None, 0, ""]:
-                    continue
 
-                # Apply different filter types
-                if filter_type == "match":
-                    # Direct equality match
-                    if str(survey_value).lower() != str(card_value).lower():
-                        is_match = False
-                        break
+def filter_catalogue_cards(survey_response: Dict[str, Any]) -> List[Any]:
+    """
+    Filter the cached card catalogue based on survey data.
 
-                elif filter_type == "min":
-                    # Numeric comparison
-                    try:
-                        # Convert values to float for comparison
-                        survey_num = float(survey_value)
-                        card_num = float(card_value)
-
-                        if survey_num > card_num:
-                            is_match = False
-                            break
-                    except (ValueError, TypeError):
-                        # If conversion fails, skip this filter
-                        logger.debug(f"Skipping numeric comparison for field '{field}': "
-                                    f"survey_value={survey_value}, card_value={card_value}")
-                        continue
+    Same semantics as apply_manual_filters, but the catalogue is compiled into
+    filter columns only once per snapshot and text searches use the catalogue's
+    text index instead of scanning every field of every card.
 
-            if is_match:
-                filtered_cards.append(card)
+    Args:
+        survey_response: Dictionary containing survey responses
 
-        logger.info(f"📉 Manual filtering: {len(cards)} → {len(filtered_cards)} cards remaining")
-        return filtered_cards
+    Returns:
+        List of card objects from the catalogue that match the survey criteria
+    """
+    if not isinstance(survey_response, dict):
+        logger.warning(f"Invalid survey_response type: {type(survey_response)}, expected dict")
+        return []
+
+    try:
+        search_term = survey_response.get("search_term")
+        if search_term:
+            search_term = str(search_term).lower()
+            logger.info(f"Performing text search for: {search_term}")
+            filtered_cards = card_catalogue.search_cards(search_term)
+            logger.info(f"Text search found {len(filtered_cards)} matching cards")
+            return filtered_cards
+
+        snapshot = card_catalogue.get_snapshot()
+        if not snapshot.cards:
+            logger.warning("No cards provided to filter")
+            return []
 
+        filtered_cards = snapshot.compiled().filter(survey_response)
+        logger.info(f"📉 Manual filtering: {len(snapshot.cards)} → {len(filtered_cards)} cards remaining")
+        return filtered_cards
     except Exception as e:
         logger.error(f"Error during manual filtering: {str(e)}")
         return []
@@ -123,14 +126,8 @@ def retrieve_filtered_cards(response: Dict[str, Any]) -> List[Any]:
         return []
 
     try:
-        # Fetch all cards from the database
-        all_cards = fetch_all_cards(CARDS_COLLECTION, CARD_FETCH_LIMIT)
-        if not all_cards:
-            logger.warning("No cards retrieved from database")
-            return []
-
-        # Apply filters based on survey response
-        filtered_cards = apply_manual_filters(all_cards, response)
+        # Filter the cached catalogue based on the survey response
+        filtered_cards = filter_catalogue_cards(response)
 
         if not filtered_cards:
             logger.warning("No cards remaining after filtering. Check filter criteria.")
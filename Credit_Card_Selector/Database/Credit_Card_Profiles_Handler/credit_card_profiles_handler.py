@@ -7,25 +7,25 @@ based on user survey responses.
 """
 
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from Credit_Card_Selector.Database.general_utils import (
     get_logger, generate_unique_id, create_collection_if_not_exists
 )
 from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
-    SURVEY_COLLECTION, CARDS_COLLECTION
+    SURVEY_COLLECTION, CARDS_COLLECTION, LLM_STREAM
 )
 from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.database_operations import (
     store_recommendation_in_qdrant
 )
 from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.survey_processing import (
-    build_survey_vector, is_similar_survey_existing
+    build_survey_vector, is_similar_survey_existing, recommendations_from_similar_survey
 )
 from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.card_filtering import (
     retrieve_filtered_cards
 )
 from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.llm_interaction import (
-    generate_top_5_with_llm
+    generate_top_5_with_llm, stream_top_5_with_llm, LLMStreamError
 )
 
 # Configure module logger
@@ -44,9 +44,30 @@ def handle_survey_response(response: Dict[str, Any]) -> List[Dict[str, str]]:
     Returns:
         List of recommended card dictionaries
     """
+    # Nobody reads the cards before the list is complete, so the LLM call with retries is used
+    return list(stream_survey_response(response, stream=False))
+
+
+def stream_survey_response(response: Dict[str, Any], stream: bool = LLM_STREAM) -> Iterator[Dict[str, str]]:
+    """
+    Process a survey response and yield the recommended cards as soon as they are available.
+
+    Recommendations are stored once all cards have been generated; if the consumer
+    stops early or the LLM stream breaks off, nothing is stored.
+
+    Args:
+        response: Dictionary containing survey responses
+        stream: Stream the LLM output (LLM_STREAM) instead of waiting for the full answer
+
+    Yields:
+        Recommended card dictionaries
+
+    Raises:
+        LLMStreamError: If the LLM stream breaks off; the cards yielded so far are incomplete
+    """
     if not isinstance(response, dict):
         logger.warning(f"Invalid response type: {type(response)}, expected dict")
-        return []
+        return
 
     try:
         # Ensure the collection exists
@@ -62,38 +83,28 @@ def handle_survey_response(response: Dict[str, Any]) -> List[Dict[str, str]]:
 
         # Check for similar existing surveys to avoid duplicates
         existing_survey = is_similar_survey_existing(survey_vector)
-        if existing_survey and hasattr(existing_survey, 'payload'):
-            logger.info("Using recommendations from similar existing survey")
-
-            # Extract card recommendations from the existing survey
-            try:
-                card_dicts = existing_survey.payload.get("Recommended_Cards", [])
-                if card_dicts and isinstance(card_dicts, list):
-                    # Validate that we have valid card dictionaries
-                    valid_cards = [
-                        card for card in card_dicts
-                        if isinstance(card, dict) and "Card_ID" in card
-                    ]
-
-                    if valid_cards:
-                        logger.info(f"Retrieved {len(valid_cards)} recommendations from similar survey")
-                        return valid_cards
-                    else:
-                        logger.warning("Retrieved recommendations are invalid, generating new ones")
-                else:
-                    logger.warning("No valid recommendations in similar survey, generating new ones")
-            except Exception as e:
-                logger.error(f"Error extracting recommendations from similar survey: {str(e)}")
+        similar_cards = recommendations_from_similar_survey(existing_survey)
+        if similar_cards:
+            yield from similar_cards
+            return
 
         # Filter cards based on survey response
         filtered_cards = retrieve_filtered_cards(response)
         if not filtered_cards:
             logger.warning("No cards match the survey criteria")
-            return []
+            return
 
         # Generate top 5 recommendations using LLM
         logger.info(f"Generating recommendations from {len(filtered_cards)} filtered cards")
-        best_cards = generate_top_5_with_llm(filtered_cards, response)
+        if stream:
+            best_cards = []
+            for card in stream_top_5_with_llm(filtered_cards, response):
+                best_cards.append(card)
+                yield card
+            logger.info(f"Generated {len(best_cards)} card recommendations")
+        else:
+            best_cards = generate_top_5_with_llm(filtered_cards, response)
+            yield from best_cards
 
         # Store recommendations if they were successfully generated
         if best_cards:
@@ -105,11 +116,11 @@ def handle_survey_response(response: Dict[str, Any]) -> List[Dict[str, str]]:
         else:
             logger.warning("No recommendations were generated")
 
-        return best_cards
-
+    except LLMStreamError as e:
+        logger.error(f"LLM stream broke off, recommendations are not stored: {str(e)}")
+        raise
     except Exception as e:
         logger.error(f"Error handling survey response: {str(e)}")
-        return []
 
 
 if __name__ == "__main__":
@@ -1,18 +1,42 @@
 # === Configuratie ===
-from Credit_Card_Selector.Database.general_utils import load_env, load_env_value
+from urllib.parse import urlsplit
+
+from Credit_Card_Selector.Database.general_utils import load_env, load_env_value, str_to_bool
 
 SURVEY_COLLECTION = "credit_card_profiles"
 CARDS_COLLECTION = "credit_cards"
 OUTPUT_FILE = "recommended_cards.json"
 SERVER_OUTPUT_FILE = "../../Database/Credit_Card_Profiles_Handler/recommended_cards.json"
 SIMILARITY_THRESHOLD = 0.98
+SURVEY_ID_INDEX_FIELD = "Survey_ID_lower"  # Genormaliseerde Survey_ID met keyword index
+CARD_ID_INDEX_FIELD = "Card_ID_lower"  # Genormaliseerde Card_ID met keyword index
+PAYLOAD_HASH_FIELD = "Payload_Hash"  # Hash van de canonieke kaartpayload
+EMBEDDING_HASH_FIELD = "Embedding_Hash"  # Hash van de tekst waarmee de kaart geëncodeerd is
+# Opslagvelden die niet in API antwoorden horen
+INTERNAL_CARD_FIELDS = (CARD_ID_INDEX_FIELD, PAYLOAD_HASH_FIELD, EMBEDDING_HASH_FIELD)
 
 load_env()
 OLLAMA_API_URL = load_env_value("OLLAMA_API_URL")
 OLLAMA_MODEL = load_env_value("OLLAMA_MODEL")
+
+
+def _ollama_base_url(api_url):
+    """Scheme and host of OLLAMA_API_URL, or the default local Ollama server."""
+    parts = urlsplit(api_url or "")
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme and parts.netloc else "http://localhost:11434"
+
+
+OLLAMA_BASE_URL = load_env_value("OLLAMA_BASE_URL", default=_ollama_base_url(OLLAMA_API_URL))
+OLLAMA_POOL_SIZE = load_env_value("OLLAMA_POOL_SIZE", default=10, cast=int)  # Pooled keep-alive connections
+OLLAMA_HEALTH_CHECK_INTERVAL = load_env_value("OLLAMA_HEALTH_CHECK_INTERVAL", default=60, cast=float)  # Seconds
 MAX_TOKENS = load_env_value("MAX_TOKENS", cast=int)
 CARD_FETCH_LIMIT = load_env_value("CARD_FETCH_LIMIT", default=1000, cast=int)
 LLM_API_TIMEOUT = load_env_value("LLM_API_TIMEOUT", default=1000, cast=int)  # Timeout in seconds for LLM API calls
+LLM_STREAM = load_env_value("LLM_STREAM", default=True, cast=str_to_bool)  # Stream LLM output, stop after 5 cards
+CARD_CACHE_TTL = load_env_value("CARD_CACHE_TTL", default=300, cast=float)  # Seconds before the card catalogue is reloaded
+BULK_SYNC_ENABLED = load_env_value("BULK_SYNC_ENABLED", default=True, cast=str_to_bool)  # Diff + batch upsert on refresh
+UPSERT_BATCH_SIZE = load_env_value("UPSERT_BATCH_SIZE", default=64, cast=int)  # Points per Qdrant upsert call
+CSV_CHUNK_SIZE = load_env_value("CSV_CHUNK_SIZE", default=1000, cast=int)  # CSV rows read and synced at a time
 # Dynamische filterconfiguratie
 FILTER_CONFIG = {
     "Minimum_Income": "min",
@@ -1,14 +1,17 @@
 import json
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from qdrant_client.models import PointStruct, ScoredPoint
+from qdrant_client.models import FieldCondition, Filter, MatchValue, PointStruct, ScoredPoint
 from Credit_Card_Selector.Database.general_utils import (
-    get_logger, generate_unique_id, create_collection_if_not_exists, VECTOR_SIZE
+    get_logger, generate_unique_id, create_collection_if_not_exists, ensure_payload_index, VECTOR_SIZE
 )
 from Credit_Card_Selector.Database.qdrant_config import qdrant_client
 from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
-    CARDS_COLLECTION, SURVEY_COLLECTION, CARD_FETCH_LIMIT
+    CARDS_COLLECTION, SURVEY_COLLECTION, CARD_FETCH_LIMIT, CARD_CACHE_TTL, SURVEY_ID_INDEX_FIELD
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.text_index import (
+    CollectionTextIndex, survey_search_texts
 )
 
 # Configure module logger
@@ -38,6 +41,169 @@ def fetch_all_cards(collection_name: str, fetch_limit: int) -> List[Any]:
         return []
 
 
+def scroll_all_points(
+    collection_name: str,
+    with_payload: Any = True,
+    with_vectors: bool = False,
+    page_size: int = CARD_FETCH_LIMIT
+) -> List[Any]:
+    """
+    Retrieve every point of a collection, following Qdrant's scroll pages.
+
+    Unlike fetch_all_cards this is not capped at a fetch limit.
+
+    Args:
+        collection_name: Name of the Qdrant collection to query
+        with_payload: Whether (or which payload fields) to return
+        with_vectors: Whether to return the vectors
+        page_size: Number of points requested per scroll call
+
+    Returns:
+        List of all points in the collection
+
+    Raises:
+        Exception: If there's an error communicating with the database
+    """
+    points = []
+    offset = None
+    while True:
+        page, offset = qdrant_client.scroll(
+            collection_name=collection_name,
+            limit=page_size,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=with_vectors
+        )
+        points.extend(page)
+        if offset is None:
+            break
+    logger.debug(f"📋 Scrolled {len(points)} points from '{collection_name}'")
+    return points
+
+
+def fetch_page(
+    collection_name: str,
+    limit: int,
+    offset: Optional[Any] = None,
+    with_payload: Any = True
+) -> Tuple[List[Any], Optional[Any]]:
+    """
+    Retrieve one page of a collection with Qdrant's scroll.
+
+    Args:
+        collection_name: Name of the Qdrant collection to query
+        limit: Maximum number of points on the page
+        offset: Point id to start from, as returned for the previous page; None for the first page
+        with_payload: Whether (or which payload fields) to return
+
+    Returns:
+        Tuple of (points, next_offset); next_offset is None on the last page
+
+    Raises:
+        Exception: If there's an error communicating with the database
+    """
+    points, next_offset = qdrant_client.scroll(
+        collection_name=collection_name,
+        limit=limit,
+        offset=offset,
+        with_payload=with_payload,
+        with_vectors=False
+    )
+    logger.debug(f"📋 Retrieved page of {len(points)} points from '{collection_name}'")
+    return points, next_offset
+
+
+def page_point_ids(point_ids: List[Any], limit: int, offset: Optional[Any] = None) -> Tuple[List[Any], Optional[Any]]:
+    """
+    Select one page from a list of point ids, with the same offset semantics as fetch_page.
+
+    Args:
+        point_ids: Point ids to page through, in any order
+        limit: Maximum number of ids on the page
+        offset: Point id to start from; None for the first page
+
+    Returns:
+        Tuple of (page_ids, next_offset); next_offset is None on the last page
+    """
+    ordered = sorted(point_ids, key=str)
+    if offset is not None:
+        ordered = [point_id for point_id in ordered if str(point_id) >= str(offset)]
+    next_offset = ordered[limit] if len(ordered) > limit else None
+    return ordered[:limit], next_offset
+
+
+def fetch_points_by_ids(collection_name: str, point_ids: List[Any]) -> List[Any]:
+    """
+    Retrieve points by their Qdrant point id, in the order of the given ids.
+
+    Args:
+        collection_name: Name of the Qdrant collection to query
+        point_ids: Point ids to retrieve
+
+    Returns:
+        List of the points that exist
+
+    Raises:
+        Exception: If there's an error communicating with the database
+    """
+    if not point_ids:
+        return []
+    points = qdrant_client.retrieve(collection_name=collection_name, ids=list(point_ids), with_payload=True)
+    by_id = {str(point.id): point for point in points}
+    return [by_id[str(point_id)] for point_id in point_ids if str(point_id) in by_id]
+
+
+def normalize_survey_id(survey_id: Any) -> Optional[str]:
+    """
+    Normalize a Survey_ID for lookups: trimmed and lowercased.
+
+    Args:
+        survey_id: Survey_ID as stored or requested
+
+    Returns:
+        Normalized ID, or None if there is no ID
+    """
+    if survey_id is None:
+        return None
+    return str(survey_id).strip().lower()
+
+
+def find_survey_point(survey_id: str) -> Optional[Any]:
+    """
+    Look up a stored survey by Survey_ID through the keyword index on its normalized ID.
+
+    Args:
+        survey_id: Survey_ID to look up (case and surrounding whitespace are ignored)
+
+    Returns:
+        The survey point, or None if no survey has this ID
+
+    Raises:
+        Exception: If there's an error communicating with the database
+    """
+    normalized_id = normalize_survey_id(survey_id)
+    if not normalized_id:
+        return None
+
+    ensure_payload_index(SURVEY_COLLECTION, SURVEY_ID_INDEX_FIELD)
+    points, _ = qdrant_client.scroll(
+        collection_name=SURVEY_COLLECTION,
+        scroll_filter=Filter(must=[FieldCondition(key=SURVEY_ID_INDEX_FIELD, match=MatchValue(value=normalized_id))]),
+        limit=1,
+        with_payload=True,
+        with_vectors=False
+    )
+    return points[0] if points else None
+
+
+# Text index for search_term queries on stored survey responses
+survey_text_index = CollectionTextIndex(
+    lambda: scroll_all_points(SURVEY_COLLECTION, with_payload=["Survey_Response", "Recommended_Cards"]),
+    survey_search_texts,
+    CARD_CACHE_TTL
+)
+
+
 def fetch_cards_by_ids(collection_name: str, card_ids: List[str]) -> List[Dict[str, Any]]:
     """
     Retrieve cards based on a list of Card_IDs.
@@ -128,6 +294,7 @@ def store_recommendation_in_qdrant(
                 vector=survey_vector,
                 payload={
                     "Survey_ID": survey_id,  # Store survey_id at the top level
+                    SURVEY_ID_INDEX_FIELD: normalize_survey_id(survey_id),  # Indexed for lookups by ID
                     "Survey_Response": survey_response_obj,  # Store the prepared Survey_Response object
                     "Recommended_Cards": recommended_cards,
                     "Survey_Vector": survey_vector,  # Store the vector itself for reference
@@ -137,10 +304,12 @@ def store_recommendation_in_qdrant(
         ]
 
         # Store in Qdrant
+        ensure_payload_index(SURVEY_COLLECTION, SURVEY_ID_INDEX_FIELD)
         qdrant_client.upsert(
             collection_name=SURVEY_COLLECTION,
             points=points
         )
+        survey_text_index.add(points[0].id, points[0].payload)
 
         logger.info(f"Successfully saved {len(recommended_cards)} card recommendations to Qdrant")
         return True
@@ -0,0 +1,142 @@
+"""
+Filter Benchmark
+
+Compares the per-card filter loop that apply_manual_filters used before with the
+vectorized filter engine on synthetic catalogues, and checks that both return
+exactly the same cards in the same order.
+
+Usage:
+    python -m Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.filter_benchmark [sizes...]
+"""
+
+import random
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
+    FILTER_CONFIG
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.filter_engine import CompiledCards
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+REPEATS = 5
+
+CARD_TYPES = ["Gold", "Platinum", "Classic", "Signature", "Infinite", "Titanium", ""]
+REWARDS = ["Cashback", "Air Miles", "Points", "Travel", None]
+
+SURVEYS = [
+    {"Credit_Score": 80, "Rewards": "Cashback", "Card_Type": "Gold"},
+    {"Minimum_Income": 15000, "Monthly_Income": "20000", "Card_Type": "platinum"},
+    {"Interest_Rate": 2.5, "Rewards": "Unknown reward"},
+    {"Minimum_Income": "not a number", "Rewards": "points"},
+    {}
+]
+
+
+def legacy_apply_manual_filters(cards: List[Any], survey_response: Dict[str, Any]) -> List[Any]:
+    """Per-card filter loop as it was used by apply_manual_filters, kept as reference."""
+    filtered_cards = []
+    for card in cards:
+        is_match = True
+        if not hasattr(card, "payload"):
+            continue
+
+        for field, filter_type in FILTER_CONFIG.items():
+            survey_value = survey_response.get(field)
+            card_value = card.payload.get(field)
+
+            if survey_value in [None, 0, ""] or card_value in [None, 0, ""]:
+                continue
+
+            if filter_type == "match":
+                if str(survey_value).lower() != str(card_value).lower():
+                    is_match = False
+                    break
+
+            elif filter_type == "min":
+                try:
+                    if float(survey_value) > float(card_value):
+                        is_match = False
+                        break
+                except (ValueError, TypeError):
+                    continue
+
+        if is_match:
+            filtered_cards.append(card)
+    return filtered_cards
+
+
+def generate_cards(count: int, seed: int = 42) -> List[Any]:
+    """Generate synthetic cards with a mix of numeric, textual and empty values."""
+    rng = random.Random(seed)
+
+    def numeric(low: float, high: float) -> Any:
+        roll = rng.random()
+        if roll < 0.1:
+            return None
+        if roll < 0.15:
+            return "N/A"
+        if roll < 0.25:
+            return str(round(rng.uniform(low, high), 2))
+        return round(rng.uniform(low, high), 2)
+
+    cards = []
+    for i in range(count):
+        payload = {
+            "Card_ID": f"card-{i}",
+            "Minimum_Income": numeric(0, 50000),
+            "Interest_Rate": numeric(0, 5),
+            "Credit_Score": numeric(0, 100),
+            "Monthly_Income": numeric(0, 40000),
+            "Card_Type": rng.choice(CARD_TYPES),
+            "Rewards": rng.choice(REWARDS)
+        }
+        cards.append(SimpleNamespace(id=i, payload=payload))
+    return cards
+
+
+def _best_time(func, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(sizes: List[int]) -> bool:
+    """
+    Run the benchmark for every catalogue size.
+
+    Returns:
+        True if the engine returned the same cards as the legacy loop for every survey
+    """
+    all_equal = True
+    print(f"{'cards':>8} {'compile':>10} {'legacy/q':>10} {'engine/q':>10} {'speedup':>8}  equal")
+    for size in sizes:
+        cards = generate_cards(size)
+
+        start = time.perf_counter()
+        compiled = CompiledCards(cards)
+        compile_time = time.perf_counter() - start
+
+        equal = all(
+            [card.id for card in compiled.filter(survey)] == [card.id for card in legacy_apply_manual_filters(cards, survey)]
+            for survey in SURVEYS
+        )
+        all_equal = all_equal and equal
+
+        legacy_time = sum(_best_time(legacy_apply_manual_filters, cards, survey) for survey in SURVEYS) / len(SURVEYS)
+        engine_time = sum(_best_time(compiled.filter, survey) for survey in SURVEYS) / len(SURVEYS)
+        speedup = legacy_time / engine_time if engine_time else float("inf")
+
+        print(f"{size:>8} {compile_time * 1000:>8.1f}ms {legacy_time * 1000:>8.2f}ms "
+              f"{engine_time * 1000:>8.2f}ms {speedup:>7.1f}x  {'yes' if equal else 'NO'}")
+    return all_equal
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    sys.exit(0 if run_benchmark(sizes) else 1)
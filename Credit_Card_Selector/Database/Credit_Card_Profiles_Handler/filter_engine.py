@@ -0,0 +1,117 @@
+"""
+Filter Engine
+
+Columnar evaluation of the FILTER_CONFIG criteria. A list of cards is compiled once
+into typed columns:
+
+- "min" fields become NumPy float arrays, with NaN for values that are skipped
+  (empty) or cannot be converted to a number;
+- "match" fields become integer codes of the interned lowercase strings, with -1
+  for empty values.
+
+Filter criteria are then evaluated as boolean masks over all cards at once, with
+the same semantics as the per-card comparison: empty survey or card values never
+exclude a card, a card is excluded by a "min" field when the survey value is
+larger than the card value, and by a "match" field when the lowercase strings differ.
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
+    FILTER_CONFIG
+)
+
+EMPTY_CODE = -1  # Code of an empty "match" value, never excludes a card
+UNKNOWN_CODE = -2  # Code of a survey value that no card has
+
+
+def is_empty_filter_value(value: Any) -> bool:
+    """Return True for values that are skipped during filtering (None, 0 and "")."""
+    try:
+        return value in [None, 0, ""]
+    except Exception:
+        return False
+
+
+def _to_float(value: Any) -> float:
+    """Convert a card value to float, NaN if it is empty or not numeric."""
+    if is_empty_filter_value(value):
+        return np.nan
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+class CompiledCards:
+    """
+    Cards compiled into typed columns for vectorized filtering.
+
+    Args:
+        cards: Card objects with a ``payload`` dictionary
+        filter_config: Mapping of field name to filter type ("min" or "match")
+    """
+
+    def __init__(self, cards: List[Any], filter_config: Dict[str, str] = FILTER_CONFIG):
+        self.cards = [card for card in cards if getattr(card, "payload", None) is not None]
+        self.filter_config = dict(filter_config)
+        self.min_columns: Dict[str, np.ndarray] = {}
+        self.match_columns: Dict[str, np.ndarray] = {}
+        self.match_vocabularies: Dict[str, Dict[str, int]] = {}
+
+        for field, filter_type in self.filter_config.items():
+            values = [card.payload.get(field) for card in self.cards]
+            if filter_type == "min":
+                self.min_columns[field] = np.fromiter(
+                    (_to_float(value) for value in values), dtype=np.float64, count=len(values)
+                )
+            elif filter_type == "match":
+                vocabulary: Dict[str, int] = {}
+                codes = np.empty(len(values), dtype=np.int32)
+                for i, value in enumerate(values):
+                    if is_empty_filter_value(value):
+                        codes[i] = EMPTY_CODE
+                    else:
+                        codes[i] = vocabulary.setdefault(str(value).lower(), len(vocabulary))
+                self.match_columns[field] = codes
+                self.match_vocabularies[field] = vocabulary
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def mask(self, criteria: Dict[str, Any]) -> np.ndarray:
+        """
+        Evaluate the criteria for all cards.
+
+        Args:
+            criteria: Survey response or filter parameters
+
+        Returns:
+            Boolean array, True for every card that matches
+        """
+        mask = np.ones(len(self.cards), dtype=bool)
+        for field, filter_type in self.filter_config.items():
+            survey_value = criteria.get(field)
+            if is_empty_filter_value(survey_value):
+                continue
+
+            if filter_type == "min":
+                try:
+                    survey_num = float(survey_value)
+                except (ValueError, TypeError):
+                    # Not numeric: the field is skipped for every card
+                    continue
+                # NaN card values compare False and therefore never exclude a card
+                mask &= ~(survey_num > self.min_columns[field])
+
+            elif filter_type == "match":
+                code = self.match_vocabularies[field].get(str(survey_value).lower(), UNKNOWN_CODE)
+                codes = self.match_columns[field]
+                mask &= (codes == EMPTY_CODE) | (codes == code)
+        return mask
+
+    def filter(self, criteria: Dict[str, Any]) -> List[Any]:
+        """Return the cards that match the criteria, in their original order."""
+        return [self.cards[i] for i in np.flatnonzero(self.mask(criteria))]
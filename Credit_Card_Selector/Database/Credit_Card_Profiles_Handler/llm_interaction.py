@@ -1,21 +1,61 @@
 import json
 import re
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from json.decoder import JSONDecodeError
 
 import requests
 import tiktoken
-from requests.exceptions import RequestException, Timeout, ConnectionError
+from requests.exceptions import RequestException, Timeout, ConnectionError, ChunkedEncodingError
 from Credit_Card_Selector.Database.general_utils import get_logger
 from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
-    OLLAMA_API_URL, OLLAMA_MODEL, MAX_TOKENS, LLM_API_TIMEOUT, RELEVANT_FIELDS
+    OLLAMA_MODEL, MAX_TOKENS, LLM_API_TIMEOUT, RELEVANT_FIELDS
 )
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.ollama_client import ollama_client
 
 # Configure module logger
 logger = get_logger(__file__)
 
 
+# Token encodings per model, loaded once per process
+_TOKEN_ENCODINGS: Dict[Optional[str], Any] = {}
+
+# Tokens of the ",\n" between two cards in the JSON list, and of the "[\n" + "\n]" around it
+CARD_DELIMITER_TOKENS = 1
+CARD_LIST_TOKENS = 2
+
+# Margin per estimated card for tokens that merge across card boundaries. Only when the
+# estimate comes within this margin of the limit is the prompt recounted exactly.
+CARD_BOUNDARY_SLACK = 8
+
+
+def get_token_encoding(model: Optional[str]) -> Any:
+    """
+    Return the tiktoken encoding for a model, cached per process.
+
+    Args:
+        model: The model to get the encoding for
+
+    Returns:
+        The model's encoding, or 'cl100k_base' if tiktoken does not know the model
+
+    Raises:
+        Exception: If the encoding cannot be loaded
+    """
+    encoding = _TOKEN_ENCODINGS.get(model)
+    if encoding is None:
+        try:
+            # Try to get the encoding for the specified model
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Fall back to a base encoding if a model-specific one isn't available
+            encoding = tiktoken.get_encoding("cl100k_base")
+            logger.debug(f"Using fallback encoding 'cl100k_base' for model '{model}'")
+        _TOKEN_ENCODINGS[model] = encoding
+    return encoding
+
+
 def count_prompt_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
     """
     Count the number of tokens in a text string for a specific model.
@@ -34,12 +74,7 @@ def count_prompt_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
         return 0
 
     try:
-        # Try to get the encoding for the specified model
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        # Fall back to a base encoding if a model-specific one isn't available
-        encoding = tiktoken.get_encoding("cl100k_base")
-        logger.debug(f"Using fallback encoding 'cl100k_base' for model '{model}'")
+        encoding = get_token_encoding(model)
     except Exception as e:
         logger.error(f"Error getting token encoding: {str(e)}")
         # Return a conservative estimate as fallback
@@ -53,6 +88,27 @@ def count_prompt_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
         return len(text) // 3
 
 
+@lru_cache(maxsize=4096)
+def count_card_tokens(card_json: str, model: Optional[str]) -> int:
+    """
+    Count the tokens of one serialized card, memoized on its JSON text so every
+    version of a card is tokenized only once.
+
+    Args:
+        card_json: The card as it appears in the prompt's JSON list
+        model: The model to use for token counting
+
+    Returns:
+        Number of tokens in the card text
+    """
+    return count_prompt_tokens(card_json, model=model)
+
+
+def serialize_card_for_prompt(card: Dict[str, Any]) -> str:
+    """Serialize a card exactly as json.dumps(cards, indent=2) renders it inside the list."""
+    return "  " + json.dumps(card, indent=2).replace("\n", "\n  ")
+
+
 def build_llm_prompt_prefix(survey_response: Dict[str, Any]) -> Tuple[str, str]:
     """
     Build the prefix part of the LLM prompt with instructions and survey data.
@@ -143,6 +199,12 @@ def truncate_cards_to_token_limit(
         reserved_tokens = 100
         effective_max_tokens = MAX_TOKENS - reserved_tokens
 
+        # Running estimate of base_prompt_prefix + json.dumps(filtered_cards, indent=2): the last
+        # exact count plus the memoized token cost of every card added since then
+        counted_tokens = count_prompt_tokens(base_prompt_prefix, model=OLLAMA_MODEL) + CARD_LIST_TOKENS
+        estimated_cards = 0
+        test_token_count = counted_tokens
+
         for i, card in enumerate(cards):
             # Skip cards without payload
             if not hasattr(card, "payload"):
@@ -155,6 +217,7 @@ def truncate_cards_to_token_limit(
                     for key in RELEVANT_FIELDS
                     if key in card.payload and card.payload.get(key) is not None
                 }
+                card_tokens = count_card_tokens(serialize_card_for_prompt(temp_card), OLLAMA_MODEL)
 
                 # Add the card to our filtered list
                 filtered_cards.append(temp_card)
@@ -164,20 +227,27 @@ def truncate_cards_to_token_limit(
                     logger.info("Reached maximum card limit (50) for LLM prompt")
                     break
 
-                # Recalculate the token count with the updated list
-                test_prompt = base_prompt_prefix + json.dumps(filtered_cards, indent=2)
-                test_token_count = count_prompt_tokens(test_prompt, model=OLLAMA_MODEL)
+                counted_tokens += card_tokens + (CARD_DELIMITER_TOKENS if len(filtered_cards) > 1 else 0)
+                estimated_cards += 1
+                test_token_count = counted_tokens
 
-                # If the new token count exceeds the max, remove the last card and stop
-                if test_token_count >= effective_max_tokens:
-                    filtered_cards.pop()  # Remove the last added card
-                    logger.info(f"Token limit reached after adding {len(filtered_cards)} cards. "
-                               f"Token count: {test_token_count}/{effective_max_tokens}")
-                    break
+                # Near the limit the estimate is not precise enough: recount the prompt exactly
+                if counted_tokens + CARD_BOUNDARY_SLACK * (estimated_cards + 1) >= effective_max_tokens:
+                    test_prompt = base_prompt_prefix + json.dumps(filtered_cards, indent=2)
+                    test_token_count = count_prompt_tokens(test_prompt, model=OLLAMA_MODEL)
+                    counted_tokens = test_token_count
+                    estimated_cards = 0
+
+                    # If the new token count exceeds the max, remove the last card and stop
+                    if test_token_count >= effective_max_tokens:
+                        filtered_cards.pop()  # Remove the last added card
+                        logger.info(f"Token limit reached after adding {len(filtered_cards)} cards. "
+                                   f"Token count: {test_token_count}/{effective_max_tokens}")
+                        break
 
                 # Log progress periodically
                 if i % 10 == 0 and i > 0:
-                    logger.debug(f"Added {len(filtered_cards)} cards so far. Current token count: {test_token_count}")
+                    logger.debug(f"Added {len(filtered_cards)} cards so far. Current token count: ~{test_token_count}")
 
             except Exception as e:
                 logger.warning(f"Error processing card {i}: {str(e)}")
@@ -228,7 +298,7 @@ def call_llm_api(prompt: str, max_retries: int = 3, retry_delay: float = 2.0, ti
         try:
             # Set timeout to prevent hanging requests
             logger.debug(f"Making LLM API call with timeout of {timeout} seconds")
-            response = requests.post(OLLAMA_API_URL, json=payload, timeout=timeout)
+            response = ollama_client.generate(payload, timeout=timeout)
 
             # Log response status
             logger.debug(f"Received response from LLM: status={response.status_code}")
@@ -278,6 +348,9 @@ def ensure_ollama_running(max_retries: int = 2, retry_delay: float = 3.0) -> boo
     """
     Check if the Ollama model is running and start it if needed.
 
+    The result is cached and kept up to date by a background health check, so the
+    server is only probed when the model was not known to be ready.
+
     Args:
         max_retries: Maximum number of retry attempts
         retry_delay: Delay between retries in seconds
@@ -285,22 +358,20 @@ def ensure_ollama_running(max_retries: int = 2, retry_delay: float = 3.0) -> boo
     Returns:
         True if Ollama is running, False otherwise
     """
+    ollama_client.start_health_check()
+    if ollama_client.is_ready_cached():
+        return True
+
     # Check if Ollama is already running
     for attempt in range(max_retries + 1):
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=10)
+            if ollama_client.is_model_available():
+                logger.info(f"Ollama model '{OLLAMA_MODEL}' is already running")
+                ollama_client.set_model_ready(True)
+                return True
 
-            if response.status_code == 200:
-                models = response.json().get("models", [])
-
-                if OLLAMA_MODEL in models:
-                    logger.info(f"Ollama model '{OLLAMA_MODEL}' is already running")
-                    return True
-                else:
-                    logger.info(f"Ollama is running but model '{OLLAMA_MODEL}' is not loaded")
-                    break  # Continue to loading the model
-            else:
-                logger.warning(f"Unexpected response from Ollama server: {response.status_code}")
+            logger.info(f"Ollama is running but model '{OLLAMA_MODEL}' is not loaded")
+            break  # Continue to loading the model
 
         except Timeout:
             logger.warning(f"Timeout checking Ollama status (attempt {attempt+1}/{max_retries+1})")
@@ -314,25 +385,7 @@ def ensure_ollama_running(max_retries: int = 2, retry_delay: float = 3.0) -> boo
             time.sleep(retry_delay)
 
     # Try to start/pull the model
-    try:
-        logger.info(f"Pulling Ollama model '{OLLAMA_MODEL}'...")
-        start_response = requests.post(
-            "http://localhost:11434/api/pull",
-            json={"name": OLLAMA_MODEL},
-            timeout=60  # Longer timeout for model pulling
-        )
-
-        if start_response.status_code == 200:
-            logger.info(f"Successfully pulled Ollama model '{OLLAMA_MODEL}'")
-            return True
-        else:
-            logger.error(f"Failed to pull Ollama model: status={start_response.status_code}, "
-                        f"response={start_response.text[:200]}...")
-            return False
-
-    except Exception as e:
-        logger.error(f"Error pulling Ollama model: {str(e)}")
-        return False
+    return ollama_client.pull_model()
 
 
 def check_response_ok(response: Optional[requests.Response]) -> bool:
@@ -435,6 +488,260 @@ def parse_recommendations_from_llm(response: Optional[requests.Response]) -> Lis
         return []
 
 
+class StreamingCardParser:
+    """
+    Incremental parser for the JSON array of recommendations produced by the LLM.
+
+    Text is fed in arbitrary pieces; every JSON object at the top level of the
+    output is parsed as soon as its closing brace arrives. Braces inside strings
+    and nested objects are tracked, so only complete objects are returned.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Consume a piece of LLM output.
+
+        Args:
+            text: Next piece of the generated text
+
+        Returns:
+            Objects containing a Card_ID that were completed by this piece
+        """
+        cards = []
+        for char in text:
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._buffer = [char]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    card = self._parse_object("".join(self._buffer))
+                    if card is not None:
+                        cards.append(card)
+        return cards
+
+    @staticmethod
+    def _parse_object(text: str) -> Optional[Dict[str, Any]]:
+        try:
+            parsed = json.loads(text)
+        except JSONDecodeError:
+            logger.warning(f"Skipping malformed object in LLM stream: {text[:100]}...")
+            return None
+        if isinstance(parsed, dict) and "Card_ID" in parsed:
+            return parsed
+        return None
+
+
+class LLMStreamError(RequestException):
+    """The LLM stream could not be read to the end."""
+
+
+class _RetryableStreamError(LLMStreamError):
+    """Server error or a stream that broke off; worth another attempt if no card was yielded yet."""
+
+
+# Errors after which the stream is opened again, as long as the caller has no cards yet
+_RETRYABLE_STREAM_ERRORS = (Timeout, ConnectionError, ChunkedEncodingError, _RetryableStreamError)
+
+
+def _read_card_stream(payload: Dict[str, Any], max_cards: int, timeout: int) -> Iterator[Dict[str, Any]]:
+    """
+    Open one streaming LLM call and yield its cards until max_cards or the end of the generation.
+
+    Raises:
+        LLMStreamError: If the API returns an error or the stream ends before the generation is done
+        RequestException: If the connection fails
+    """
+    response = ollama_client.generate(payload, timeout=timeout, stream=True)
+    try:
+        if response.status_code >= 500:
+            raise _RetryableStreamError(f"Server error from LLM API: status={response.status_code}")
+        if response.status_code != 200:
+            raise LLMStreamError(f"Error response from LLM API: status={response.status_code}, "
+                                 f"response={response.text[:200]}...")
+
+        parser = StreamingCardParser()
+        card_count = 0
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            try:
+                chunk = json.loads(line)
+            except JSONDecodeError:
+                logger.warning(f"Invalid JSON line in LLM stream: {line[:200]}")
+                continue
+
+            for card in parser.feed(chunk.get("response", "")):
+                card_count += 1
+                yield card
+                if card_count >= max_cards:
+                    logger.info(f"Received {card_count} cards, stopping LLM stream early")
+                    return
+
+            if chunk.get("done"):
+                logger.info(f"LLM stream finished with {card_count} cards")
+                return
+
+        raise _RetryableStreamError(f"LLM stream ended after {card_count} cards, before the generation was done")
+    finally:
+        response.close()
+
+
+def stream_llm_recommendations(
+    prompt: str,
+    max_cards: int = 5,
+    timeout: int = LLM_API_TIMEOUT,
+    max_retries: int = 3,
+    retry_delay: float = 2.0
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream recommendations from the LLM as soon as each card object is complete.
+
+    Ollama's NDJSON stream is parsed incrementally and the connection is closed as
+    soon as max_cards cards have arrived, without waiting for the rest of the generation.
+
+    Timeouts, connection errors and server errors are retried like in call_llm_api, but
+    only until the first card is yielded: a retry would hand the caller its cards twice.
+    A stream that breaks after that raises LLMStreamError, so the caller knows the
+    cards it received are incomplete.
+
+    Args:
+        prompt: The prompt to send to the LLM
+        max_cards: Number of cards after which the stream is stopped
+        timeout: Timeout in seconds for connecting and between received chunks
+        max_retries: Maximum number of attempts before the first card
+        retry_delay: Delay between retries in seconds
+
+    Yields:
+        Recommended card dictionaries, in the order the LLM produces them
+
+    Raises:
+        LLMStreamError: If the stream fails after all retries or breaks after the first card
+    """
+    if not prompt:
+        logger.error("Empty prompt provided to LLM API")
+        return
+
+    payload = {
+        "model": OLLAMA_MODEL,
+        "prompt": prompt,
+        "stream": True
+    }
+
+    cards_yielded = 0
+    error = None
+    for attempt in range(max_retries):
+        try:
+            for card in _read_card_stream(payload, max_cards, timeout):
+                cards_yielded += 1
+                yield card
+            return
+        except _RETRYABLE_STREAM_ERRORS as e:
+            error = e
+        except LLMStreamError:
+            raise
+        except RequestException as e:
+            raise LLMStreamError(f"Request error calling LLM API: {str(e)}") from e
+
+        if cards_yielded:
+            raise LLMStreamError(f"LLM stream broke after {cards_yielded} cards: {str(error)}") from error
+
+        logger.warning(f"LLM stream failed before the first card (attempt {attempt+1}/{max_retries}): {str(error)}")
+        if attempt < max_retries - 1:
+            time.sleep(retry_delay * (attempt + 1))
+
+    raise LLMStreamError(f"Failed to stream from LLM API after {max_retries} attempts: {str(error)}") from error
+
+
+def build_llm_prompt(cards: List[Any], survey_response: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+    """
+    Build the full LLM prompt for a survey and its candidate cards.
+
+    Args:
+        cards: List of card objects to choose from
+        survey_response: Dictionary containing survey responses
+
+    Returns:
+        Tuple of (prompt, number of cards in the prompt), or None if no card fits
+    """
+    # Build the prompt
+    base_prompt_prefix, survey_json = build_llm_prompt_prefix(survey_response)
+
+    # Truncate cards to fit the token limit
+    filtered_cards = truncate_cards_to_token_limit(cards, base_prompt_prefix, survey_json)
+    if not filtered_cards:
+        logger.warning("No cards left after token limit truncation")
+        return None
+
+    # Build the full prompt
+    return base_prompt_prefix + json.dumps(filtered_cards, indent=2), len(filtered_cards)
+
+
+def stream_top_5_with_llm(
+    cards: List[Any],
+    survey_response: Dict[str, Any]
+) -> Iterator[Dict[str, str]]:
+    """
+    Generate the top 5 card recommendations using the LLM, yielding each card as soon as it is generated.
+
+    Args:
+        cards: List of card objects to choose from
+        survey_response: Dictionary containing survey responses
+
+    Yields:
+        Recommended card dictionaries
+
+    Raises:
+        LLMStreamError: If the LLM stream fails or breaks off (see stream_llm_recommendations)
+    """
+    if not cards:
+        logger.warning("No cards provided for LLM recommendation")
+        return
+
+    if not isinstance(survey_response, dict):
+        logger.warning(f"Invalid survey_response type: {type(survey_response)}, expected dict")
+        return
+
+    try:
+        # Ensure Ollama is running
+        ensure_ollama_running()
+
+        prompt = build_llm_prompt(cards, survey_response)
+        if prompt is None:
+            return
+        full_prompt, card_count = prompt
+
+        logger.info(f"Streaming LLM API call with {card_count} cards")
+        yield from stream_llm_recommendations(full_prompt)
+
+    except LLMStreamError:
+        # The caller has to know its cards are incomplete
+        raise
+    except Exception as e:
+        logger.error(f"Error streaming recommendations with LLM: {str(e)}")
+
+
 def generate_top_5_with_llm(
     cards: List[Any],
     survey_response: Dict[str, Any]
@@ -461,20 +768,13 @@ def generate_top_5_with_llm(
         # Ensure Ollama is running
         ensure_ollama_running()
 
-        # Build the prompt
-        base_prompt_prefix, survey_json = build_llm_prompt_prefix(survey_response)
-
-        # Truncate cards to fit the token limit
-        filtered_cards = truncate_cards_to_token_limit(cards, base_prompt_prefix, survey_json)
-        if not filtered_cards:
-            logger.warning("No cards left after token limit truncation")
+        prompt = build_llm_prompt(cards, survey_response)
+        if prompt is None:
             return []
-
-        # Build the full prompt
-        full_prompt = base_prompt_prefix + json.dumps(filtered_cards, indent=2)
+        full_prompt, card_count = prompt
 
         # Call the LLM API
-        logger.info(f"Calling LLM API with {len(filtered_cards)} cards")
+        logger.info(f"Calling LLM API with {card_count} cards")
         response = call_llm_api(full_prompt)
 
         # Parse recommendations from the response
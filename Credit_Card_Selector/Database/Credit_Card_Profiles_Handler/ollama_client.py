@@ -0,0 +1,171 @@
+"""
+Ollama Client
+
+Shared HTTP layer for the Ollama backend. All calls go through one pooled
+requests.Session, so recommendations reuse keep-alive connections instead of
+opening a new TCP connection per request.
+
+Whether the configured model is available is cached: it is checked on first use
+and then refreshed by a background health check every OLLAMA_HEALTH_CHECK_INTERVAL
+seconds, so the request path does not probe /api/tags for every survey.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from Credit_Card_Selector.Database.general_utils import get_logger
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
+    OLLAMA_API_URL, OLLAMA_BASE_URL, OLLAMA_MODEL, OLLAMA_POOL_SIZE, OLLAMA_HEALTH_CHECK_INTERVAL
+)
+
+# Configure module logger
+logger = get_logger(__file__)
+
+
+def model_names_match(available_name: str, model: str) -> bool:
+    """Return True if a model name from /api/tags refers to the configured model ("name" == "name:latest")."""
+    if not available_name or not model:
+        return False
+    if available_name == model:
+        return True
+    if ":" not in model:
+        return available_name == f"{model}:latest"
+    return False
+
+
+class OllamaClient:
+    """
+    Pooled client for an Ollama server.
+
+    Args:
+        base_url: Base URL of the Ollama server, e.g. http://localhost:11434
+        model: Name of the model used for recommendations
+        generate_url: URL of the generate endpoint; defaults to <base_url>/api/generate
+        pool_size: Maximum number of pooled connections
+        health_check_interval: Seconds between background readiness checks; 0 or less
+            disables the cache and checks on every call
+    """
+
+    def __init__(self, base_url: str, model: Optional[str], generate_url: Optional[str] = None,
+                 pool_size: int = 10, health_check_interval: float = 60):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.generate_url = generate_url or self.url("/api/generate")
+        self.health_check_interval = health_check_interval
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._model_ready = False
+        self._checked_at: Optional[float] = None
+        self._state_lock = threading.Lock()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def url(self, path: str) -> str:
+        """Return the absolute URL of an API path."""
+        return f"{self.base_url}{path}"
+
+    # === Requests ===
+    def generate(self, payload: Dict[str, Any], timeout: float, stream: bool = False) -> requests.Response:
+        """
+        POST a prompt to the generate endpoint.
+
+        Raises:
+            RequestException: If the request fails
+        """
+        return self.session.post(self.generate_url, json=payload, timeout=timeout, stream=stream)
+
+    def is_model_available(self, timeout: float = 10) -> bool:
+        """
+        Ask the server whether the configured model is available.
+
+        Returns:
+            True if /api/tags lists the model
+
+        Raises:
+            RequestException: If the server cannot be reached
+        """
+        response = self.session.get(self.url("/api/tags"), timeout=timeout)
+        if response.status_code != 200:
+            logger.warning(f"Unexpected response from Ollama server: {response.status_code}")
+            return False
+
+        for model in response.json().get("models", []):
+            name = (model.get("name") or model.get("model")) if isinstance(model, dict) else model
+            if model_names_match(name, self.model):
+                return True
+        return False
+
+    def pull_model(self, timeout: float = 60) -> bool:
+        """Pull the configured model; returns True on success."""
+        try:
+            logger.info(f"Pulling Ollama model '{self.model}'...")
+            response = self.session.post(self.url("/api/pull"), json={"name": self.model}, timeout=timeout)
+            if response.status_code == 200:
+                logger.info(f"Successfully pulled Ollama model '{self.model}'")
+                self.set_model_ready(True)
+                return True
+            logger.error(f"Failed to pull Ollama model: status={response.status_code}, "
+                         f"response={response.text[:200]}...")
+        except Exception as e:
+            logger.error(f"Error pulling Ollama model: {str(e)}")
+        return False
+
+    # === Readiness ===
+    def set_model_ready(self, ready: bool) -> None:
+        """Record the result of a readiness check."""
+        with self._state_lock:
+            self._model_ready = ready
+            self._checked_at = time.monotonic()
+
+    def is_ready_cached(self) -> bool:
+        """Return True if a recent check found the model ready, without any request."""
+        with self._state_lock:
+            return (
+                self._model_ready
+                and self._checked_at is not None
+                and self.health_check_interval > 0
+                and time.monotonic() - self._checked_at < self.health_check_interval * 2
+            )
+
+    def check_health(self) -> bool:
+        """Check the model once and update the cached state; returns the new state."""
+        try:
+            ready = self.is_model_available()
+        except Exception as e:
+            logger.warning(f"Ollama health check failed: {str(e)}")
+            ready = False
+        self.set_model_ready(ready)
+        return ready
+
+    def _health_loop(self) -> None:
+        while True:
+            time.sleep(self.health_check_interval)
+            self.check_health()
+
+    def start_health_check(self) -> None:
+        """Start the background health check thread (once per process)."""
+        if self.health_check_interval <= 0:
+            return
+        with self._state_lock:
+            if self._health_thread is not None:
+                return
+            self._health_thread = threading.Thread(target=self._health_loop, name="ollama-health-check", daemon=True)
+            self._health_thread.start()
+        logger.info(f"🩺 Ollama health check every {self.health_check_interval}s on {self.base_url}")
+
+
+# Shared client for the configured Ollama server
+ollama_client = OllamaClient(
+    OLLAMA_BASE_URL,
+    OLLAMA_MODEL,
+    generate_url=OLLAMA_API_URL,
+    pool_size=OLLAMA_POOL_SIZE,
+    health_check_interval=OLLAMA_HEALTH_CHECK_INTERVAL
+)
@@ -158,4 +158,37 @@ def is_similar_survey_existing(survey_vector: List[float]) -> Optional[ScoredPoi
 
     except Exception as e:
         logger.error(f"Error checking for similar surveys: {str(e)}")
-        return None
\ No newline at end of file
+        return None
+
+def recommendations_from_similar_survey(existing_survey: Optional[ScoredPoint]) -> List[Dict[str, Any]]:
+    """
+    Extract the recommended cards stored with a similar survey.
+
+    Args:
+        existing_survey: The similar survey, as returned by is_similar_survey_existing
+
+    Returns:
+        The valid recommended card dictionaries, or an empty list if new ones have to be generated
+    """
+    if not existing_survey or not hasattr(existing_survey, 'payload'):
+        return []
+
+    logger.info("Using recommendations from similar existing survey")
+    try:
+        card_dicts = existing_survey.payload.get("Recommended_Cards", [])
+        if card_dicts and isinstance(card_dicts, list):
+            # Validate that we have valid card dictionaries
+            valid_cards = [
+                card for card in card_dicts
+                if isinstance(card, dict) and "Card_ID" in card
+            ]
+
+            if valid_cards:
+                logger.info(f"Retrieved {len(valid_cards)} recommendations from similar survey")
+                return valid_cards
+            logger.warning("Retrieved recommendations are invalid, generating new ones")
+        else:
+            logger.warning("No valid recommendations in similar survey, generating new ones")
+    except Exception as e:
+        logger.error(f"Error extracting recommendations from similar survey: {str(e)}")
+    return []
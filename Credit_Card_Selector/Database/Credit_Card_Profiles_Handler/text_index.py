@@ -0,0 +1,269 @@
+"""
+Text Index
+
+Inverted index for the ``search_term`` queries on cards and survey responses. Every
+document is a list of lowercase field texts; the index keeps
+
+- postings of all character n-grams (length 1 to MAX_GRAM) of every text, used for
+  substring lookup: the postings of the n-grams of a search term give the candidate
+  documents, which are then verified against the stored texts;
+- postings of the word tokens with a sorted token list, used for prefix lookup.
+
+Substring results are exactly those of ``term in str(value).lower()`` over the
+indexed fields. Documents are added, replaced and removed one at a time, so the index
+is kept up to date incrementally when cards or surveys are written.
+"""
+
+import bisect
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from Credit_Card_Selector.Database.general_utils import get_logger
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
+    INTERNAL_CARD_FIELDS
+)
+
+# Configure module logger
+logger = get_logger(__file__)
+
+MAX_GRAM = 3
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def searchable_texts(values: Iterable[Any]) -> List[str]:
+    """Return the lowercase text of every value that the text search looks at."""
+    return [str(value).lower() for value in values if isinstance(value, (str, int, float))]
+
+
+def card_search_texts(payload: Dict[str, Any]) -> List[str]:
+    """Return the searchable texts of a card payload, without the internal storage fields (hashes, index keys)."""
+    if not isinstance(payload, dict):
+        return []
+    return searchable_texts(value for key, value in payload.items() if key not in INTERNAL_CARD_FIELDS)
+
+
+def survey_search_texts(payload: Dict[str, Any]) -> List[str]:
+    """Return the searchable texts of a stored survey: its answers and its recommended cards."""
+    if not isinstance(payload, dict):
+        return []
+    texts = card_search_texts(payload.get("Survey_Response", {}))
+    for card in payload.get("Recommended_Cards", []) or []:
+        texts.extend(card_search_texts(card))
+    return texts
+
+
+def _ngrams(texts: Iterable[str], max_gram: int) -> Set[str]:
+    grams = set()
+    for text in texts:
+        for size in range(1, max_gram + 1):
+            grams.update(text[i:i + size] for i in range(len(text) - size + 1))
+    return grams
+
+
+def _tokens(texts: Iterable[str]) -> Set[str]:
+    tokens = set()
+    for text in texts:
+        tokens.update(TOKEN_PATTERN.findall(text))
+    return tokens
+
+
+class TextIndex:
+    """
+    Thread-safe inverted n-gram and token index over documents of lowercase texts.
+
+    Args:
+        max_gram: Longest n-gram that is indexed
+    """
+
+    def __init__(self, max_gram: int = MAX_GRAM):
+        self.max_gram = max_gram
+        self._docs: Dict[Hashable, Tuple[str, ...]] = {}
+        self._grams: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._token_docs: Dict[str, Set[Hashable]] = defaultdict(set)
+        self._sorted_tokens: Optional[List[str]] = None
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._docs
+
+    # === Onderhoud ===
+    def add(self, doc_id: Hashable, texts: Iterable[str]) -> bool:
+        """
+        Add a document, or replace it if it is already indexed.
+
+        Args:
+            doc_id: Identifier of the document (e.g. the Qdrant point id)
+            texts: Lowercase texts of the document
+
+        Returns:
+            True if the index changed, False if the document was indexed with the same texts
+        """
+        texts = tuple(texts)
+        with self._lock:
+            if self._docs.get(doc_id) == texts:
+                return False
+            self.remove(doc_id)
+            self._docs[doc_id] = texts
+            for gram in _ngrams(texts, self.max_gram):
+                self._grams[gram].add(doc_id)
+            for token in _tokens(texts):
+                if token not in self._token_docs:
+                    self._sorted_tokens = None
+                self._token_docs[token].add(doc_id)
+            return True
+
+    def remove(self, doc_id: Hashable) -> bool:
+        """Remove a document; returns False if it was not indexed."""
+        with self._lock:
+            texts = self._docs.pop(doc_id, None)
+            if texts is None:
+                return False
+            for gram in _ngrams(texts, self.max_gram):
+                postings = self._grams.get(gram)
+                if postings is not None:
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self._grams[gram]
+            for token in _tokens(texts):
+                postings = self._token_docs.get(token)
+                if postings is not None:
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self._token_docs[token]
+                        self._sorted_tokens = None
+            return True
+
+    def sync(self, docs: Dict[Hashable, Iterable[str]]) -> Tuple[int, int]:
+        """
+        Bring the index in line with a complete set of documents, re-indexing only
+        documents whose texts changed.
+
+        Args:
+            docs: Mapping of document id to its texts
+
+        Returns:
+            Tuple with the number of (re)indexed and removed documents
+        """
+        with self._lock:
+            removed = [doc_id for doc_id in self._docs if doc_id not in docs]
+            for doc_id in removed:
+                self.remove(doc_id)
+            indexed = sum(1 for doc_id, texts in docs.items() if self.add(doc_id, texts))
+        return indexed, len(removed)
+
+    # === Zoeken ===
+    def search(self, term: str) -> Set[Hashable]:
+        """
+        Find the documents with a text that contains the term.
+
+        Args:
+            term: Search term, matched case-insensitively as a substring
+
+        Returns:
+            Set of matching document ids
+        """
+        term = str(term).lower()
+        with self._lock:
+            if not term:
+                return set(self._docs)
+            if len(term) <= self.max_gram:
+                return set(self._grams.get(term, ()))
+
+            grams = {term[i:i + self.max_gram] for i in range(len(term) - self.max_gram + 1)}
+            postings = sorted((self._grams.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+            return {doc_id for doc_id in candidates if any(term in text for text in self._docs[doc_id])}
+
+    def search_prefix(self, prefix: str) -> Set[Hashable]:
+        """
+        Find the documents with a word that starts with the prefix.
+
+        Args:
+            prefix: Word prefix, matched case-insensitively
+
+        Returns:
+            Set of matching document ids
+        """
+        prefix = str(prefix).lower()
+        with self._lock:
+            if self._sorted_tokens is None:
+                self._sorted_tokens = sorted(self._token_docs)
+            tokens = self._sorted_tokens
+            matches = set()
+            for i in range(bisect.bisect_left(tokens, prefix), len(tokens)):
+                if not tokens[i].startswith(prefix):
+                    break
+                matches |= self._token_docs[tokens[i]]
+            return matches
+
+
+class CollectionTextIndex:
+    """
+    Text index over a Qdrant collection, loaded on first use.
+
+    The index is synchronised with the collection when it is older than ttl_seconds
+    (re-indexing only changed points) and can be updated directly when points are written.
+
+    Args:
+        load_points: Callable returning all points of the collection
+        extract_texts: Callable returning the searchable texts of a payload
+        ttl_seconds: Maximum age before the index is synchronised again; 0 or less
+            synchronises on every search
+    """
+
+    def __init__(self, load_points: Callable[[], List[Any]],
+                 extract_texts: Callable[[Dict[str, Any]], List[str]], ttl_seconds: float):
+        self.load_points = load_points
+        self.extract_texts = extract_texts
+        self.ttl_seconds = ttl_seconds
+        self.index = TextIndex()
+        self._order: Dict[Hashable, int] = {}
+        self._synced_at: Optional[float] = None
+        self._sync_lock = threading.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (self._synced_at is not None and self.ttl_seconds > 0
+                and time.monotonic() - self._synced_at < self.ttl_seconds)
+
+    def sync(self) -> None:
+        """Synchronise the index with the collection."""
+        with self._sync_lock:
+            if self._is_fresh():
+                return
+            try:
+                points = [point for point in self.load_points() if getattr(point, "payload", None) is not None]
+            except Exception as e:
+                logger.error(f"Failed to load points for the text index: {str(e)}")
+                return
+            indexed, removed = self.index.sync({point.id: self.extract_texts(point.payload) for point in points})
+            self._order = {point.id: position for position, point in enumerate(points)}
+            self._synced_at = time.monotonic()
+            logger.info(f"🔎 Text index synchronised: {len(self.index)} documents "
+                        f"({indexed} indexed, {removed} removed)")
+
+    def add(self, point_id: Hashable, payload: Dict[str, Any]) -> None:
+        """Index a point that was just written; ignored until the index has been loaded."""
+        if self._synced_at is None:
+            return
+        self.index.add(point_id, self.extract_texts(payload))
+        self._order.setdefault(point_id, len(self._order))
+
+    def search(self, term: str) -> List[Hashable]:
+        """
+        Find the points with a text that contains the term.
+
+        Returns:
+            Matching point ids, in collection order
+        """
+        self.sync()
+        return sorted(self.index.search(term), key=lambda point_id: self._order.get(point_id, len(self._order)))
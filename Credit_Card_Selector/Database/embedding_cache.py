@@ -0,0 +1,203 @@
+"""
+Embedding Cache
+
+Persistent, content-addressed cache for sentence embeddings. Vectors are stored in
+a memory-mapped float32 file with one row per slot. Two more memory-mapped files hold
+the SHA-256 of the text of every slot and the tick at which the slot was last used;
+the in-memory LRU index is rebuilt from them when the cache is opened. A write only
+touches the slots of its batch, so its cost does not grow with the capacity.
+
+Every cache file is bound to one (model name, vector size) pair, so switching the
+embedding model never returns vectors from another model. Each slot also stores
+the key it was written for and reads verify it, so a slot that was overwritten by
+another process is treated as a miss instead of returning a wrong vector.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+KEY_BYTES = 32  # SHA-256 digest size
+CACHE_FORMAT = 2  # Version of the file layout; caches of another version are reset
+
+
+def text_key(text: str) -> str:
+    """Return the hex SHA-256 of a text, used as cache key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    LRU cache of embeddings backed by memory-mapped files.
+
+    Args:
+        cache_dir: Directory where the cache files are stored
+        model_name: Name of the embedding model the vectors belong to
+        vector_size: Dimension of the stored vectors
+        capacity: Maximum number of vectors kept on disk
+    """
+
+    def __init__(self, cache_dir: str, model_name: str, vector_size: int, capacity: int):
+        self.model_name = model_name
+        self.vector_size = vector_size
+        self.capacity = max(1, capacity)
+        self._lock = threading.Lock()
+
+        safe_model = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        stem = f"{safe_model}_{vector_size}"
+        cache_path = Path(cache_dir)
+        cache_path.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = cache_path / f"{stem}.f32"
+        self._keys_path = cache_path / f"{stem}.keys"
+        self._ticks_path = cache_path / f"{stem}.ticks"
+        self._meta_path = cache_path / f"{stem}.meta.json"
+        self._legacy_index_path = cache_path / f"{stem}.index.json"
+
+        self._index = OrderedDict()  # key -> slot, least recently used first
+        self._next_slot = 0
+        self._clock = 0
+        self._load()
+
+    # === Opslag ===
+    def _load(self) -> None:
+        """Open the memory-mapped files and rebuild the index, resetting on any mismatch."""
+        meta = None
+        if self._meta_path.exists():
+            try:
+                with open(self._meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = None
+
+        valid = (
+            meta is not None
+            and meta.get("format") == CACHE_FORMAT
+            and meta.get("model_name") == self.model_name
+            and meta.get("vector_size") == self.vector_size
+            and meta.get("capacity") == self.capacity
+            and self._vectors_path.exists()
+            and self._keys_path.exists()
+            and self._ticks_path.exists()
+        )
+        mode = "r+" if valid else "w+"
+
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode=mode,
+                                  shape=(self.capacity, self.vector_size))
+        self._keys = np.memmap(self._keys_path, dtype=np.uint8, mode=mode,
+                               shape=(self.capacity, KEY_BYTES))
+        self._ticks = np.memmap(self._ticks_path, dtype=np.uint64, mode=mode, shape=(self.capacity,))
+
+        if valid:
+            # Used slots have a tick; sorting them by tick restores the LRU order
+            used = np.flatnonzero(self._ticks)
+            order = used[np.argsort(self._ticks[used], kind="stable")]
+            self._index = OrderedDict((self._keys[slot].tobytes().hex(), int(slot)) for slot in order)
+            self._next_slot = int(used[-1]) + 1 if len(used) else 0
+            self._clock = int(self._ticks.max()) if len(used) else 0
+        else:
+            self._index = OrderedDict()
+            self._next_slot = 0
+            self._clock = 0
+            self._write_meta()
+            # Caches from before CACHE_FORMAT 2 kept a JSON index
+            self._legacy_index_path.unlink(missing_ok=True)
+
+    def _write_meta(self) -> None:
+        """Write the metadata that binds the files to one model atomically."""
+        data = {
+            "format": CACHE_FORMAT,
+            "model_name": self.model_name,
+            "vector_size": self.vector_size,
+            "capacity": self.capacity
+        }
+        tmp_path = self._meta_path.with_name(self._meta_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _touch(self, slot: int) -> None:
+        """Mark a slot as most recently used."""
+        self._clock += 1
+        self._ticks[slot] = self._clock
+
+    def _free_slot(self) -> int:
+        """Return an unused slot, evicting the least recently used entry once all slots are taken."""
+        if self._next_slot < self.capacity:
+            slot = self._next_slot
+            self._next_slot += 1
+            return slot
+        if not self._index:
+            self._next_slot = 1
+            return 0
+        _, slot = self._index.popitem(last=False)
+        return slot
+
+    # === Publieke API ===
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up the vectors of several texts.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            List with the cached vector for every text, or None for a miss
+        """
+        results = []
+        with self._lock:
+            for text in texts:
+                key = text_key(text)
+                slot = self._index.get(key)
+                if slot is None or self._keys[slot].tobytes() != bytes.fromhex(key):
+                    if slot is not None:
+                        # Slot was overwritten by another process
+                        del self._index[key]
+                    results.append(None)
+                    continue
+                self._index.move_to_end(key)
+                self._touch(slot)
+                results.append(self._vectors[slot].tolist())
+        return results
+
+    def put_many(self, texts: Iterable[str], vectors: Iterable[Sequence[float]]) -> None:
+        """
+        Store the vectors of several texts and flush the written slots to disk.
+
+        Args:
+            texts: Texts that were encoded
+            vectors: Vectors belonging to the texts, in the same order
+        """
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                if vector is None or len(vector) != self.vector_size:
+                    continue
+                key = text_key(text)
+                slot = self._index.pop(key, None)
+                if slot is None:
+                    slot = self._free_slot()
+                self._vectors[slot] = np.asarray(vector, dtype=np.float32)
+                self._keys[slot] = np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+                self._index[key] = slot
+                self._touch(slot)
+            self._vectors.flush()
+            self._keys.flush()
+            self._ticks.flush()
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._index.clear()
+            self._next_slot = 0
+            self._clock = 0
+            self._ticks[:] = 0
+            self._ticks.flush()
+
+    def __len__(self) -> int:
+        return len(self._index)
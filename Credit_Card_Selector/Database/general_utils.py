@@ -1,5 +1,8 @@
+import csv
 import logging
 import os
+import threading
+import time
 from pathlib import Path
 from typing import Any, Callable, Optional
 
@@ -10,10 +13,12 @@ import pandas as pd
 from dotenv import load_dotenv
 from qdrant_client.conversions.common_types import VectorParams
 from qdrant_client import QdrantClient
-from sentence_transformers import SentenceTransformer
 
 from Credit_Card_Selector.Database.qdrant_config import qdrant_client
 
+# Moment waarop het proces begon met importeren, gebruikt voor het opstartrapport
+PROCESS_START_TIME = time.perf_counter()
+
 # === Configuratie ===
 ENV_PATH = Path("CREDIT_CARD_SELECTOR/.env")
 
@@ -48,17 +53,29 @@ def load_env_value(
         return default
 
 
+def str_to_bool(value: str) -> bool:
+    """Interpret an environment value such as '1', 'true' or 'yes' as a boolean."""
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
 # === Load model settings ===
 VECTOR_SIZE = load_env_value("VECTOR_SIZE", default=1024, cast=int)
 MODEL_NAME = load_env_value("SENTENCE_TRANSFORMER_MODEL", default="intfloat/multilingual-e5-large")
+FALLBACK_MODEL_NAME = load_env_value("FALLBACK_SENTENCE_TRANSFORMER_MODEL", default="all-MiniLM-L6-v2")
+# Load the model in a background thread at startup instead of on the first encode
+MODEL_WARMUP = load_env_value("MODEL_WARMUP", default=True, cast=str_to_bool)
+EMBEDDING_BATCH_SIZE = load_env_value("EMBEDDING_BATCH_SIZE", default=32, cast=int)
+# Maximum number of characters per batch, so long texts end up in smaller batches
+EMBEDDING_MAX_BATCH_CHARS = load_env_value("EMBEDDING_MAX_BATCH_CHARS", default=32000, cast=int)
+
+# === Embedding cache settings ===
+EMBEDDING_CACHE_ENABLED = load_env_value("EMBEDDING_CACHE_ENABLED", default=True, cast=str_to_bool)
+EMBEDDING_CACHE_DIR = load_env_value(
+    "EMBEDDING_CACHE_DIR",
+    default=str(Path(__file__).resolve().parents[1] / "Cache" / "embeddings")
+)
+EMBEDDING_CACHE_SIZE = load_env_value("EMBEDDING_CACHE_SIZE", default=10000, cast=int)
 
-try:
-    MODEL = SentenceTransformer(MODEL_NAME)
-    print(f"[model] Loaded model: {MODEL_NAME}")
-except Exception as e:
-    fallback_model = "all-MiniLM-L6-v2"
-    print(f"[model] Failed to load '{MODEL_NAME}', using fallback '{fallback_model}': {e}")
-    MODEL = SentenceTransformer(fallback_model)
 
 # === Logging configuratie ===
 logger = logging.getLogger("credit_card_logger")
@@ -83,6 +100,129 @@ console_handler.setFormatter(console_formatter)
 logger.addHandler(console_handler)
 
 
+# === Model (lazy geladen) ===
+_model = None
+_model_lock = threading.Lock()
+_warmup_thread = None
+ACTIVE_MODEL_NAME = None
+_startup_report = {
+    "model_name": None,
+    "model_load_seconds": None,
+    "model_loaded_after_seconds": None,
+    "ready_after_seconds": None,
+}
+
+
+def get_model():
+    """
+    Geeft het SentenceTransformer model terug en laadt het bij het eerste gebruik.
+
+    Loading is thread-safe: concurrent callers wait for the same load. If
+    MODEL_NAME cannot be loaded, FALLBACK_MODEL_NAME is used instead.
+    """
+    global _model, ACTIVE_MODEL_NAME
+    if _model is not None:
+        return _model
+
+    with _model_lock:
+        if _model is None:
+            # Import hier, zodat torch alleen geladen wordt als er echt geëncodeerd wordt
+            from sentence_transformers import SentenceTransformer
+
+            load_start = time.perf_counter()
+            try:
+                model = SentenceTransformer(MODEL_NAME)
+                ACTIVE_MODEL_NAME = MODEL_NAME
+                logger.info(f"[model] Loaded model: {MODEL_NAME}")
+            except Exception as e:
+                logger.warning(f"[model] Failed to load '{MODEL_NAME}', using fallback '{FALLBACK_MODEL_NAME}': {e}")
+                model = SentenceTransformer(FALLBACK_MODEL_NAME)
+                ACTIVE_MODEL_NAME = FALLBACK_MODEL_NAME
+
+            loaded_at = time.perf_counter()
+            _startup_report["model_name"] = ACTIVE_MODEL_NAME
+            _startup_report["model_load_seconds"] = round(loaded_at - load_start, 3)
+            _startup_report["model_loaded_after_seconds"] = round(loaded_at - PROCESS_START_TIME, 3)
+            logger.info(f"[model] '{ACTIVE_MODEL_NAME}' geladen in {_startup_report['model_load_seconds']}s.")
+            _model = model
+    return _model
+
+
+def is_model_loaded():
+    """Geeft aan of het model al in het geheugen staat."""
+    return _model is not None
+
+
+def warm_up_model(background=True):
+    """
+    Laadt het model vooraf, zodat de eerste request er niet op hoeft te wachten.
+
+    Args:
+        background: Load in a daemon thread and return immediately (default True)
+
+    Returns:
+        The warm-up thread when loading in the background, otherwise None
+    """
+    global _warmup_thread
+    if _model is not None:
+        return None
+    if not background:
+        get_model()
+        return None
+
+    with _model_lock:
+        if _warmup_thread is None or not _warmup_thread.is_alive():
+            def _warm_up():
+                try:
+                    get_model()
+                except Exception as e:
+                    logger.error(f"[model] Warm-up mislukt: {e}")
+
+            _warmup_thread = threading.Thread(target=_warm_up, name="model-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def mark_ready(component: str = "process") -> dict:
+    """
+    Registreert dat een component klaar is om requests te verwerken en logt het opstartrapport.
+
+    Args:
+        component: Name of the component that became ready, used in the log line
+
+    Returns:
+        The startup report (see get_startup_report)
+    """
+    _startup_report["ready_after_seconds"] = round(time.perf_counter() - PROCESS_START_TIME, 3)
+    report = get_startup_report()
+    logger.info(f"⏱️ {component} klaar na {report['ready_after_seconds']}s "
+                f"(model geladen: {report['model_loaded']}, laadtijd model: {report['model_load_seconds']}s)")
+    return report
+
+
+def get_startup_report() -> dict:
+    """
+    Geeft een overzicht van de opstarttijden van het proces.
+
+    Returns:
+        Dictionary with the uptime, the time until the process was ready, whether the
+        model is loaded and how long loading it took (all in seconds)
+    """
+    return {
+        **_startup_report,
+        "model_loaded": is_model_loaded(),
+        "model_warmup_enabled": MODEL_WARMUP,
+        "uptime_seconds": round(time.perf_counter() - PROCESS_START_TIME, 3),
+    }
+
+
+def __getattr__(name):
+    # Backwards compatibility: `general_utils.MODEL` loads the model on access
+    if name == "MODEL":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def get_logger(module_file: str) -> logging.Logger:
     script_name = Path(module_file).stem
 
@@ -122,15 +262,148 @@ def get_logger(module_file: str) -> logging.Logger:
     return logger
 
 
-def encode_text(text):
-    """Encodeert tekst naar een vector."""
-    vector = MODEL.encode(text)
+def _fit_vector_size(vector):
+    """Past een vector aan naar VECTOR_SIZE dimensies (padding met nullen)."""
     if len(vector) != VECTOR_SIZE:
-        # Padding naar VECTOR_SIZE dimensies
-        padded_vector = np.zeros(1024, dtype=np.float32)
-        padded_vector[:len(vector)] = vector
+        padded_vector = np.zeros(VECTOR_SIZE, dtype=np.float32)
+        padded_vector[:len(vector)] = vector[:VECTOR_SIZE]
         return padded_vector.tolist()
-    return vector.tolist()
+    return np.asarray(vector, dtype=np.float32).tolist()
+
+
+def _length_buckets(texts, batch_size, max_batch_chars):
+    """
+    Groups text indices into batches of similar length.
+
+    Texts are sorted by length so every batch pads to roughly the same sequence
+    length. A batch is closed when it holds ``batch_size`` texts or when adding
+    the next text would exceed ``max_batch_chars``.
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    batch, batch_chars = [], 0
+    for index in order:
+        text_chars = len(texts[index])
+        if batch and (len(batch) >= batch_size or batch_chars + text_chars > max_batch_chars):
+            yield batch
+            batch, batch_chars = [], 0
+        batch.append(index)
+        batch_chars += text_chars
+    if batch:
+        yield batch
+
+
+_embedding_caches = {}
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name=None):
+    """
+    Geeft de persistente embedding cache van een model terug, of None als die uitgeschakeld is.
+
+    Args:
+        model_name: Model the vectors belong to (default MODEL_NAME). Every model has
+            its own cache, so vectors of the fallback model are never mixed with those
+            of MODEL_NAME.
+    """
+    global EMBEDDING_CACHE_ENABLED
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    model_name = model_name or MODEL_NAME
+    cache = _embedding_caches.get(model_name)
+    if cache is None:
+        with _embedding_cache_lock:
+            cache = _embedding_caches.get(model_name)
+            if cache is None:
+                try:
+                    from Credit_Card_Selector.Database.embedding_cache import EmbeddingCache
+                    cache = EmbeddingCache(EMBEDDING_CACHE_DIR, model_name, VECTOR_SIZE, EMBEDDING_CACHE_SIZE)
+                    _embedding_caches[model_name] = cache
+                    logger.info(f"Embedding cache geopend in '{EMBEDDING_CACHE_DIR}' met {len(cache)} vectoren.")
+                except Exception as e:
+                    logger.error(f"Fout bij openen embedding cache, cache uitgeschakeld: {e}")
+                    EMBEDDING_CACHE_ENABLED = False
+                    return None
+    return cache
+
+
+def _lookup_cached(texts, model_name):
+    """Zoekt teksten op in de cache van een model; geeft (cache, vectoren) terug."""
+    cache = get_embedding_cache(model_name)
+    if cache is None:
+        return None, [None] * len(texts)
+    try:
+        return cache, cache.get_many(texts)
+    except Exception as e:
+        logger.warning(f"Fout bij lezen embedding cache: {e}")
+        return cache, [None] * len(texts)
+
+
+def _encode_uncached(texts, batch_size, max_batch_chars):
+    """Encodeert teksten met het model, in batches van vergelijkbare lengte."""
+    vectors = [None] * len(texts)
+    for batch in _length_buckets(texts, batch_size, max_batch_chars):
+        embeddings = get_model().encode(
+            [texts[i] for i in batch],
+            batch_size=len(batch),
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        for index, embedding in zip(batch, embeddings):
+            vectors[index] = _fit_vector_size(embedding)
+    return vectors
+
+
+def encode_texts(texts, batch_size=None, max_batch_chars=None):
+    """
+    Encodeert een lijst teksten naar vectoren in batches.
+
+    Texts found in the embedding cache are returned without running the model;
+    only the misses are encoded and then added to the cache.
+
+    Args:
+        texts: List of strings to encode
+        batch_size: Maximum number of texts per forward pass (default EMBEDDING_BATCH_SIZE)
+        max_batch_chars: Maximum total characters per batch (default EMBEDDING_MAX_BATCH_CHARS)
+
+    Returns:
+        List of vectors (lists of floats) in the same order as ``texts``
+    """
+    texts = ["" if text is None else str(text) for text in texts]
+    if not texts:
+        return []
+
+    batch_size = max(1, batch_size or EMBEDDING_BATCH_SIZE)
+    max_batch_chars = max(1, max_batch_chars or EMBEDDING_MAX_BATCH_CHARS)
+
+    # Before the model is loaded we assume MODEL_NAME, so cache hits never load the model
+    lookup_model = ACTIVE_MODEL_NAME or MODEL_NAME
+    cache, vectors = _lookup_cached(texts, lookup_model)
+
+    # Encode each distinct missing text once
+    missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+    if missing:
+        get_model()
+        if ACTIVE_MODEL_NAME != lookup_model:
+            # The fallback model was loaded: only its own cached vectors are usable
+            cache, vectors = _lookup_cached(texts, ACTIVE_MODEL_NAME)
+            missing = list(dict.fromkeys(text for text, vector in zip(texts, vectors) if vector is None))
+    cached_count = sum(vector is not None for vector in vectors)
+    if missing:
+        encoded = dict(zip(missing, _encode_uncached(missing, batch_size, max_batch_chars)))
+        vectors = [encoded[text] if vector is None else vector for text, vector in zip(texts, vectors)]
+        if cache is not None:
+            try:
+                cache.put_many(missing, [encoded[text] for text in missing])
+            except Exception as e:
+                logger.warning(f"Fout bij schrijven embedding cache: {e}")
+
+    logger.debug(f"{len(texts)} teksten geëncodeerd ({cached_count} uit cache).")
+    return vectors
+
+
+def encode_text(text):
+    """Encodeert tekst naar een vector."""
+    return encode_texts([text])[0]
 
 
 def generate_unique_id():
@@ -149,6 +422,70 @@ def load_csv_data(csv_path):
         return None
 
 
+def iter_csv_records(csv_path, chunk_size):
+    """
+    Lees de CSV in stukken van chunk_size rijen, zodat het geheugengebruik begrensd blijft.
+
+    Yields:
+        list: De rijen van een chunk als dictionaries
+    """
+    for chunk in pd.read_csv(csv_path, chunksize=max(1, chunk_size)):
+        yield chunk.to_dict("records")
+
+
+def count_csv_rows(csv_path):
+    """Tel de datarijen van een CSV zonder ze in te laden; regeleinden binnen quotes tellen niet mee."""
+    with open(csv_path, newline="", encoding="utf-8") as csv_file:
+        return max(0, sum(1 for row in csv.reader(csv_file) if row) - 1)
+
+
+# Kolomgeoriënteerde bestanden van de PreProcessor. pyarrow wordt pas geïmporteerd als zo'n
+# bestand gelezen wordt, zodat CSV's ook zonder pyarrow geladen kunnen worden.
+PARQUET_EXTENSIONS = (".parquet",)
+ARROW_EXTENSIONS = (".arrow", ".feather")
+
+
+def iter_records(data_path, chunk_size):
+    """
+    Lees een CSV-, Parquet- of Arrow IPC-bestand in stukken van chunk_size rijen.
+
+    Parquet and Arrow files are memory-mapped; an Arrow IPC table is read and sliced
+    without copying. Columnar files keep their types (booleans, nullable numbers), missing
+    values are returned as None.
+
+    Yields:
+        list: De rijen van een chunk als dictionaries
+    """
+    chunk_size = max(1, chunk_size)
+    extension = os.path.splitext(data_path)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(data_path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+    elif extension in ARROW_EXTENSIONS:
+        import pyarrow as pa
+        with pa.memory_map(data_path) as source:
+            table = pa.ipc.open_file(source).read_all()
+            for start in range(0, table.num_rows, chunk_size):
+                yield table.slice(start, chunk_size).to_pylist()
+    else:
+        yield from iter_csv_records(data_path, chunk_size)
+
+
+def count_rows(data_path):
+    """Tel de rijen van een CSV-, Parquet- of Arrow IPC-bestand; voor Parquet en Arrow uit de metadata."""
+    extension = os.path.splitext(data_path)[1].lower()
+    if extension in PARQUET_EXTENSIONS:
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(data_path, memory_map=True).metadata.num_rows
+    if extension in ARROW_EXTENSIONS:
+        import pyarrow as pa
+        with pa.memory_map(data_path) as source:
+            return pa.ipc.open_file(source).read_all().num_rows
+    return count_csv_rows(data_path)
+
+
 def normalize_value(value):
     """Converteert NaN of None naar None en stript strings."""
     if value is None or (isinstance(value, float) and np.isnan(value)):
@@ -218,6 +555,31 @@ def create_collection_if_not_exists(collection_name):
             logger.debug(f"Index voor Card_Link bestaat mogelijk al: {e}")
 
 
+_ensured_indexes = set()
+_ensured_indexes_lock = threading.Lock()
+
+
+def ensure_payload_index(collection_name, field_name, field_schema="keyword"):
+    """Maak een payload index aan als dat in dit proces nog niet gebeurd is."""
+    key = (collection_name, field_name)
+    if key in _ensured_indexes:
+        return
+    with _ensured_indexes_lock:
+        if key in _ensured_indexes:
+            return
+        try:
+            qdrant_client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema
+            )
+            _ensured_indexes.add(key)
+            logger.info(f"Index voor {field_name} aangemaakt in collectie '{collection_name}'.")
+        except Exception as e:
+            # Opnieuw proberen bij de volgende aanroep, bv. als de collectie nog niet bestaat
+            logger.debug(f"Index voor {field_name} kon niet aangemaakt worden: {e}")
+
+
 def create_snapshot(collection_name):
     """Maak een snapshot van de collectie."""
     try:
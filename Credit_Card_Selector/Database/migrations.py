@@ -0,0 +1,238 @@
+"""
+Database Migrations
+
+One-time data migrations for the Qdrant collections. Every migration is idempotent:
+it only rewrites the points that still need it, so running it again is safe.
+
+Run all migrations with:
+    python -m Credit_Card_Selector.Database.migrations
+
+or only some of them by name:
+    python -m Credit_Card_Selector.Database.migrations card_point_ids
+"""
+
+import sys
+from typing import Callable, Dict, List, Optional
+
+from qdrant_client.models import PointIdsList, PointStruct
+
+from Credit_Card_Selector.Database.general_utils import get_logger, collection_exists, ensure_payload_index
+from Credit_Card_Selector.Database.qdrant_config import qdrant_client
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.credit_card_profiles_handler_config import (
+    SURVEY_COLLECTION, SURVEY_ID_INDEX_FIELD, CARD_ID_INDEX_FIELD, CARD_FETCH_LIMIT, UPSERT_BATCH_SIZE
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.database_operations import (
+    normalize_survey_id, scroll_all_points
+)
+from Credit_Card_Selector.Database.Credit_Card_Handler.credit_card_handler import (
+    CREDIT_CARDS_COLLECTION, card_point_id, normalize_card_id
+)
+
+# Configure module logger
+logger = get_logger(__file__)
+
+
+def migrate_survey_ids(page_size: int = CARD_FETCH_LIMIT) -> Dict[str, int]:
+    """
+    Give every stored survey an indexed, normalized Survey_ID.
+
+    Legacy records that only have the ID nested in Survey_Response also get it at the
+    top level, like newly stored surveys.
+
+    Args:
+        page_size: Number of points read per scroll call
+
+    Returns:
+        Dictionary with the number of surveys checked, updated and without any ID
+    """
+    stats = {"checked": 0, "updated": 0, "missing_id": 0}
+    if not collection_exists(SURVEY_COLLECTION):
+        logger.info(f"Collection '{SURVEY_COLLECTION}' does not exist, nothing to migrate")
+        return stats
+
+    ensure_payload_index(SURVEY_COLLECTION, SURVEY_ID_INDEX_FIELD)
+
+    offset = None
+    while True:
+        page, offset = qdrant_client.scroll(
+            collection_name=SURVEY_COLLECTION,
+            limit=page_size,
+            offset=offset,
+            with_payload=["Survey_ID", "Survey_Response", SURVEY_ID_INDEX_FIELD],
+            with_vectors=False
+        )
+        for point in page:
+            stats["checked"] += 1
+            payload = point.payload or {}
+
+            survey_id = payload.get("Survey_ID")
+            nested_response = payload.get("Survey_Response")
+            if survey_id is None and isinstance(nested_response, dict):
+                survey_id = nested_response.get("Survey_ID")
+            if survey_id is None:
+                stats["missing_id"] += 1
+                continue
+
+            updates = {}
+            if payload.get("Survey_ID") is None:
+                updates["Survey_ID"] = survey_id
+            normalized_id = normalize_survey_id(survey_id)
+            if payload.get(SURVEY_ID_INDEX_FIELD) != normalized_id:
+                updates[SURVEY_ID_INDEX_FIELD] = normalized_id
+
+            if updates:
+                qdrant_client.set_payload(collection_name=SURVEY_COLLECTION, payload=updates, points=[point.id])
+                stats["updated"] += 1
+
+        if offset is None:
+            break
+
+    logger.info(f"Survey ID migration: {stats['updated']} of {stats['checked']} surveys updated, "
+                f"{stats['missing_id']} without Survey_ID")
+    return stats
+
+
+def migrate_card_ids(page_size: int = CARD_FETCH_LIMIT) -> Dict[str, int]:
+    """
+    Give every stored credit card an indexed, normalized Card_ID_lower.
+
+    Args:
+        page_size: Number of points read per scroll call
+
+    Returns:
+        Dictionary with the number of cards checked and updated
+    """
+    stats = {"checked": 0, "updated": 0}
+    if not collection_exists(CREDIT_CARDS_COLLECTION):
+        logger.info(f"Collection '{CREDIT_CARDS_COLLECTION}' does not exist, nothing to migrate")
+        return stats
+
+    ensure_payload_index(CREDIT_CARDS_COLLECTION, CARD_ID_INDEX_FIELD)
+
+    offset = None
+    while True:
+        page, offset = qdrant_client.scroll(
+            collection_name=CREDIT_CARDS_COLLECTION,
+            limit=page_size,
+            offset=offset,
+            with_payload=["Card_ID", CARD_ID_INDEX_FIELD],
+            with_vectors=False
+        )
+        for point in page:
+            stats["checked"] += 1
+            payload = point.payload or {}
+            normalized_id = normalize_card_id(payload.get("Card_ID"))
+            if CARD_ID_INDEX_FIELD not in payload or payload.get(CARD_ID_INDEX_FIELD) != normalized_id:
+                qdrant_client.set_payload(
+                    collection_name=CREDIT_CARDS_COLLECTION,
+                    payload={CARD_ID_INDEX_FIELD: normalized_id},
+                    points=[point.id]
+                )
+                stats["updated"] += 1
+
+        if offset is None:
+            break
+
+    logger.info(f"Card ID migration: {stats['updated']} of {stats['checked']} cards updated")
+    return stats
+
+
+def migrate_card_point_ids(batch_size: int = UPSERT_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Move credit cards stored under a random point ID to their deterministic ID (see card_point_id).
+
+    Cards are copied with their vector and payload, so nothing is re-encoded. When several
+    points belong to the same card, the first one is kept and the others are removed.
+
+    Args:
+        batch_size: Number of cards moved per upsert and delete call
+
+    Returns:
+        Dictionary with the number of cards checked, moved, removed as duplicate and
+        left in place because they have no Card_ID or Card_Link
+    """
+    stats = {"checked": 0, "moved": 0, "duplicates_removed": 0, "without_identifier": 0}
+    if not collection_exists(CREDIT_CARDS_COLLECTION):
+        logger.info(f"Collection '{CREDIT_CARDS_COLLECTION}' does not exist, nothing to migrate")
+        return stats
+
+    points = scroll_all_points(CREDIT_CARDS_COLLECTION, with_payload=True, with_vectors=False)
+    targets = {str(point.id): card_point_id(point.payload or {}) for point in points}
+    stats["checked"] = len(points)
+
+    # Points that already have their deterministic ID keep it
+    claimed = {point_id for point_id, target in targets.items() if point_id == target}
+    moves, duplicates = {}, []  # old id -> new id, old ids to remove
+    for point_id, target in targets.items():
+        if target is None:
+            stats["without_identifier"] += 1
+        elif point_id == target:
+            continue
+        elif target in claimed:
+            duplicates.append(point_id)
+        else:
+            moves[point_id] = target
+            claimed.add(target)
+
+    old_ids = list(moves)
+    for start in range(0, len(old_ids), max(1, batch_size)):
+        batch = old_ids[start:start + batch_size]
+        old_points = qdrant_client.retrieve(
+            collection_name=CREDIT_CARDS_COLLECTION, ids=batch, with_payload=True, with_vectors=True
+        )
+        qdrant_client.upsert(
+            collection_name=CREDIT_CARDS_COLLECTION,
+            points=[
+                PointStruct(id=moves[str(point.id)], vector=point.vector, payload=point.payload)
+                for point in old_points
+            ]
+        )
+        qdrant_client.delete(collection_name=CREDIT_CARDS_COLLECTION, points_selector=PointIdsList(points=batch))
+        stats["moved"] += len(old_points)
+
+    if duplicates:
+        qdrant_client.delete(collection_name=CREDIT_CARDS_COLLECTION, points_selector=PointIdsList(points=duplicates))
+    stats["duplicates_removed"] = len(duplicates)
+
+    logger.info(f"Card point ID migration: {stats['moved']} of {stats['checked']} cards moved, "
+                f"{stats['duplicates_removed']} duplicates removed, "
+                f"{stats['without_identifier']} without Card_ID or Card_Link")
+    return stats
+
+
+# Migrations in the order they are applied
+MIGRATIONS: Dict[str, Callable[[], Dict[str, int]]] = {
+    "survey_id_index": migrate_survey_ids,
+    "card_id_index": migrate_card_ids,
+    "card_point_ids": migrate_card_point_ids,
+}
+
+
+def run_migrations(names: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Run migrations in order.
+
+    Args:
+        names: Names of the migrations to run; all migrations if None
+
+    Returns:
+        Dictionary mapping every migration that ran to its stats
+
+    Raises:
+        ValueError: If a name is not a known migration
+    """
+    unknown = [name for name in names or [] if name not in MIGRATIONS]
+    if unknown:
+        raise ValueError(f"Unknown migrations: {', '.join(unknown)} (available: {', '.join(MIGRATIONS)})")
+
+    results = {}
+    for name, migration in MIGRATIONS.items():
+        if names and name not in names:
+            continue
+        logger.info(f"🔧 Running migration '{name}'...")
+        results[name] = migration()
+    return results
+
+
+if __name__ == "__main__":
+    run_migrations(sys.argv[1:] or None)
@@ -1,54 +1,92 @@
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import (
+    Blueprint, Flask, Response, current_app, request, jsonify, render_template, send_from_directory,
+    stream_with_context
+)
 import os
 
 # Import utility functions
 from Credit_Card_Selector.Server.server_utils import (
-    extract_filter_params, format_response, format_error
+    extract_filter_params, extract_pagination_params, format_page, format_response, format_error, format_sse
 )
 from Credit_Card_Selector.Server.swagger_utils import (
     setup_swagger, SWAGGER_JSON
 )
+from Credit_Card_Selector.Server.server_config import (
+    SERVER_HOST, SERVER_PORT, SERVER_DEBUG, SERVER_PRELOAD
+)
 
 # Import API functions
 from Credit_Card_Selector.Database.Credit_Card_Handler.credit_card_api import (
-    get_all_credit_cards, get_credit_card_by_id, filter_credit_cards
+    get_credit_cards_page, get_credit_card_by_id, filter_credit_cards
 )
 from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.survey_api import (
-    process_survey, get_all_survey_responses, get_survey_response_by_id
+    process_survey, stream_survey, get_survey_responses_page, get_survey_response_by_id
 )
 from Data_Handler.PreProcessor.data_processing_api import (
     merge_and_categorize
 )
 
 # Import database utilities
-from Credit_Card_Selector.Database.general_utils import get_logger
+from Credit_Card_Selector.Database.general_utils import (
+    get_logger, warm_up_model, mark_ready, get_startup_report, MODEL_WARMUP
+)
 from Credit_Card_Selector.Database.Credit_Card_Handler.credit_card_handler import (
     update_credit_cards_from_csv
 )
+from Credit_Card_Selector.Server.jobs import get_job_manager
 
-# Create Flask app
-app = Flask(__name__,
-            static_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'),
-            template_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates'))
 logger = get_logger(__file__)
 
-# Set up Swagger documentation
-setup_swagger(app)
+# All routes live on this blueprint; create_app() registers it on a new app
+api = Blueprint('api', __name__)
+
+
+def create_app() -> Flask:
+    """
+    Create and configure the Flask application.
+
+    Used as factory by production servers, e.g.
+    gunicorn -c Credit_Card_Selector/Server/gunicorn.conf.py "Credit_Card_Selector.Server.Server:create_app()".
+
+    With SERVER_PRELOAD the embedding model is loaded synchronously, so a preloading
+    server loads it once in the master process and its workers share the memory
+    copy-on-write. Otherwise every worker loads the model lazily (in the background
+    when MODEL_WARMUP is enabled).
+
+    Returns:
+        The Flask application
+    """
+    app = Flask(__name__,
+                static_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'),
+                template_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates'))
+    app.register_blueprint(api)
+
+    # Set up Swagger documentation
+    setup_swagger(app)
+
+    if SERVER_PRELOAD:
+        warm_up_model(background=False)
+    elif MODEL_WARMUP:
+        # Load the embedding model in the background so startup is not blocked by torch
+        warm_up_model(background=True)
+
+    return app
+
 
 # Root route to serve Swagger UI
-@app.route('/')
+@api.route('/')
 def index():
     """Serve the Swagger UI documentation."""
     return render_template('swagger.html')
 
 # Serve swagger.json
-@app.route('/static/<path:path>')
+@api.route('/static/<path:path>')
 def send_static(path):
-    return send_from_directory(app.static_folder, path)
+    return send_from_directory(current_app.static_folder, path)
 
 
 # API v1 routes
-@app.route('/api/v1/process_survey', methods=['POST'])
+@api.route('/api/v1/process_survey', methods=['POST'])
 def api_process_survey():
     """
     Process a survey response and return recommended credit cards.
@@ -91,71 +129,122 @@ def api_process_survey():
         return format_error(str(e), 500)
 
 
-@app.route('/api/v1/credit_cards', methods=['POST'])
-def api_update_database():
+@api.route('/api/v1/process_survey/stream', methods=['POST'])
+def api_process_survey_stream():
     """
-    Update the credit card database with the latest CSV data.
+    Process a survey response and stream the recommended credit cards as Server-Sent Events.
+    Every card is sent as a "card" event as soon as the LLM has generated it, followed by
+    a "done" event with the number of cards, or an "error" event.
     ---
     tags:
       - Credit Cards
+    produces:
+      - text/event-stream
+    parameters:
+      - in: body
+        name: body
+        description: Survey response data
+        required: true
+        schema:
+          type: object
     responses:
       200:
-        description: Database successfully updated
-      500:
-        description: Internal server error
+        description: Stream of card, done and error events
+      400:
+        description: Bad request
     """
-    try:
-        logger.info("🔹 Manual database update started...")
+    data = request.get_json(silent=True)
+    if not data:
+        logger.warning("❗ No JSON data received.")
+        return format_error("No JSON data received.", 400)
 
-        # Call the function from credit_card_handler.py
-        success, message, stats = update_credit_cards_from_csv()
+    def generate_events():
+        for event, event_data in stream_survey(data):
+            yield format_sse(event, event_data)
 
-        if not success:
-            return format_error(message, 500)
+    return Response(
+        stream_with_context(generate_events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-        # Include stats in the response
-        response_data = {
-            "message": message,
-            "stats": stats
-        }
 
-        logger.info("🔹 Database update completed!")
-        return format_response(response_data, "result")
+@api.route('/api/v1/credit_cards', methods=['POST'])
+def api_update_database():
+    """
+    Start a background update of the credit card database with the latest CSV data.
+    If an update is already queued or running, that job is returned instead.
+    ---
+    tags:
+      - Credit Cards
+    responses:
+      202:
+        description: Update job accepted; poll /api/v1/jobs/{job_id} for progress and stats
+      500:
+        description: Internal server error
+    """
+    try:
+        job, created = get_job_manager().submit(
+            "update_credit_cards",
+            lambda progress: update_credit_cards_from_csv(progress_callback=progress)
+        )
+        if created:
+            logger.info(f"🔹 Manual database update started as job {job['id']}")
+        return _job_accepted(job)
     except Exception as e:
         logger.error(f"❌ Error updating database: {str(e)}")
         return format_error(str(e), 500)
 
 
-@app.route('/api/v1/credit_cards', methods=['GET'])
+@api.route('/api/v1/credit_cards', methods=['GET'])
 def api_get_all_credit_cards():
     """
-    Get all credit cards from the database.
+    Get the credit cards from the database, one page at a time.
     ---
     tags:
       - Credit Cards
+    parameters:
+      - name: limit
+        in: query
+        description: Maximum number of items per page (default 100)
+        required: false
+        type: integer
+        example: 100
+      - name: cursor
+        in: query
+        description: Cursor of the page to fetch, taken from next_cursor of the previous page
+        required: false
+        type: string
     responses:
       200:
-        description: List of all credit cards
+        description: One page of credit cards; next_cursor is null on the last page
+      400:
+        description: Invalid limit or cursor
       500:
         description: Internal server error
     """
     try:
-        cards, error = get_all_credit_cards()
+        try:
+            limit, offset = extract_pagination_params()
+        except ValueError as e:
+            return format_error(str(e), 400)
+
+        cards, next_offset, error = get_credit_cards_page(limit, offset)
 
         if error:
             return format_error(error, 500)
 
-        if not cards:
+        if not cards and offset is None:
             return format_response("No credit cards found.", "message")
 
-        return format_response(cards, "credit_cards")
+        return format_page(cards, "credit_cards", next_offset)
 
     except Exception as e:
         logger.error(f"❌ Error retrieving credit cards: {str(e)}")
         return format_error(str(e), 500)
 
 
-@app.route('/api/v1/credit_cards/<card_id>', methods=['GET'])
+@api.route('/api/v1/credit_cards/<card_id>', methods=['GET'])
 def api_get_credit_card_by_id(card_id):
     """
     Get a specific credit card by ID.
@@ -196,14 +285,26 @@ def api_get_credit_card_by_id(card_id):
         return format_error(str(e), 500)
 
 
-@app.route('/api/v1/survey_responses', methods=['GET'])
+@api.route('/api/v1/survey_responses', methods=['GET'])
 def api_get_all_survey_responses():
     """
-    Get all survey responses from the database with optional filtering.
+    Get the survey responses from the database with optional filtering, one page at a time.
+    Filters are applied per page, so a page can hold fewer than `limit` responses.
     ---
     tags:
       - Survey Responses
     parameters:
+      - name: limit
+        in: query
+        description: Maximum number of items per page (default 100)
+        required: false
+        type: integer
+        example: 100
+      - name: cursor
+        in: query
+        description: Cursor of the page to fetch, taken from next_cursor of the previous page
+        required: false
+        type: string
       - name: search_term
         in: query
         description: Text to search for in all fields of survey responses and recommended cards (GET method)
@@ -260,30 +361,36 @@ def api_get_all_survey_responses():
         example: "8000"
     responses:
       200:
-        description: List of all survey responses
+        description: One page of survey responses; next_cursor is null on the last page
+      400:
+        description: Invalid limit or cursor
       500:
         description: Internal server error
     """
     try:
         # Get filter parameters using helper function
         filter_params = extract_filter_params()
+        try:
+            limit, offset = extract_pagination_params()
+        except ValueError as e:
+            return format_error(str(e), 400)
 
-        responses, error = get_all_survey_responses(filter_params)
+        responses, next_offset, error = get_survey_responses_page(filter_params, limit, offset)
 
         if error:
             return format_error(error, 500)
 
-        if not responses:
+        if not responses and next_offset is None and offset is None:
             return format_response("No survey responses found.", "message")
 
-        return format_response(responses, "survey_responses")
+        return format_page(responses, "survey_responses", next_offset)
 
     except Exception as e:
         logger.error(f"❌ Error retrieving survey responses: {str(e)}")
         return format_error(str(e), 500)
 
 
-@app.route('/api/v1/credit_cards/filter', methods=['GET', 'POST'])
+@api.route('/api/v1/credit_cards/filter', methods=['GET', 'POST'])
 def api_filter_credit_cards():
     """
     Filter credit cards based on parameters. If no parameters are provided, a default filter will be applied 
@@ -371,7 +478,7 @@ def api_filter_credit_cards():
         return format_error(str(e), 500)
 
 
-@app.route('/api/v1/survey_responses/<survey_id>', methods=['GET'])
+@api.route('/api/v1/survey_responses/<survey_id>', methods=['GET'])
 def api_get_survey_response_by_id(survey_id):
     """
     Get a specific survey response by ID.
@@ -426,48 +533,105 @@ def api_get_survey_response_by_id(survey_id):
         return format_error(str(e), 500)
 
 
-@app.route('/api/v1/merge_and_categorize', methods=['POST'])
+@api.route('/api/v1/merge_and_categorize', methods=['POST'])
 def api_merge_and_categorize():
     """
-    Merge and categorize credit card data from multiple sources.
+    Start a background merge and categorization of credit card data from multiple sources.
+    Only banks whose CSV changed since the previous merge are processed again.
+    If a merge is already queued or running, that job is returned instead.
     ---
     tags:
       - Data Processing
+    parameters:
+      - name: force
+        in: query
+        type: boolean
+        required: false
+        description: Reprocess every bank, ignoring the merge cache
     responses:
-      200:
-        description: Credit card data successfully merged and categorized
-      404:
-        description: No non-empty CSV files found
+      202:
+        description: Merge job accepted; poll /api/v1/jobs/{job_id} for the result
       500:
         description: Internal server error
     """
-    try:
-        success, message = merge_and_categorize()
+    force = request.args.get("force", "false").lower() in ("1", "true", "yes")
 
-        if not success:
-            status_code = 404 if "No non-empty CSV files found" in message else 500
-            return format_error(message, status_code)
+    def run_merge(progress):
+        return merge_and_categorize(progress_callback=progress, force=force)
 
-        return format_response(message, "message")
+    try:
+        job, _ = get_job_manager().submit("merge_and_categorize", run_merge)
+        return _job_accepted(job)
 
     except Exception as e:
         logger.error(f"❌ Error merging and categorizing data: {str(e)}")
         return format_error(str(e), 500)
 
 
+@api.route('/api/v1/jobs/<job_id>', methods=['GET'])
+def api_get_job(job_id):
+    """
+    Get the status, progress and result of a background job.
+    ---
+    tags:
+      - Jobs
+    parameters:
+      - name: job_id
+        in: path
+        type: string
+        required: true
+        description: ID returned when the job was submitted
+    responses:
+      200:
+        description: Job status; "result" holds the stats once the job has succeeded
+      404:
+        description: Job not found
+      500:
+        description: Internal server error
+    """
+    try:
+        job = get_job_manager().store.get(job_id)
+        if job is None:
+            return format_error(f"Job with ID '{job_id}' not found", 404)
+        return format_response(job, "job")
+    except Exception as e:
+        logger.error(f"❌ Error retrieving job '{job_id}': {str(e)}")
+        return format_error(str(e), 500)
+
+
+def _job_accepted(job):
+    """202 response for a submitted job, pointing to its status URL."""
+    response, status_code = format_response(job, "job", 202)
+    response.headers["Location"] = f"/api/v1/jobs/{job['id']}"
+    return response, status_code
+
+
+@api.route('/api/v1/status', methods=['GET'])
+def api_status():
+    """
+    Get the startup and readiness report of the server process.
+    ---
+    tags:
+      - Status
+    responses:
+      200:
+        description: Startup timings and whether the embedding model is loaded
+    """
+    return format_response(get_startup_report(), "status")
+
 
 # Error handlers
-@app.errorhandler(404)
+@api.app_errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
     return format_error("Resource not found", 404)
 
-@app.errorhandler(405)
+@api.app_errorhandler(405)
 def method_not_allowed(error):
     """Handle 405 errors."""
     return format_error("Method not allowed", 405)
 
-@app.errorhandler(500)
+@api.app_errorhandler(500)
 def internal_server_error(error):
     """Handle 500 errors."""
     logger.error(f"Internal server error: {str(error)}")
@@ -476,5 +640,7 @@ def internal_server_error(error):
 
 if __name__ == '__main__':
     logger.info("🚀 Starting Credit Card Selector API Server...")
-    logger.info("📚 API Documentation available at http://localhost:5000/")
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    logger.info(f"📚 API Documentation available at http://localhost:{SERVER_PORT}/")
+    app = create_app()
+    mark_ready("API server")
+    app.run(host=SERVER_HOST, port=SERVER_PORT, debug=SERVER_DEBUG)
@@ -0,0 +1,98 @@
+"""
+ASGI entry point for the Credit Card Selector API.
+
+POST /api/v1/process_survey is served natively by the async survey pipeline, so a
+request waiting on the embedding model, Qdrant or the LLM does not hold a worker
+thread for its whole duration. Every other route is delegated to the Flask app.
+
+Run with:
+    uvicorn Credit_Card_Selector.Server.asgi_app:app --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, Dict
+
+from asgiref.wsgi import WsgiToAsgi
+
+from Credit_Card_Selector.Server.Server import create_app
+from Credit_Card_Selector.Database.general_utils import get_logger, mark_ready
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.survey_api import process_survey_async
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.async_pipeline import recommendation_writer
+
+logger = get_logger(__file__)
+
+PROCESS_SURVEY_PATH = "/api/v1/process_survey"
+
+flask_asgi = WsgiToAsgi(create_app())
+
+
+async def _read_body(receive: Callable) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body", False):
+            return body
+
+
+async def _send_json(send: Callable, data: Dict[str, Any], status_code: int = 200) -> None:
+    body = json.dumps(data).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def api_process_survey(receive: Callable, send: Callable) -> None:
+    """Async version of the Flask process_survey route, with the same responses."""
+    try:
+        try:
+            data = json.loads(await _read_body(receive) or b"null")
+        except ValueError:
+            data = None
+        if not data:
+            logger.warning("❗ No JSON data received.")
+            await _send_json(send, {"error": "No JSON data received."}, 400)
+            return
+
+        recommended_cards, error = await process_survey_async(data)
+
+        if error:
+            logger.warning(f"Error: {error}")
+            await _send_json(send, {"error": error}, 400 if "No JSON data received" in error else 500)
+            return
+
+        await _send_json(send, {"recommended_cards": recommended_cards})
+
+    except Exception as e:
+        logger.error(f"❌ Error processing survey: {str(e)}")
+        await _send_json(send, {"error": str(e)}, 500)
+
+
+async def _lifespan(receive: Callable, send: Callable) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            mark_ready("ASGI server")
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            # Store the recommendations that are still queued
+            await asyncio.to_thread(recommendation_writer.flush)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+    """ASGI application: native async survey route, everything else via Flask."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+
+    if scope["type"] == "http" and scope["path"] == PROCESS_SURVEY_PATH and scope["method"] == "POST":
+        await api_process_survey(receive, send)
+        return
+
+    await flask_asgi(scope, receive, send)
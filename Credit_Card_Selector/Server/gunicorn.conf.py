@@ -0,0 +1,37 @@
+"""
+Gunicorn configuration for the Credit Card Selector API.
+
+Usage:
+    gunicorn -c Credit_Card_Selector/Server/gunicorn.conf.py "Credit_Card_Selector.Server.Server:create_app()"
+
+Or with the async survey route (uvicorn workers):
+    gunicorn -c Credit_Card_Selector/Server/gunicorn.conf.py -k uvicorn.workers.UvicornWorker \
+        Credit_Card_Selector.Server.asgi_app:app
+
+All settings come from the SERVER_* values in .env (see server_config.py).
+"""
+
+from Credit_Card_Selector.Database.general_utils import get_logger, mark_ready
+from Credit_Card_Selector.Server.server_config import (
+    SERVER_HOST, SERVER_PORT, SERVER_WORKERS, SERVER_THREADS, SERVER_PRELOAD, SERVER_TIMEOUT
+)
+
+logger = get_logger(__file__)
+
+bind = f"{SERVER_HOST}:{SERVER_PORT}"
+workers = SERVER_WORKERS
+threads = SERVER_THREADS
+# With preload_app the app (and, through create_app, the embedding model) is loaded once in the
+# master process; forked workers share that memory copy-on-write
+preload_app = SERVER_PRELOAD
+timeout = SERVER_TIMEOUT
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    logger.info(f"🚀 Gunicorn ready on {bind}: {workers} workers x {threads} threads (preload: {preload_app})")
+
+
+def post_worker_init(worker):
+    mark_ready(f"worker {worker.pid}")
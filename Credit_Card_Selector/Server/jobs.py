@@ -0,0 +1,241 @@
+"""
+Background Jobs
+
+Long-running operations (database refresh, merge and categorize) run in a local
+thread pool instead of inside the HTTP request. Every job is recorded in a SQLite
+table with its status, progress and final result, so any server process can report
+on it.
+
+At most one job of a kind is active at a time: submitting a job while another of the
+same kind is queued or running returns the existing job. Jobs whose owning process
+died are reported as failed.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from Credit_Card_Selector.Database.general_utils import get_logger, generate_unique_id
+from Credit_Card_Selector.Server.server_config import JOB_DB_PATH, JOB_WORKERS
+
+# Configure module logger
+logger = get_logger(__file__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+PROGRESS_WRITE_INTERVAL = 0.5  # Minimum seconds between two progress updates of a job
+
+# A job function receives a progress(current, total) callback and returns (success, message, result)
+JobFunction = Callable[[Callable[[int, int], None]], Tuple[bool, str, Optional[Dict[str, Any]]]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    owner_pid INTEGER,
+    progress_current INTEGER,
+    progress_total INTEGER,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_kind_status ON jobs (kind, status);
+"""
+
+
+def _is_process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """
+    Persistent job table in SQLite.
+
+    Args:
+        db_path: Path of the SQLite database file
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "progress": {"current": row["progress_current"], "total": row["progress_total"]},
+            "message": row["message"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"]
+        }
+
+    @staticmethod
+    def _fail_if_orphaned(conn: sqlite3.Connection, row: sqlite3.Row) -> bool:
+        """Mark an active job whose owner process is gone as failed; returns True if it was."""
+        if row["status"] not in ACTIVE_STATUSES or _is_process_alive(row["owner_pid"]):
+            return False
+        conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+            (STATUS_FAILED, "Job was interrupted: the server process that ran it stopped.", time.time(), row["id"])
+        )
+        return True
+
+    def create_or_get_active(self, kind: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Create a queued job, unless a job of the same kind is already active.
+
+        Args:
+            kind: Job kind, e.g. "refresh_credit_cards"
+
+        Returns:
+            Tuple of (job, created)
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE kind = ? AND status IN (?, ?) ORDER BY created_at",
+                    (kind, *ACTIVE_STATUSES)
+                ).fetchall()
+                for row in rows:
+                    if not self._fail_if_orphaned(conn, row):
+                        conn.execute("COMMIT")
+                        return self._to_dict(row), False
+
+                job_id = generate_unique_id()
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, status, owner_pid, progress_current, created_at) "
+                    "VALUES (?, ?, ?, ?, 0, ?)",
+                    (job_id, kind, STATUS_QUEUED, os.getpid(), time.time())
+                )
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                conn.execute("COMMIT")
+                return self._to_dict(row), True
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        """Update columns of a job."""
+        if not fields:
+            return
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with closing(self._connect()) as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job, or None if it does not exist."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            if self._fail_if_orphaned(conn, row):
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._to_dict(row)
+
+
+class JobManager:
+    """
+    Runs jobs in a thread pool and records their progress in a JobStore.
+
+    Args:
+        store: Job table
+        max_workers: Number of jobs that can run at the same time in this process
+    """
+
+    def __init__(self, store: JobStore, max_workers: int):
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job")
+
+    def submit(self, kind: str, func: JobFunction) -> Tuple[Dict[str, Any], bool]:
+        """
+        Start a job in the background, or return the active job of the same kind.
+
+        Args:
+            kind: Job kind used for de-duplication
+            func: Function doing the work (see JobFunction)
+
+        Returns:
+            Tuple of (job, created)
+        """
+        job, created = self.store.create_or_get_active(kind)
+        if created:
+            self._executor.submit(self._run, job["id"], kind, func)
+            logger.info(f"📋 Job {job['id']} ({kind}) queued")
+        else:
+            logger.info(f"📋 Job {job['id']} ({kind}) is already {job['status']}, not starting another one")
+        return job, created
+
+    def _run(self, job_id: str, kind: str, func: JobFunction) -> None:
+        self.store.update(job_id, status=STATUS_RUNNING, started_at=time.time())
+        last_write = [0.0]
+
+        def progress(current: int, total: int) -> None:
+            now = time.monotonic()
+            if current >= total or now - last_write[0] >= PROGRESS_WRITE_INTERVAL:
+                last_write[0] = now
+                self.store.update(job_id, progress_current=current, progress_total=total)
+
+        try:
+            success, message, result = func(progress)
+            self.store.update(
+                job_id,
+                status=STATUS_SUCCEEDED if success else STATUS_FAILED,
+                message=message,
+                result=json.dumps(result, default=str) if result is not None else None,
+                error=None if success else message,
+                finished_at=time.time()
+            )
+            logger.info(f"📋 Job {job_id} ({kind}) {'succeeded' if success else 'failed'}: {message}")
+        except Exception as e:
+            logger.error(f"❌ Job {job_id} ({kind}) failed: {str(e)}")
+            self.store.update(job_id, status=STATUS_FAILED, error=str(e), finished_at=time.time())
+
+
+_job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Return the job manager of this process, creating it on first use."""
+    global _job_manager
+    if _job_manager is None:
+        with _job_manager_lock:
+            if _job_manager is None:
+                _job_manager = JobManager(JobStore(JOB_DB_PATH), JOB_WORKERS)
+    return _job_manager
@@ -0,0 +1,21 @@
+# === Server configuratie ===
+import multiprocessing
+from pathlib import Path
+
+from Credit_Card_Selector.Database.general_utils import load_env, load_env_value, str_to_bool
+
+load_env()
+SERVER_HOST = load_env_value("SERVER_HOST", default="0.0.0.0")
+SERVER_PORT = load_env_value("SERVER_PORT", default=5000, cast=int)
+SERVER_DEBUG = load_env_value("SERVER_DEBUG", default=True, cast=str_to_bool)  # Only used by the development server
+SERVER_WORKERS = load_env_value("SERVER_WORKERS", default=multiprocessing.cpu_count(), cast=int)  # Worker processes
+SERVER_THREADS = load_env_value("SERVER_THREADS", default=4, cast=int)  # Threads per worker
+SERVER_PRELOAD = load_env_value("SERVER_PRELOAD", default=False, cast=str_to_bool)  # Load app + model before forking
+SERVER_TIMEOUT = load_env_value("SERVER_TIMEOUT", default=300, cast=int)  # Seconds before a silent worker is restarted
+JOB_DB_PATH = load_env_value(  # SQLite database with the background job table
+    "JOB_DB_PATH",
+    default=str(Path(__file__).resolve().parents[1] / "Cache" / "jobs.sqlite3")
+)
+JOB_WORKERS = load_env_value("JOB_WORKERS", default=2, cast=int)  # Threads running background jobs per process
+PAGE_SIZE = load_env_value("PAGE_SIZE", default=100, cast=int)  # Default page size of list endpoints
+MAX_PAGE_SIZE = load_env_value("MAX_PAGE_SIZE", default=1000, cast=int)  # Largest accepted `limit`
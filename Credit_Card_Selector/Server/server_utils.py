@@ -1,6 +1,10 @@
+import base64
+import binascii
+import json
 from flask import jsonify
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from Credit_Card_Selector.Database.general_utils import get_logger
+from Credit_Card_Selector.Server.server_config import PAGE_SIZE, MAX_PAGE_SIZE
 
 # Configure module logger
 logger = get_logger(__file__)
@@ -62,6 +66,79 @@ def extract_filter_params(allowed_params: List[str] = None) -> Dict[str, Any]:
 
     return filter_params
 
+def encode_cursor(offset: Any) -> Optional[str]:
+    """
+    Encode a Qdrant scroll offset as an opaque, URL-safe cursor.
+
+    Args:
+        offset: Point id of the next page, or None on the last page
+
+    Returns:
+        Cursor string, or None if there is no next page
+    """
+    if offset is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(offset).encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Any:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous response
+
+    Returns:
+        The Qdrant scroll offset
+
+    Raises:
+        ValueError: If the cursor is not valid
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, binascii.Error):
+        raise ValueError("Invalid cursor.")
+    if isinstance(offset, bool) or not isinstance(offset, (int, str)):
+        raise ValueError("Invalid cursor.")
+    return offset
+
+def extract_pagination_params() -> Tuple[int, Any]:
+    """
+    Extract the `limit` and `cursor` query parameters of a list request.
+
+    Returns:
+        Tuple of (limit, offset); offset is None for the first page
+
+    Raises:
+        ValueError: If limit or cursor is not valid
+    """
+    from flask import request
+
+    limit = request.args.get("limit", PAGE_SIZE)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        limit = 0
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be an integer between 1 and {MAX_PAGE_SIZE}.")
+
+    cursor = request.args.get("cursor")
+    return limit, decode_cursor(cursor) if cursor else None
+
+def format_page(items: List[Any], message_key: str, next_offset: Any) -> tuple:
+    """
+    Format one page of a list endpoint
+
+    Args:
+        items: Items on the page
+        message_key: Key to use for the items in the response
+        next_offset: Scroll offset of the next page, None on the last page
+
+    Returns:
+        Tuple of (response_json, status_code)
+    """
+    return jsonify({message_key: items, "next_cursor": encode_cursor(next_offset)}), 200
+
 def format_response(data: Any, message_key: str = "message", status_code: int = 200) -> tuple:
     """
     Format response with consistent structure
@@ -88,4 +165,17 @@ def format_error(error_message: str, status_code: int = 400) -> tuple:
         Tuple of (response_json, status_code)
     """
     logger.warning(f"Error: {error_message}")
-    return jsonify({"error": error_message}), status_code
\ No newline at end of file
+    return jsonify({"error": error_message}), status_code
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Format one Server-Sent Events message
+
+    Args:
+        event: Event name
+        data: JSON-serializable event data
+
+    Returns:
+        The encoded event, terminated by a blank line
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -1,132 +1,314 @@
 import os
 import glob
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 
+from Data_Handler.PreProcessor.merge_schema import CANONICAL_SCHEMA, BANK_COLUMN_MAPPINGS
+
+MAX_LOAD_WORKERS = 8  # Aantal CSV-bestanden dat tegelijk ingelezen wordt
+WRITE_PARQUET = True  # Schrijf naast elke CSV ook een getypeerd Parquet-bestand
+
+_BOOLEAN_VALUES = {
+    "true": True, "1": True, "1.0": True, "yes": True,
+    "false": False, "0": False, "0.0": False, "no": False
+}
+
 
 def find_csv_files(scrapers_folder):
     """Zoekt naar alle credit_cards.csv-bestanden in de Scrapers-map."""
     return glob.glob(os.path.join(scrapers_folder, '**', 'credit_cards.csv'), recursive=True)
 
 
+def _bank_name(csv_file):
+    """Naam van de bank: de map waarin de scraper zijn credit_cards.csv schrijft."""
+    return os.path.basename(os.path.dirname(os.path.abspath(csv_file)))
+
+
+def _coerce_column(series, dtype):
+    """
+    Zet een kolom om naar het canonieke dtype, maar alleen als daarbij geen waarden verloren gaan.
+
+    Returns:
+        tuple: (kolom, True als de omzetting gelukt is)
+    """
+    if dtype == "boolean":
+        converted = series.astype(str).str.strip().str.lower().map(_BOOLEAN_VALUES).astype("boolean")
+    elif dtype in ("Float64", "Int64"):
+        converted = pd.to_numeric(series, errors="coerce")
+        if dtype == "Int64" and not (converted.dropna() % 1 == 0).all():
+            return series, False
+        converted = converted.astype(dtype)
+    else:
+        # Tekst en categorieën worden al als string ingelezen
+        return series.astype("string"), True
+
+    if (converted.isna() & series.notna()).any():
+        return series, False
+    return converted, True
+
+
+def load_dataframe(csv_file):
+    """
+    Laadt het CSV-bestand van één bank met de canonieke kolomnamen en dtypes.
+
+    The column mapping of the bank is applied while reading: text and category columns
+    are read as strings straight away, numeric and boolean columns are converted when
+    that is lossless and kept as read otherwise.
+    """
+    mapping = BANK_COLUMN_MAPPINGS.get(_bank_name(csv_file), {})
+    source_names = {canonical: source for source, canonical in mapping.items()}
+    text_dtypes = {
+        source_names.get(column, column): "string"
+        for column, dtype in CANONICAL_SCHEMA.items() if dtype in ("string", "category")
+    }
+
+    df = pd.read_csv(csv_file, dtype=text_dtypes).rename(columns=mapping)
+    for column, dtype in CANONICAL_SCHEMA.items():
+        if column in df.columns:
+            df[column], coerced = _coerce_column(df[column], dtype)
+            if not coerced:
+                print(f"⚠️ {_bank_name(csv_file)}: column '{column}' kept as read, it does not fit {dtype}")
+    return df
+
+
 def load_dataframes(csv_files):
-    """Laadt CSV-bestanden in een lijst van DataFrames en filtert lege DataFrames eruit."""
-    dataframes = [pd.read_csv(file) for file in csv_files]
+    """Laadt CSV-bestanden parallel in een lijst van DataFrames en filtert lege DataFrames eruit."""
+    if not csv_files:
+        return []
+    with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(csv_files))) as executor:
+        dataframes = list(executor.map(load_dataframe, csv_files))
     return [df for df in dataframes if not df.empty]
 
 
+def _compact_dtypes(df):
+    """
+    Kiest compacte dtypes voor de kolommen buiten het canonieke schema.
+
+    Numeric columns that only hold small whole numbers (the 0/1 benefit flags) become
+    Int8, booleans become nullable booleans and text columns become categoricals.
+
+    Returns:
+        dict: Kolomnaam -> dtype, voor de kolommen die omgezet kunnen worden
+    """
+    dtypes = {column: "boolean" for column in df.select_dtypes(include="bool").columns}
+
+    numeric = df.select_dtypes(include="number")
+    if not numeric.empty:
+        values = numeric.to_numpy(dtype="float64", na_value=np.nan)
+        known = np.where(np.isnan(values), 0, values)
+        fits_int8 = ((known % 1 == 0) & (known >= -128) & (known <= 127)).all(axis=0)
+        dtypes.update({column: "Int8" for column, fits in zip(numeric.columns, fits_int8) if fits})
+
+    for column in df.select_dtypes(include=["object", "string"]).columns:
+        if df[column].dropna().map(type).eq(str).all():
+            dtypes[column] = "category"
+    return dtypes
+
+
 def merge_dataframes(dataframes):
-    """Voegt een lijst van niet-lege DataFrames samen tot één DataFrame."""
-    return pd.concat(dataframes, ignore_index=True) if dataframes else pd.DataFrame()
+    """
+    Voegt een lijst van niet-lege DataFrames samen tot één DataFrame.
+
+    The canonical columns come first, with their declared dtypes (category columns become
+    categoricals once all banks are combined); the other columns follow in the order in
+    which they were found and get the most compact dtype that keeps their values.
+    """
+    if not dataframes:
+        return pd.DataFrame()
+
+    merged = pd.concat(dataframes, ignore_index=True, sort=False)
+    extra_columns = [column for column in merged.columns if column not in CANONICAL_SCHEMA]
+    merged = merged.reindex(columns=[*CANONICAL_SCHEMA, *extra_columns])
+
+    dtypes = _compact_dtypes(merged[extra_columns])
+    for column, dtype in CANONICAL_SCHEMA.items():
+        if dtype == "category":
+            merged[column] = merged[column].astype("string")
+            dtypes[column] = "category"
+        elif merged[column].dtype == object:
+            # Mix of banks whose column could and could not be converted: keep the values
+            merged[column], _ = _coerce_column(merged[column], dtype)
+        else:
+            dtypes[column] = dtype
+    return merged.astype(dtypes)
 
 
 def save_dataframe(df, output_file):
-    """Slaat een DataFrame op als een CSV-bestand."""
+    """
+    Slaat een DataFrame op als een CSV-bestand, en met WRITE_PARQUET ook als Parquet-bestand ernaast.
+
+    The Parquet file keeps the dtypes of the frame (booleans, nullable numbers,
+    categoricals), so the database loader does not have to parse and infer them again.
+    It is written after the CSV; a failure only skips the Parquet file and removes a
+    partial or outdated one, so the loader falls back to the CSV.
+    """
     df.to_csv(output_file, index=False)
     print(f"✅ Data saved to {output_file}")
 
+    if WRITE_PARQUET:
+        parquet_file = os.path.splitext(output_file)[0] + ".parquet"
+        try:
+            df.to_parquet(parquet_file, engine="pyarrow", index=False)
+            print(f"✅ Data saved to {parquet_file}")
+        except ImportError:
+            print("⚠️ pyarrow is not installed, Parquet output skipped.")
+            _remove_file(parquet_file)
+        except Exception as e:
+            print(f"⚠️ Could not save {parquet_file}: {e}")
+            _remove_file(parquet_file)
 
-def categorize_columns(df):
-    """Categoriseert kolommen en voegt categorieën toe aan het DataFrame."""
-    category_mapping = {
-        'Dining Benefits': [
-            'Uncategorized - 6% Cashback: On dining includi',
-            'Uncategorized - 7% Cashback: On dining and onl',
-            'Uncategorized - 7% cashback on dining includin',
-            'Uncategorized - Dine with up to 20% off at ove',
-            'Cashback Dining'
-        ],
-        'Travel Benefits': [
-            'Uncategorized - 10% cashback on airline ticket',
-            'Uncategorized - 7% Cashback: On airlines ticke',
-            'Uncategorized - 7% cashback on airline tickets',
-            'Uncategorized - Complimentary airport lounge a',
-            'Uncategorized - Airport Lounges: Complimentary',
-            'Free Airport Transfers',
-            'Lounge Access'
-        ],
-        'Shopping Benefits': [
-            'Uncategorized - 10% cashback on hotel stays in',
-            'Uncategorized - Cashback on hotel stays:',
-            'Uncategorized - Cashback on airline tickets:',
-            'Discount Fashion',
-            'Discount Shopping',
-            'Discount Flights',
-            'Discount Hotels'
-        ],
-        'Financial Benefits': [
-            'Uncategorized - Balance transfer\nTransfer your',
-            'Uncategorized - Credit shield\nEnjoy compliment',
-            'Uncategorized - 500 AED welcome bonus: as tala',
-            'Uncategorized - 35% back on talabat orders: ap',
-            'Uncategorized - Redeem talabat credit for tala',
-            'Uncategorized - Mobile and digital wallets\nBen',
-            'Uncategorized - School fee payments\nConvert sc',
-            'Uncategorized - FlexiPay\nRepay balances in mon',
-            'Uncategorized - Credit card loan\nBenefit from ',
-            'Uncategorized - 6% Cashback: On dining includi',
-            'Uncategorized - AED 365: As a welcome bonus',
-            'Uncategorized - No Annual Fee: For the first y',
-            'Uncategorized - 3% Cashback: On utilities, tel',
-            'Uncategorized - 1% Cashback: On all other reta',
-            'Uncategorized - 6% cashback on dining includin',
-            'Uncategorized - 10% cashback on hotel stays in',
-            'Uncategorized - Cashback on movie tickets purc',
-            'Uncategorized - 10% cashback on airline ticket',
-            'Uncategorized - Cashback on hotel stays:',
-            'Uncategorized - Cashback on airline tickets:',
-            'Uncategorized - 50% cashback on movies tickets',
-            'Uncategorized - Foreign currency fees:',
-            'Uncategorized - 5,000 monthly bonus: Etihad Gu',
-            'Uncategorized - 60,000 Etihad Guest Miles: as ',
-            'Uncategorized - Up to 4 class upgrade: voucher',
-            'Uncategorized - 1 Etihad Tier Mile: per 1 USD',
-            'Uncategorized - Up to 3 Etihad Guest Miles: pe',
-            'Uncategorized - Up to 2 Class Upgrade Vouchers',
-            'Uncategorized - 2,000 Etihad Guest Miles: as m',
-            'Uncategorized - 1 Etihad Tier Mile: per USD 1',
-            'Uncategorized - Up to 2 Etihad Guest Miles: pe',
-            'Uncategorized - 35,000 Etihad Guest Miles: as ',
-            'Uncategorized - Up to 1.25 Etihad Guest Miles:',
-            'Uncategorized - Airport Lounges: Complimentary',
-            'Uncategorized - 300,000 TouchPoints: As a welc',
-            'Uncategorized - Free for life: No annual fees,',
-            'Uncategorized - Buy 1 Get 1 Free movie ticket:',
-            'Uncategorized - Zero-interest payment plan: on',
-            'Uncategorized - Credit Card Loan\nBenefit from ',
-            'Uncategorized - Complimentary airport lounge a',
-            'Uncategorized - No annual fees:',
-            'Uncategorized - 0% Interest Payment Plan: On s',
-            'Uncategorized - Earn up to 3 Reward points fro',
-            'Uncategorized - Earn 3 Reward points from ALL ',
-            'Uncategorized - 7% Cashback: On hotel bookings',
-            'Uncategorized - 7% Cashback: On dining and onl',
-            'Uncategorized - 7% Cashback: On airlines ticke',
-            'Uncategorized - 7% cashback on jewellery purc',
-            'Uncategorized - 7% cashback on dining includin',
-            'Uncategorized - 7% cashback on fuel',
-            'Uncategorized - 7% cashback on spas and salons',
-            'Uncategorized - 7% cashback on hotel spends',
-            'Uncategorized - 7% cashback on jewellery purch',
-            'Uncategorized - 7% Cashback: On fuel',
-            'Uncategorized - 7% Cashback: On spas and salon',
-            'Uncategorized - 1% Cashback: On all other dome',
-            'Uncategorized - 7% Cashback: On health clubs a',
-            'Uncategorized - PayOrder Facility\nReceive cash',
-            'Uncategorized - PayOrder facility\nBenefit from',
-            'Uncategorized - FlexiPay\nPay balances in month',
-            'Uncategorized - 1 Tier Mile: per 1 USD',
-            'Uncategorized - 2,000 monthly bonus: Etihad Gu',
-            'Uncategorized - 35,000 Etihad Guest Miles: wel',
-            'Uncategorized - Up to 2 class upgrade: voucher',
-            'Uncategorized - Free for life: no annual fee, ',
-            'Uncategorized - Unlimited free delivery: on ta'
-        ]
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+CATEGORY_MAPPING = {
+    'Dining Benefits': [
+        'Uncategorized - 6% Cashback: On dining includi',
+        'Uncategorized - 7% Cashback: On dining and onl',
+        'Uncategorized - 7% cashback on dining includin',
+        'Uncategorized - Dine with up to 20% off at ove',
+        'Cashback Dining'
+    ],
+    'Travel Benefits': [
+        'Uncategorized - 10% cashback on airline ticket',
+        'Uncategorized - 7% Cashback: On airlines ticke',
+        'Uncategorized - 7% cashback on airline tickets',
+        'Uncategorized - Complimentary airport lounge a',
+        'Uncategorized - Airport Lounges: Complimentary',
+        'Free Airport Transfers',
+        'Lounge Access'
+    ],
+    'Shopping Benefits': [
+        'Uncategorized - 10% cashback on hotel stays in',
+        'Uncategorized - Cashback on hotel stays:',
+        'Uncategorized - Cashback on airline tickets:',
+        'Discount Fashion',
+        'Discount Shopping',
+        'Discount Flights',
+        'Discount Hotels'
+    ],
+    'Financial Benefits': [
+        'Uncategorized - Balance transfer\nTransfer your',
+        'Uncategorized - Credit shield\nEnjoy compliment',
+        'Uncategorized - 500 AED welcome bonus: as tala',
+        'Uncategorized - 35% back on talabat orders: ap',
+        'Uncategorized - Redeem talabat credit for tala',
+        'Uncategorized - Mobile and digital wallets\nBen',
+        'Uncategorized - School fee payments\nConvert sc',
+        'Uncategorized - FlexiPay\nRepay balances in mon',
+        'Uncategorized - Credit card loan\nBenefit from ',
+        'Uncategorized - 6% Cashback: On dining includi',
+        'Uncategorized - AED 365: As a welcome bonus',
+        'Uncategorized - No Annual Fee: For the first y',
+        'Uncategorized - 3% Cashback: On utilities, tel',
+        'Uncategorized - 1% Cashback: On all other reta',
+        'Uncategorized - 6% cashback on dining includin',
+        'Uncategorized - 10% cashback on hotel stays in',
+        'Uncategorized - Cashback on movie tickets purc',
+        'Uncategorized - 10% cashback on airline ticket',
+        'Uncategorized - Cashback on hotel stays:',
+        'Uncategorized - Cashback on airline tickets:',
+        'Uncategorized - 50% cashback on movies tickets',
+        'Uncategorized - Foreign currency fees:',
+        'Uncategorized - 5,000 monthly bonus: Etihad Gu',
+        'Uncategorized - 60,000 Etihad Guest Miles: as ',
+        'Uncategorized - Up to 4 class upgrade: voucher',
+        'Uncategorized - 1 Etihad Tier Mile: per 1 USD',
+        'Uncategorized - Up to 3 Etihad Guest Miles: pe',
+        'Uncategorized - Up to 2 Class Upgrade Vouchers',
+        'Uncategorized - 2,000 Etihad Guest Miles: as m',
+        'Uncategorized - 1 Etihad Tier Mile: per USD 1',
+        'Uncategorized - Up to 2 Etihad Guest Miles: pe',
+        'Uncategorized - 35,000 Etihad Guest Miles: as ',
+        'Uncategorized - Up to 1.25 Etihad Guest Miles:',
+        'Uncategorized - Airport Lounges: Complimentary',
+        'Uncategorized - 300,000 TouchPoints: As a welc',
+        'Uncategorized - Free for life: No annual fees,',
+        'Uncategorized - Buy 1 Get 1 Free movie ticket:',
+        'Uncategorized - Zero-interest payment plan: on',
+        'Uncategorized - Credit Card Loan\nBenefit from ',
+        'Uncategorized - Complimentary airport lounge a',
+        'Uncategorized - No annual fees:',
+        'Uncategorized - 0% Interest Payment Plan: On s',
+        'Uncategorized - Earn up to 3 Reward points fro',
+        'Uncategorized - Earn 3 Reward points from ALL ',
+        'Uncategorized - 7% Cashback: On hotel bookings',
+        'Uncategorized - 7% Cashback: On dining and onl',
+        'Uncategorized - 7% Cashback: On airlines ticke',
+        'Uncategorized - 7% cashback on jewellery purc',
+        'Uncategorized - 7% cashback on dining includin',
+        'Uncategorized - 7% cashback on fuel',
+        'Uncategorized - 7% cashback on spas and salons',
+        'Uncategorized - 7% cashback on hotel spends',
+        'Uncategorized - 7% cashback on jewellery purch',
+        'Uncategorized - 7% Cashback: On fuel',
+        'Uncategorized - 7% Cashback: On spas and salon',
+        'Uncategorized - 1% Cashback: On all other dome',
+        'Uncategorized - 7% Cashback: On health clubs a',
+        'Uncategorized - PayOrder Facility\nReceive cash',
+        'Uncategorized - PayOrder facility\nBenefit from',
+        'Uncategorized - FlexiPay\nPay balances in month',
+        'Uncategorized - 1 Tier Mile: per 1 USD',
+        'Uncategorized - 2,000 monthly bonus: Etihad Gu',
+        'Uncategorized - 35,000 Etihad Guest Miles: wel',
+        'Uncategorized - Up to 2 class upgrade: voucher',
+        'Uncategorized - Free for life: no annual fee, ',
+        'Uncategorized - Unlimited free delivery: on ta'
+    ]
+}
+
+
+# Cellen worden gematcht zoals ze vroeger in str(row.values) verschenen: daar staan regeleinden,
+# tabs en backslashes ge-escaped, dus keywords met een echte "\n" matchen nooit.
+_REPR_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+@lru_cache(maxsize=None)
+def _category_patterns():
+    """Compileert per categorie alle keywords tot één regex."""
+    return {
+        category: re.compile("|".join(re.escape(keyword) for keyword in keywords))
+        for category, keywords in CATEGORY_MAPPING.items()
     }
 
-    for category, keywords in category_mapping.items():
-        df[category] = df.apply(lambda row: any(keyword in str(row.values) for keyword in keywords), axis=1)
 
-    return df
+def categorize_columns(df):
+    """
+    Categoriseert kolommen en voegt categorieën toe aan het DataFrame.
+
+    Een rij hoort bij een categorie als een van haar tekstcellen een keyword van die
+    categorie bevat. Per categorie wordt één gecompileerde regex kolomsgewijs toegepast
+    op alleen de tekstkolommen; numerieke cellen kunnen geen keyword bevatten.
+
+    Returns:
+        DataFrame: Het DataFrame met een booleaanse kolom per categorie
+    """
+    texts = []
+    for column in df.select_dtypes(include=["object", "string", "category"]).columns:
+        try:
+            texts.append(df[column].str.translate(_REPR_ESCAPES))
+        except AttributeError:
+            # Object column without any string values
+            continue
+
+    categories = {}
+    for category, pattern in _category_patterns().items():
+        matches = pd.Series(False, index=df.index)
+        for text in texts:
+            matches |= text.str.contains(pattern, na=False).astype(bool)
+        categories[category] = matches
+
+    # Alle categoriekolommen in één keer toevoegen: kolommen met extension dtypes vormen elk een
+    # eigen blok, dus per kolom invoegen fragmenteert brede frames
+    return pd.concat([df.drop(columns=list(categories), errors="ignore"), pd.DataFrame(categories)], axis=1)
 
 
 def main():
@@ -0,0 +1,101 @@
+"""
+Categorize Benchmark
+
+Compares the row-wise categorize_columns that PreProcessing used before with the
+vectorized version on synthetic catalogues shaped like merged_credit_cards.csv
+(a few text columns, a few hundred numeric benefit columns), and checks that both
+produce exactly the same category columns.
+
+The legacy version stringifies every row once per category, so for large
+catalogues it is timed on the first LEGACY_SAMPLE_ROWS rows and extrapolated
+linearly; the comparison is done on the same rows.
+
+Usage:
+    python -m Data_Handler.PreProcessor.categorize_benchmark [sizes...]
+"""
+
+import random
+import sys
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from Data_Handler.PreProcessor.PreProcessing import CATEGORY_MAPPING, categorize_columns
+
+# The merged catalogue has about 90 cards, so 10_000 is more than 100x its size
+DEFAULT_SIZES = [100, 10_000]
+LEGACY_SAMPLE_ROWS = 500
+TEXT_COLUMNS = ["Card_Link", "Card_Image", "Card_ID", "Eligibility_Requirements", "Annual_Fee"]
+NUMERIC_COLUMNS = 390
+
+FILLER_WORDS = ["card", "bonus", "AED", "points", "monthly", "salary", "fee", "free", "miles", "offer"]
+KEYWORDS = sorted({keyword for keywords in CATEGORY_MAPPING.values() for keyword in keywords})
+
+
+def legacy_categorize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Row-wise categorize_columns as it was used by PreProcessing, kept as reference."""
+    for category, keywords in CATEGORY_MAPPING.items():
+        df[category] = df.apply(lambda row: any(keyword in str(row.values) for keyword in keywords), axis=1)
+    return df
+
+
+def generate_catalogue(count: int, seed: int = 42) -> pd.DataFrame:
+    """Generate a synthetic catalogue; some text cells contain keywords, newlines or backslashes."""
+    rng = random.Random(seed)
+
+    def text() -> object:
+        roll = rng.random()
+        if roll < 0.2:
+            return np.nan
+        words = rng.choices(FILLER_WORDS, k=rng.randint(2, 8))
+        if roll < 0.35:
+            words.insert(rng.randint(0, len(words)), rng.choice(KEYWORDS))
+        separator = "\n" if roll > 0.9 else "\\" if roll > 0.85 else " "
+        return separator.join(words)
+
+    data = {column: [text() for _ in range(count)] for column in TEXT_COLUMNS}
+    numpy_rng = np.random.default_rng(seed)
+    for i in range(NUMERIC_COLUMNS):
+        values = numpy_rng.uniform(0, 10, count)
+        values[numpy_rng.random(count) < 0.9] = np.nan
+        data[f"Benefit {i}"] = values
+    return pd.DataFrame(data)
+
+
+def run_benchmark(sizes: List[int]) -> bool:
+    """
+    Run the benchmark for every catalogue size.
+
+    Returns:
+        True if the vectorized version produced the same category columns as the legacy one
+    """
+    all_equal = True
+    categories = list(CATEGORY_MAPPING)
+    print(f"{'cards':>8} {'legacy':>10} {'vectorized':>11} {'speedup':>8} {'matches':>8}  equal")
+    for size in sizes:
+        df = generate_catalogue(size)
+        sample_size = min(size, LEGACY_SAMPLE_ROWS)
+
+        start = time.perf_counter()
+        legacy = legacy_categorize_columns(df.head(sample_size).copy())
+        legacy_time = (time.perf_counter() - start) * size / sample_size
+
+        start = time.perf_counter()
+        vectorized = categorize_columns(df.copy())
+        vectorized_time = time.perf_counter() - start
+
+        equal = vectorized[categories].head(sample_size).equals(legacy[categories])
+        all_equal = all_equal and equal
+        speedup = legacy_time / vectorized_time if vectorized_time else float("inf")
+        estimated = "~" if sample_size < size else " "
+
+        print(f"{size:>8} {estimated}{legacy_time * 1000:>8.0f}ms {vectorized_time * 1000:>9.1f}ms "
+              f"{speedup:>7.0f}x {int(vectorized[categories].to_numpy().sum()):>8}  {'yes' if equal else 'NO'}")
+    return all_equal
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    sys.exit(0 if run_benchmark(sizes) else 1)
@@ -1,22 +1,40 @@
 import os
-from typing import Dict, Any, Tuple, Optional
+from typing import Callable, Dict, Any, Tuple, Optional
 from Credit_Card_Selector.Database.general_utils import get_logger
 from Data_Handler.PreProcessor.PreProcessing import (
-    find_csv_files, merge_dataframes, load_dataframes, categorize_columns, save_dataframe
+    find_csv_files, merge_dataframes, save_dataframe, CATEGORY_MAPPING
 )
+from Data_Handler.PreProcessor.merge_cache import MergeCache
 
 # Configure module logger
 logger = get_logger(__file__)
 
-def merge_and_categorize() -> Tuple[bool, str]:
+MERGE_STEPS = 4  # load changed banks, merge + save, categorize, save
+
+# Manifest and per-bank categorized frames of the previous merge
+MERGE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'merge_cache')
+
+
+def merge_and_categorize(progress_callback: Optional[Callable[[int, int], None]] = None,
+                         force: bool = False) -> Tuple[bool, str, Dict[str, Any]]:
     """
     Merge and categorize credit card data from multiple sources.
-    
+
+    Only the banks whose CSV changed since the previous merge (see MergeCache) are read
+    and categorized again; when no CSV changed and the outputs exist, nothing is done.
+
+    Args:
+        progress_callback: Called as progress_callback(completed_steps, MERGE_STEPS) after every step
+        force: Read and categorize every bank again, ignoring the cache
+
     Returns:
         Tuple containing:
         - Boolean indicating success or failure
         - Message describing the result
+        - Dictionary with the number of banks, the banks that were reprocessed and
+          whether the merge was skipped because nothing changed
     """
+    stats = {"banks": 0, "changed_banks": [], "skipped": False}
     try:
         # Get the directory of the current script
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -28,20 +46,47 @@ def merge_and_categorize() -> Tuple[bool, str]:
         merged_output_file = os.path.join(current_dir, 'merged_credit_cards.csv')
         categorized_output_file = os.path.join(current_dir, 'categorized_credit_cards.csv')
 
-        csv_files = find_csv_files(scrapers_folder)
-        dataframes = load_dataframes(csv_files)
+        def report(step: int) -> None:
+            if progress_callback:
+                progress_callback(step, MERGE_STEPS)
+
+        cache = MergeCache(MERGE_CACHE_DIR)
+        sources, changed = cache.scan(find_csv_files(scrapers_folder), scrapers_folder)
+        if force:
+            changed = list(sources)
+        stats["banks"] = len(sources)
+        stats["changed_banks"] = changed
+
+        if not force and cache.is_up_to_date(sources, changed, [merged_output_file, categorized_output_file]):
+            stats["skipped"] = True
+            report(MERGE_STEPS)
+            logger.info("Bank CSV files unchanged since the previous merge, nothing to do")
+            return True, "Credit card data is already up to date.", stats
+
+        logger.info(f"Merging {len(sources)} bank CSV files, {len(changed)} changed: {', '.join(changed) or '-'}")
+        dataframes = [df for df in cache.load_frames(sources, changed) if not df.empty]
 
         if not dataframes:
-            return False, "No non-empty CSV files found."
+            cache.save(sources, outputs_written=False)
+            return False, "No non-empty CSV files found.", stats
+        report(1)
 
-        merged_df = merge_dataframes(dataframes)
+        # The cached frames are already categorized; the category columns are split off
+        # so the merged output keeps its original layout
+        categories = list(CATEGORY_MAPPING)
+        combined_df = merge_dataframes(dataframes)
+        merged_df = combined_df.drop(columns=categories)
         save_dataframe(merged_df, merged_output_file)
+        report(2)
 
-        categorized_df = categorize_columns(merged_df)
+        categorized_df = merged_df.assign(**{category: combined_df[category].astype(bool) for category in categories})
+        report(3)
         save_dataframe(categorized_df, categorized_output_file)
+        cache.save(sources, outputs_written=True)
+        report(4)
 
-        return True, "Credit card data successfully merged and categorized."
+        return True, "Credit card data successfully merged and categorized.", stats
     except Exception as e:
         error_msg = f"Error merging and categorizing data: {str(e)}"
         logger.error(f"❌ {error_msg}")
-        return False, error_msg
\ No newline at end of file
+        return False, error_msg, stats
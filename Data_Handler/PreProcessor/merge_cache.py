@@ -0,0 +1,172 @@
+"""
+Incrementele merge van de bank-CSV's.
+
+A manifest records the mtime, size and SHA-256 of every source credit_cards.csv,
+next to a cached, already categorized frame per bank. On the next merge only the
+banks whose CSV changed are read and categorized again; the other frames come from
+the cache. When no source changed and the outputs are still there, the merge is
+skipped altogether.
+
+The cache is invalidated as a whole when the canonical schema, the bank column
+mappings or the category keywords change.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from Data_Handler.PreProcessor.PreProcessing import (
+    load_dataframe, categorize_columns, CATEGORY_MAPPING, MAX_LOAD_WORKERS
+)
+from Data_Handler.PreProcessor.merge_schema import CANONICAL_SCHEMA, BANK_COLUMN_MAPPINGS
+
+MANIFEST_FILE = "manifest.json"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    """SHA-256 van de inhoud van een bestand, in blokken gelezen."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def schema_fingerprint():
+    """Hash van alles wat bepaalt hoe een bank-CSV verwerkt wordt."""
+    text = json.dumps([CANONICAL_SCHEMA, BANK_COLUMN_MAPPINGS, CATEGORY_MAPPING], sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_categorized_dataframe(csv_file):
+    """Laadt het CSV-bestand van één bank en voegt de categoriekolommen toe."""
+    return categorize_columns(load_dataframe(csv_file))
+
+
+class MergeCache:
+    """
+    Manifest en per-bank tussenresultaten van de merge.
+
+    Args:
+        cache_dir: Map waarin het manifest en de frames bewaard worden
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            manifest = {}
+        if manifest.get("schema") != schema_fingerprint():
+            # Nieuw, onleesbaar of met een ander schema gemaakt: alle banken opnieuw verwerken
+            return {"schema": schema_fingerprint(), "sources": {}, "outputs": None}
+        return manifest
+
+    def _frame_path(self, key):
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode("utf-8")).hexdigest()[:16] + ".pkl")
+
+    def scan(self, csv_files, base_dir):
+        """
+        Vergelijkt de bronbestanden met het manifest.
+
+        The SHA-256 of a file is only computed when its mtime or size differs from the
+        manifest, so a file that was merely touched is not reprocessed.
+
+        Args:
+            csv_files: Paden van de bank-CSV's
+            base_dir: Map ten opzichte waarvan de bestanden in het manifest staan
+
+        Returns:
+            tuple: (sources, changed) with the new manifest entries per file and the
+                keys of the files that have to be read again
+        """
+        sources, changed = {}, []
+        for csv_file in csv_files:
+            key = os.path.relpath(csv_file, base_dir)
+            stat = os.stat(csv_file)
+            entry = self.manifest["sources"].get(key)
+            cached = entry is not None and os.path.exists(self._frame_path(key))
+
+            if cached and (entry["mtime"], entry["size"]) == (stat.st_mtime, stat.st_size):
+                # The manifest does not store the path; it is needed when the bank is reloaded anyway (force)
+                sources[key] = {**entry, "path": csv_file}
+                continue
+
+            sha256 = file_sha256(csv_file)
+            sources[key] = {"path": csv_file, "mtime": stat.st_mtime, "size": stat.st_size, "sha256": sha256}
+            if not (cached and entry["sha256"] == sha256):
+                changed.append(key)
+        return sources, changed
+
+    @staticmethod
+    def outputs_signature(sources):
+        """Hash van de bronnen waaruit de outputbestanden gemaakt zijn."""
+        text = json.dumps(sorted((key, entry["sha256"]) for key, entry in sources.items()))
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def is_up_to_date(self, sources, changed, output_files):
+        """True als geen bron gewijzigd is en de outputs van precies deze bronnen nog bestaan."""
+        return (
+            not changed
+            and self.manifest.get("outputs") == self.outputs_signature(sources)
+            and all(os.path.exists(output_file) for output_file in output_files)
+        )
+
+    def load_frames(self, sources, changed):
+        """
+        Geeft de gecategoriseerde frames van alle bronnen, in de volgorde van sources.
+
+        Changed banks are read and categorized in a thread pool and written to the cache;
+        the others are read from the cache.
+        """
+        changed_frames = {}
+        if changed:
+            with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(changed))) as executor:
+                frames = executor.map(load_categorized_dataframe, [sources[key]["path"] for key in changed])
+                changed_frames = dict(zip(changed, frames))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        frames = []
+        for key in sources:
+            if key in changed_frames:
+                frame = changed_frames[key]
+                frame.to_pickle(self._frame_path(key))
+            else:
+                frame = pd.read_pickle(self._frame_path(key))
+            frames.append(frame)
+        return frames
+
+    def save(self, sources, outputs_written):
+        """
+        Schrijft het manifest en verwijdert frames van banken die niet meer bestaan.
+
+        Args:
+            sources: Manifest entries per bron (see scan)
+            outputs_written: Whether the output files were written from these sources
+        """
+        for key in set(self.manifest["sources"]) - set(sources):
+            try:
+                os.remove(self._frame_path(key))
+            except OSError:
+                pass
+
+        self.manifest = {
+            "schema": schema_fingerprint(),
+            "sources": {key: {field: entry[field] for field in ("mtime", "size", "sha256")}
+                        for key, entry in sources.items()},
+            "outputs": self.outputs_signature(sources) if outputs_written else None
+        }
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.manifest, file, indent=2)
+        os.replace(temp_path, self.manifest_path)
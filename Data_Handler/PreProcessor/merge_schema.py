@@ -0,0 +1,55 @@
+"""
+Canonical schema van het samengevoegde creditcardbestand.
+
+Every bank's credit_cards.csv is renamed to these column names while it is read and
+its values are converted to the declared dtypes, so the merged frame has one
+consistent, compact type per column instead of a wide object-typed union.
+
+Dtypes:
+- "string": free text (links, names, requirements)
+- "category": codes and placeholders with few distinct values
+- "Float64" / "Int64": numbers; conversion only happens when it loses no values
+- "boolean": yes/no flags written as True/False or 1/0
+"""
+
+CANONICAL_SCHEMA = {
+    # Basic card details
+    "Bank_ID": "Int64",
+    "Card_Link": "string",
+    "Card_Image": "string",
+    "Card_ID": "string",
+    "Card_Type": "category",
+    "Card_Network": "category",
+    "Islamic": "boolean",
+
+    # Costs & fees; Annual_Fee also holds text such as "No Annual Fees"
+    "Annual_Fee": "string",
+    "Joining_Fee": "Float64",
+    "Interest_Rate_APR": "Float64",
+
+    # Requirements
+    "Minimum_Income": "Float64",
+    "Minimum_Age": "Float64",
+    "Minimum_Credit_Limit": "Float64",
+    "Eligibility_Requirements": "string",
+    "Employment_Type": "category",
+    "Nationality": "category",
+    "Residency_Required": "category",
+    "Credit_Score_Required": "category",
+    "Bank_Relationship_Required": "category",
+    "Fatwa_Approval": "category",
+}
+
+# Kolommen van de generieke CSV/CSVHandler-layout (o.a. gebruikt door EmiratesNbd)
+GENERIC_COLUMN_MAPPING = {
+    "Min_Age": "Minimum_Age",
+}
+
+# Per bank (map onder Scrapers/) de kolommen die een andere naam hebben dan in het canonieke schema.
+# ADIB, Adcb, Dib, Hsbc en Rakbank schrijven al de canonieke namen.
+BANK_COLUMN_MAPPINGS = {
+    "EmiratesNbd": GENERIC_COLUMN_MAPPING,
+    "Mashreq": {
+        "Primary_Annual_Fee": "Annual_Fee",
+    },
+}
@@ -1,17 +1,187 @@
+"""
+Chrome WebDriver voor de scrapers.
+
+The ChromeDriver binary is resolved once and its path cached in DRIVER_PATH_CACHE, so
+later runs start without a network lookup (and work offline). Browsers are headless
+by default and do not load images or fonts, which the scrapers never read.
+
+WebDriverSetup gives a scraper one browser; DriverPool keeps several warm browsers
+that are checked out per card page, so the card pages of one bank can be scraped in
+parallel.
+
+Environment:
+- CHROMEDRIVER_PATH: path of the ChromeDriver binary (skips the lookup)
+- SCRAPER_HEADLESS: "0" to show the browser window
+- SCRAPER_POOL_SIZE: default number of browsers in a DriverPool
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+DRIVER_PATH_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chromedriver_path")
+DEFAULT_POOL_SIZE = int(os.environ.get("SCRAPER_POOL_SIZE", "2"))
+
+# Chrome content setting 2 = blokkeren
+BLOCKED_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+}
+# Fonts have no content setting in Chrome, they are blocked by URL through DevTools
+BLOCKED_URL_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+
+_driver_path_lock = threading.Lock()
+
+
+def default_headless():
+    """Headless tenzij SCRAPER_HEADLESS uitgeschakeld is."""
+    return os.environ.get("SCRAPER_HEADLESS", "1").lower() not in ("0", "false", "no")
+
+
+def resolve_driver_path():
+    """
+    Geeft het pad van de ChromeDriver binary.
+
+    CHROMEDRIVER_PATH wins, then the cached path if that binary still exists; only
+    otherwise ChromeDriverManager installs it and the path is cached.
+    """
+    if os.environ.get("CHROMEDRIVER_PATH"):
+        return os.environ["CHROMEDRIVER_PATH"]
+
+    with _driver_path_lock:
+        try:
+            with open(DRIVER_PATH_CACHE, encoding="utf-8") as file:
+                cached_path = file.read().strip()
+            if cached_path and os.path.isfile(cached_path):
+                return cached_path
+        except OSError:
+            pass
+
+        driver_path = ChromeDriverManager().install()
+        try:
+            with open(DRIVER_PATH_CACHE, "w", encoding="utf-8") as file:
+                file.write(driver_path)
+        except OSError as e:
+            print(f"⚠️ Could not cache the ChromeDriver path: {e}")
+        return driver_path
+
+
+def create_driver(headless=None, block_media=True):
+    """
+    Start een Chrome browser.
+
+    Args:
+        headless: Run without a window; default from SCRAPER_HEADLESS (headless)
+        block_media: Do not load images and fonts
+
+    Returns:
+        The Chrome WebDriver
+    """
+    if headless is None:
+        headless = default_headless()
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    if block_media:
+        options.add_experimental_option("prefs", BLOCKED_CONTENT_PREFS)
+
+    driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=options)
+    if block_media:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"⚠️ Could not block font downloads: {e}")
+    return driver
+
+
 class WebDriverSetup:
-    def __init__(self):
-        self.service = Service(ChromeDriverManager().install())
-        self.options = webdriver.ChromeOptions()
-        #self.options.add_argument("--headless")  # Uncomment to run in the background
-        self.driver = webdriver.Chrome(service=self.service, options=self.options)
+    def __init__(self, headless=None, block_media=True):
+        self.driver = create_driver(headless, block_media)
 
     def get_driver(self):
         return self.driver
 
     def close(self):
-        self.driver.quit()
\ No newline at end of file
+        self.driver.quit()
+
+
+class DriverPool:
+    """
+    Een vast aantal warme browsers die per kaartpagina uitgeleend worden.
+
+    Args:
+        size: Number of browsers, started in parallel when the pool is created
+        headless: See create_driver
+        block_media: See create_driver
+
+    Usage:
+        with DriverPool(size=3) as pool:
+            details = pool.map(scrape_card_details, cards)
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, headless=None, block_media=True):
+        self.size = max(1, size)
+        self.headless = headless
+        self.block_media = block_media
+        self._available = queue.Queue()
+        self._drivers = []
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(create_driver, headless, block_media) for _ in range(self.size)]
+        try:
+            for future in futures:
+                self._drivers.append(future.result())
+        except Exception:
+            # Browsers die wel gestart zijn niet laten hangen
+            for future in futures:
+                if future.exception() is None:
+                    future.result().quit()
+            raise
+        for driver in self._drivers:
+            self._available.put(driver)
+
+    @contextmanager
+    def checkout(self):
+        """Leent een browser uit; wacht tot er een vrij is."""
+        driver = self._available.get()
+        try:
+            yield driver
+        finally:
+            self._available.put(driver)
+
+    def map(self, func, items):
+        """
+        Roept func(driver, item) aan voor elk item, parallel over de browsers.
+
+        Returns:
+            list: The results, in the order of items
+        """
+        def run(item):
+            with self.checkout() as driver:
+                return func(driver, item)
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(run, items))
+
+    def close(self):
+        """Sluit alle browsers."""
+        for driver in self._drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"⚠️ Could not close a browser: {e}")
+        self._drivers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,5 +1,5 @@
 from CSVHandler import CSVHandler
-from Data_Handler.Scrape_Data.ScraperClasses.WebDriverSetup import WebDriverSetup
+from Data_Handler.Scrape_Data.ScraperClasses.WebDriverSetup import DriverPool
 from Data_Handler.Scrape_Data.Scrapers.Adcb.CreditCardScraper import CreditCardScraper
 from Data_Handler.Scrape_Data.Scrapers.Adcb.RequirementsExtractor import extract_requirements
 from Data_Handler.Scrape_Data.Scrapers.Adcb.BenefitExtractor import scrape_benefits, map_benefits_to_csv  # ✅ Mappingfunctie toegevoegd
@@ -7,59 +7,67 @@ from Data_Handler.Scrape_Data.Scrapers.Adcb.BenefitExtractor import scrape_benef
 MAIN_URL = "https://www.adcb.com/en/personal/cards/credit-cards/#credit-card"
 MAIN_URL_ISLAMIC = "https://www.adcb.com/en/islamic/personal/cards/#covered-card"
 
+
+def scrape_card_details(driver, card, valid_columns):
+    """Haalt de requirements en benefits van één kaartpagina op met de gegeven browser."""
+    # ✅ Extract eligibility requirements dynamically
+    try:
+        card_requirements = extract_requirements(card["Card_Link"], driver)
+    except Exception as e:
+        print(f"❌ Error extracting requirements for {card['Card_ID']}: {e}")
+        card_requirements = {}
+
+    # ✅ Extract benefits dynamically
+    try:
+        benefits = scrape_benefits(card["Card_Link"], driver, max_retries=3)
+        benefit_data = map_benefits_to_csv(benefits, valid_columns)                # ✅ Map de benefits naar CSV-structuur
+        filtered_benefit_data = {k: v for k, v in benefit_data.items() if k in valid_columns}  # ✅ Filter geldige kolommen
+        card.update(filtered_benefit_data)
+    except Exception as e:
+        print(f"❌ Error extracting benefits for {card['Card_ID']}: {e}")
+
+    return card, card_requirements
+
+
 if __name__ == "__main__":
     # ✅ Initialize CSV file
     CSVHandler.initialize_csv()
 
-    # ✅ Start Selenium WebDriver
-    web_driver_setup = WebDriverSetup()
-    driver = web_driver_setup.get_driver()
-    scraper = CreditCardScraper(driver)
-
     saved_card_names = set()
     valid_columns = set(CSVHandler.COLUMNS)  # ✅ Bepaal de geldige kolommen in de CSV
 
-    for url, is_islamic in [(MAIN_URL, False), (MAIN_URL_ISLAMIC, True)]:
-        # ✅ Fetch and extract card details
-        credit_cards = scraper.fetch_and_extract_cards(url, is_islamic)
-        print(f"🔍 Extracted {len(credit_cards)} cards to process for saving.")
-
-        for card in credit_cards:
-            if card["Card_ID"] in saved_card_names:
-                print(f"⚠️ Skipping duplicate: {card['Card_ID']}")
-                continue
-            saved_card_names.add(card["Card_ID"])
+    # ✅ Start a pool of warm Selenium WebDrivers; they are closed when the block ends, also on errors
+    with DriverPool() as pool:
+        for url, is_islamic in [(MAIN_URL, False), (MAIN_URL_ISLAMIC, True)]:
+            # ✅ Fetch and extract card details
+            with pool.checkout() as driver:
+                credit_cards = CreditCardScraper(driver).fetch_and_extract_cards(url, is_islamic)
+            print(f"🔍 Extracted {len(credit_cards)} cards to process for saving.")
 
-            # ✅ Extract eligibility requirements dynamically
-            try:
-                card_requirements = extract_requirements(card["Card_Link"], driver)
-            except Exception as e:
-                print(f"❌ Error extracting requirements for {card['Card_ID']}: {e}")
-                card_requirements = {}
+            new_cards = []
+            for card in credit_cards:
+                if card["Card_ID"] in saved_card_names:
+                    print(f"⚠️ Skipping duplicate: {card['Card_ID']}")
+                    continue
+                saved_card_names.add(card["Card_ID"])
+                new_cards.append(card)
 
-            # ✅ Extract benefits dynamically
-            try:
-                benefits = scrape_benefits(card["Card_Link"], driver, max_retries=3)
-                benefit_data = map_benefits_to_csv(benefits, valid_columns)                # ✅ Map de benefits naar CSV-structuur
-                filtered_benefit_data = {k: v for k, v in benefit_data.items() if k in valid_columns}  # ✅ Filter geldige kolommen
-                card.update(filtered_benefit_data)
-            except Exception as e:
-                print(f"❌ Error extracting benefits for {card['Card_ID']}: {e}")
+            # ✅ De kaartpagina's worden parallel over de browsers van de pool gescraped
+            details = pool.map(lambda driver, card: scrape_card_details(driver, card, valid_columns), new_cards)
 
-            print(f"✅ Saving card: {card['Card_ID']} to CSV")
-
-            # ✅ Als er meerdere resultaten zijn, opsplitsen
-            if isinstance(card_requirements, list):
-                for req in card_requirements:
-                    merged_card = card.copy()
-                    merged_card.update(req)
-                    print(f"✅ Saving card: {merged_card['Card_ID']} to CSV")
-                    CSVHandler.save_to_csv(merged_card)
-            else:
-                card.update(card_requirements)
+            for card, card_requirements in details:
                 print(f"✅ Saving card: {card['Card_ID']} to CSV")
-                CSVHandler.save_to_csv(card)
 
-    # ✅ Close the WebDriver session
-    web_driver_setup.close()
+                # ✅ Als er meerdere resultaten zijn, opsplitsen
+                if isinstance(card_requirements, list):
+                    for req in card_requirements:
+                        merged_card = card.copy()
+                        merged_card.update(req)
+                        print(f"✅ Saving card: {merged_card['Card_ID']} to CSV")
+                        CSVHandler.save_to_csv(merged_card)
+                else:
+                    card.update(card_requirements)
+                    print(f"✅ Saving card: {card['Card_ID']} to CSV")
+                    CSVHandler.save_to_csv(card)
+
     print(f"✅ Scraping completed. Data saved to {CSVHandler.CSV_FILE}!")
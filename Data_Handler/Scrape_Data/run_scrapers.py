@@ -0,0 +1,249 @@
+"""
+Scraper Orchestrator
+
+Runs the bank scrapers under Scrapers/ concurrently and writes a run report.
+
+Every Scrapers/<Bank>/Scraper_<Bank>.py is a script that scrapes in its
+`if __name__ == "__main__":` block and appends to credit_cards.csv in the working
+directory, so each bank runs as its own Python process with the bank folder as working
+directory. At most `workers` banks run at the same time, each with its own headless
+Chrome driver(s); a full refresh then takes about as long as the slowest bank instead
+of the sum of all banks.
+
+The ChromeDriver binary is resolved once before the banks start and handed to the
+workers, so they do not all download it at the same time.
+
+The output of every bank goes to Logs/<Bank>.log and the report (timing, card counts
+and failures per bank) to Logs/scrape_report.json.
+
+Usage:
+    python -m Data_Handler.Scrape_Data.run_scrapers [banks...] [--workers N] [--timeout SECONDS]
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SCRAPE_DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(os.path.dirname(SCRAPE_DATA_DIR))
+SCRAPERS_DIR = os.path.join(SCRAPE_DATA_DIR, "Scrapers")
+LOG_DIR = os.path.join(SCRAPE_DATA_DIR, "Logs")
+REPORT_FILE = "scrape_report.json"
+CSV_FILE = "credit_cards.csv"
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_TIMEOUT = 30 * 60  # Seconds per bank
+ERROR_TAIL_LINES = 20
+
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+STATUS_TIMEOUT = "timeout"
+
+
+def discover_scrapers(scrapers_dir: str = SCRAPERS_DIR) -> Dict[str, str]:
+    """
+    Zoekt de scraper van elke bank.
+
+    Returns:
+        Dictionary mapping the bank (folder name) to its Scraper_*.py script
+    """
+    scrapers = {}
+    for script in sorted(glob.glob(os.path.join(scrapers_dir, "*", "Scraper_*.py"))):
+        scrapers[os.path.basename(os.path.dirname(script))] = script
+    return scrapers
+
+
+def count_cards(csv_path: str) -> int:
+    """Aantal kaarten in een credit_cards.csv (0 als het bestand niet bestaat)."""
+    try:
+        with open(csv_path, newline="", encoding="utf-8") as file:
+            return max(0, sum(1 for _ in csv.reader(file)) - 1)
+    except OSError:
+        return 0
+
+
+def resolve_chromedriver() -> Optional[str]:
+    """Installeert ChromeDriver één keer voor alle workers; None als dat niet lukt."""
+    try:
+        from Data_Handler.Scrape_Data.ScraperClasses.WebDriverSetup import resolve_driver_path
+        return resolve_driver_path()
+    except Exception as e:
+        print(f"⚠️ Could not resolve ChromeDriver up front, every scraper resolves it itself: {e}")
+        return None
+
+
+def scraper_environment(driver_path: Optional[str]) -> Dict[str, str]:
+    """Omgeving van een scraperproces: imports vanuit de repo, headless Chrome."""
+    env = dict(os.environ)
+    python_path = [REPO_ROOT, SCRAPE_DATA_DIR]
+    if env.get("PYTHONPATH"):
+        python_path.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(python_path)
+    env["PYTHONUNBUFFERED"] = "1"
+    env["SCRAPER_HEADLESS"] = "1"
+    if driver_path:
+        env["CHROMEDRIVER_PATH"] = driver_path
+    return env
+
+
+def _tail(path: str, lines: int = ERROR_TAIL_LINES) -> str:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as file:
+            return "".join(file.readlines()[-lines:]).strip()
+    except OSError:
+        return ""
+
+
+def run_scraper(bank: str, script: str, env: Dict[str, str], timeout: float, log_dir: str = LOG_DIR) -> Dict:
+    """
+    Draait de scraper van één bank in een eigen proces.
+
+    Args:
+        bank: Name of the bank
+        script: Path of its Scraper_*.py
+        env: Environment of the process (see scraper_environment)
+        timeout: Seconds after which the scraper is stopped
+        log_dir: Folder for the output of the scraper
+
+    Returns:
+        Report entry with status, duration, card counts and the error, if any
+    """
+    bank_dir = os.path.dirname(script)
+    csv_path = os.path.join(bank_dir, CSV_FILE)
+    log_path = os.path.join(log_dir, f"{bank}.log")
+    cards_before = count_cards(csv_path)
+    error = None
+
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        try:
+            process = subprocess.run(
+                [sys.executable, script], cwd=bank_dir, env=env,
+                stdout=log_file, stderr=subprocess.STDOUT, timeout=timeout
+            )
+            returncode = process.returncode
+            status = STATUS_SUCCEEDED if returncode == 0 else STATUS_FAILED
+        except subprocess.TimeoutExpired:
+            returncode = None
+            status = STATUS_TIMEOUT
+            error = f"Stopped after {timeout:.0f} seconds"
+        except OSError as e:
+            returncode = None
+            status = STATUS_FAILED
+            error = str(e)
+    duration = time.perf_counter() - start
+
+    if status == STATUS_FAILED and error is None:
+        error = _tail(log_path) or f"Exited with code {returncode}"
+    cards_after = count_cards(csv_path)
+
+    return {
+        "bank": bank,
+        "status": status,
+        "returncode": returncode,
+        "duration_seconds": round(duration, 2),
+        "cards_before": cards_before,
+        "cards_after": cards_after,
+        "new_cards": cards_after - cards_before,
+        "log_file": os.path.relpath(log_path, REPO_ROOT),
+        "error": error
+    }
+
+
+def run_scrapers(banks: Optional[List[str]] = None, workers: int = DEFAULT_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT, scrapers_dir: str = SCRAPERS_DIR,
+                 log_dir: str = LOG_DIR) -> Dict:
+    """
+    Draait de scrapers van de gevraagde banken parallel.
+
+    Args:
+        banks: Names of the banks to scrape (case-insensitive); all banks if None
+        workers: Maximum number of scrapers running at the same time
+        timeout: Seconds after which a single scraper is stopped
+        scrapers_dir: Folder with one subfolder per bank
+        log_dir: Folder for the scraper output and the report
+
+    Returns:
+        The run report
+
+    Raises:
+        ValueError: If a bank has no scraper
+    """
+    scrapers = discover_scrapers(scrapers_dir)
+    if banks:
+        by_name = {bank.lower(): bank for bank in scrapers}
+        unknown = [bank for bank in banks if bank.lower() not in by_name]
+        if unknown:
+            raise ValueError(f"Unknown banks: {', '.join(unknown)} (available: {', '.join(scrapers)})")
+        scrapers = {by_name[bank.lower()]: scrapers[by_name[bank.lower()]] for bank in banks}
+
+    os.makedirs(log_dir, exist_ok=True)
+    workers = max(1, min(workers, len(scrapers) or 1))
+    env = scraper_environment(resolve_chromedriver() if scrapers else None)
+
+    print(f"🚀 Scraping {len(scrapers)} banks with {workers} workers...")
+    started_at = datetime.now()
+    start = time.perf_counter()
+    results = []
+    # Elke worker draait één scraperproces tegelijk
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_scraper, bank, script, env, timeout, log_dir)
+                   for bank, script in scrapers.items()]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            icon = "✅" if result["status"] == STATUS_SUCCEEDED else "❌"
+            print(f"{icon} {result['bank']}: {result['status']} in {result['duration_seconds']:.1f}s, "
+                  f"{result['cards_after']} cards ({result['new_cards']:+d})")
+    wall_time = time.perf_counter() - start
+
+    results.sort(key=lambda result: result["bank"])
+    failed = [result["bank"] for result in results if result["status"] != STATUS_SUCCEEDED]
+    report = {
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "workers": workers,
+        "wall_seconds": round(wall_time, 2),
+        "sequential_seconds": round(sum(result["duration_seconds"] for result in results), 2),
+        "total_cards": sum(result["cards_after"] for result in results),
+        "failed": failed,
+        "banks": results
+    }
+
+    report_path = os.path.join(log_dir, REPORT_FILE)
+    with open(report_path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    print(f"🏁 {len(results) - len(failed)} of {len(results)} banks succeeded in {wall_time:.1f}s "
+          f"(sequential: {report['sequential_seconds']:.1f}s), report: {report_path}")
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the bank scrapers in parallel.")
+    parser.add_argument("banks", nargs="*", help="Banks to scrape (default: all)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Scrapers running at the same time (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds per bank before it is stopped (default: {DEFAULT_TIMEOUT})")
+    args = parser.parse_args(argv)
+
+    try:
+        report = run_scrapers(args.banks or None, workers=args.workers, timeout=args.timeout)
+    except ValueError as e:
+        parser.error(str(e))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+import sys
+
+import pytest
+from qdrant_client import QdrantClient
+
+
+@pytest.fixture
+def memory_qdrant(monkeypatch):
+    """Point every loaded module that holds the shared Qdrant client at an in-memory client."""
+    client = QdrantClient(":memory:")
+    for name, module in list(sys.modules.items()):
+        if name.startswith("Credit_Card_Selector") and hasattr(module, "qdrant_client"):
+            monkeypatch.setattr(module, "qdrant_client", client)
+
+    from Credit_Card_Selector.Database import general_utils
+    monkeypatch.setattr(general_utils, "_ensured_indexes", set())
+    return client
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+import pytest
+
+from Credit_Card_Selector.Database.Credit_Card_Handler.credit_card_handler import build_card_payload
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler import card_catalogue as catalogue_module
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.card_catalogue import CardCatalogue
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.text_index import card_search_texts
+
+
+def make_cards(count):
+    cards = []
+    for i in range(count):
+        row = {"Card_ID": f"Card {i}", "Card_Link": f"https://bank.example/cards/{i}", "Annual_Fee": "No Fees"}
+        cards.append(SimpleNamespace(id=i, payload=build_card_payload(row)))
+    return cards
+
+
+@pytest.fixture
+def catalogue(monkeypatch):
+    cards = make_cards(20)
+    monkeypatch.setattr(catalogue_module, "scroll_all_points", lambda *args, **kwargs: cards)
+    return CardCatalogue("credit_cards", ttl_seconds=300)
+
+
+def test_search_texts_leave_out_internal_fields():
+    payload = build_card_payload({"Card_ID": "Visa Gold", "Annual_Fee": 300})
+
+    assert card_search_texts(payload) == ["visa gold", "300"]
+
+
+@pytest.mark.parametrize("term", ["ab", "f3", "e9", "0a"])
+def test_hex_like_terms_do_not_match_hashes(catalogue, term):
+    assert catalogue.search_cards(term) == []
+
+
+def test_search_matches_card_fields(catalogue):
+    assert [card.id for card in catalogue.search_cards("card 1")] == [1] + list(range(10, 20))
+    assert [card.id for card in catalogue.search_cards("CARDS/7")] == [7]
+
+
+def test_get_card_by_id_case_insensitive_or_link(catalogue):
+    assert catalogue.get_card("Card 3").id == 3
+    assert catalogue.get_card("  card 4 ").id == 4
+    assert catalogue.get_card("https://bank.example/cards/5").id == 5
+    assert catalogue.get_card("Card 99") is None
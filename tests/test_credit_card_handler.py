@@ -0,0 +1,94 @@
+import csv
+
+import numpy as np
+import pytest
+
+from Credit_Card_Selector.Database.general_utils import VECTOR_SIZE
+from Credit_Card_Selector.Database.Credit_Card_Handler import credit_card_handler
+from Credit_Card_Selector.Database.Credit_Card_Handler.credit_card_handler import (
+    CREDIT_CARDS_COLLECTION, update_credit_cards_from_csv
+)
+
+CARDS = [
+    {"Card_ID": f"Card {i}", "Card_Type": "1", "Card_Network": "2",
+     "Eligibility_Requirements": f"Salary {i}000", "Annual_Fee": "No Fees"}
+    for i in range(3)
+]
+
+
+@pytest.fixture
+def encoded(memory_qdrant, monkeypatch):
+    """Texts passed to the encoder, which returns a fixed vector per text."""
+    texts = []
+
+    def fake_encode_texts(batch, *args, **kwargs):
+        texts.extend(batch)
+        return [np.full(VECTOR_SIZE, 0.1 + i, dtype=np.float32).tolist() for i in range(len(batch))]
+
+    def fake_encode_text(text):
+        return fake_encode_texts([text])[0]
+
+    monkeypatch.setattr(credit_card_handler, "encode_texts", fake_encode_texts)
+    monkeypatch.setattr(credit_card_handler, "encode_text", fake_encode_text)
+    return texts
+
+
+def write_csv(path, cards):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=list(cards[0]))
+        writer.writeheader()
+        writer.writerows(cards)
+
+
+def stored_cards(client):
+    points, _ = client.scroll(CREDIT_CARDS_COLLECTION, limit=100, with_payload=True)
+    return {point.payload["Card_ID"]: point.payload for point in points}
+
+
+def test_card_by_card_update_only_encodes_changed_embedding_texts(tmp_path, encoded, memory_qdrant):
+    csv_path = str(tmp_path / "cards.csv")
+    write_csv(csv_path, CARDS)
+
+    success, _, stats = update_credit_cards_from_csv(csv_path, bulk=False)
+    assert success and stats["success_count"] == 3
+    assert len(encoded) == 3
+
+    # Nothing changed: no card is encoded again
+    encoded.clear()
+    assert update_credit_cards_from_csv(csv_path, bulk=False)[0]
+    assert encoded == []
+
+    # One embedded text and one other field changed: only the first card is encoded
+    changed = [dict(card) for card in CARDS]
+    changed[0]["Eligibility_Requirements"] = "Salary 9000"
+    changed[1]["Annual_Fee"] = "AED 300"
+    write_csv(csv_path, changed)
+    assert update_credit_cards_from_csv(csv_path, bulk=False)[0]
+    assert encoded == ["Card 0 1 2 Salary 9000"]
+
+    stored = stored_cards(memory_qdrant)
+    assert stored["Card 0"]["Eligibility_Requirements"] == "Salary 9000"
+    assert stored["Card 1"]["Annual_Fee"] == "AED 300"
+
+
+def test_card_by_card_update_reads_the_stored_hashes_once_per_chunk(tmp_path, encoded, memory_qdrant, monkeypatch):
+    csv_path = str(tmp_path / "cards.csv")
+    write_csv(csv_path, CARDS)
+    assert update_credit_cards_from_csv(csv_path, bulk=False)[0]
+
+    retrieved = []
+    retrieve = memory_qdrant.retrieve
+
+    def counting_retrieve(*args, **kwargs):
+        retrieved.append(kwargs.get("ids"))
+        return retrieve(*args, **kwargs)
+
+    monkeypatch.setattr(memory_qdrant, "retrieve", counting_retrieve)
+    changed = [dict(card) for card in CARDS]
+    changed[1]["Annual_Fee"] = "AED 300"
+    write_csv(csv_path, changed)
+    success, _, stats = update_credit_cards_from_csv(csv_path, bulk=False)
+
+    assert success and stats["success_count"] == 3
+    assert len(retrieved) == 1 and len(retrieved[0]) == 3
+    assert stored_cards(memory_qdrant)["Card 1"]["Annual_Fee"] == "AED 300"
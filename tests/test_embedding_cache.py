@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from Credit_Card_Selector.Database.embedding_cache import EmbeddingCache, text_key
+
+VECTOR_SIZE = 4
+
+
+def vector(value):
+    return [float(value)] * VECTOR_SIZE
+
+
+@pytest.fixture
+def open_cache(tmp_path):
+    def open_cache(capacity=3, model_name="model-a", vector_size=VECTOR_SIZE):
+        return EmbeddingCache(str(tmp_path), model_name, vector_size, capacity)
+    return open_cache
+
+
+def test_hits_survive_reopening(open_cache):
+    cache = open_cache()
+    cache.put_many(["a", "b"], [vector(1), vector(2)])
+
+    reopened = open_cache()
+    assert reopened.get_many(["a", "b", "c"]) == [vector(1), vector(2), None]
+
+
+def test_slot_with_other_key_is_a_miss(open_cache):
+    cache = open_cache()
+    cache.put_many(["a"], [vector(1)])
+
+    # Another process reused the slot of "a" for a different text
+    slot = cache._index[text_key("a")]
+    cache._keys[slot] = np.frombuffer(bytes.fromhex(text_key("other")), dtype=np.uint8)
+
+    assert cache.get_many(["a"]) == [None]
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(open_cache):
+    cache = open_cache(capacity=3)
+    cache.put_many(["a", "b", "c"], [vector(1), vector(2), vector(3)])
+    cache.get_many(["a"])  # "b" is now the least recently used
+
+    cache.put_many(["d"], [vector(4)])
+
+    assert cache.get_many(["a", "b", "c", "d"]) == [vector(1), None, vector(3), vector(4)]
+
+
+def test_lru_order_survives_reopening(open_cache):
+    cache = open_cache(capacity=3)
+    cache.put_many(["a", "b", "c"], [vector(1), vector(2), vector(3)])
+    cache.get_many(["a"])
+    cache.put_many(["b"], [vector(5)])  # order is now c, a, b
+
+    reopened = open_cache(capacity=3)
+    reopened.put_many(["d"], [vector(4)])
+
+    assert reopened.get_many(["a", "b", "c", "d"]) == [vector(1), vector(5), None, vector(4)]
+
+
+def test_other_model_or_size_starts_empty(open_cache):
+    open_cache().put_many(["a"], [vector(1)])
+
+    assert open_cache(model_name="model-b").get_many(["a"]) == [None]
+    assert open_cache(vector_size=8).get_many(["a"]) == [None]
+
+
+def test_vectors_of_wrong_size_are_not_stored(open_cache):
+    cache = open_cache()
+    cache.put_many(["a", "b"], [[1.0, 2.0], None])
+
+    assert len(cache) == 0
+
+
+def test_clear_empties_the_cache_on_disk(open_cache):
+    cache = open_cache()
+    cache.put_many(["a"], [vector(1)])
+    cache.clear()
+
+    assert open_cache().get_many(["a"]) == [None]
@@ -0,0 +1,69 @@
+import itertools
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.filter_engine import CompiledCards
+
+FILTER_CONFIG = {"Minimum_Income": "min", "Card_Type": "match"}
+
+
+def card(card_id, **payload):
+    return SimpleNamespace(id=card_id, payload={"Card_ID": card_id, **payload})
+
+
+def reference_filter(cards, criteria):
+    """Per-card comparison that CompiledCards replaces."""
+    result = []
+    for card in cards:
+        is_match = True
+        for field, filter_type in FILTER_CONFIG.items():
+            survey_value, card_value = criteria.get(field), card.payload.get(field)
+            if survey_value in [None, 0, ""] or card_value in [None, 0, ""]:
+                continue
+            if filter_type == "match" and str(survey_value).lower() != str(card_value).lower():
+                is_match = False
+            elif filter_type == "min":
+                try:
+                    is_match = is_match and not float(survey_value) > float(card_value)
+                except (ValueError, TypeError):
+                    continue
+        if is_match:
+            result.append(card)
+    return result
+
+
+CARDS = [
+    card("a", Minimum_Income=5000, Card_Type="Gold"),
+    card("b", Minimum_Income="15000", Card_Type="gold"),
+    card("c", Minimum_Income="", Card_Type="Platinum"),
+    card("d", Minimum_Income="on request", Card_Type=None),
+    card("e", Minimum_Income=0, Card_Type="Classic"),
+]
+
+
+@pytest.mark.parametrize("criteria, expected", [
+    ({}, ["a", "b", "c", "d", "e"]),
+    ({"Minimum_Income": 10000}, ["b", "c", "d", "e"]),
+    ({"Card_Type": "GOLD"}, ["a", "b", "d"]),
+    ({"Card_Type": "Titanium"}, ["d"]),
+    ({"Minimum_Income": "not a number", "Card_Type": ""}, ["a", "b", "c", "d", "e"]),
+    ({"Minimum_Income": 10000, "Card_Type": "gold"}, ["b", "d"]),
+])
+def test_filter_keeps_empty_values_and_original_order(criteria, expected):
+    compiled = CompiledCards(CARDS, FILTER_CONFIG)
+
+    assert [card.id for card in compiled.filter(criteria)] == expected
+
+
+def test_filter_matches_per_card_comparison():
+    rng = random.Random(7)
+    incomes = [None, 0, "", 3000, "8000", 12000.5, "n/a"]
+    card_types = [None, "", "Gold", "gold", "Platinum", "Classic"]
+    cards = [card(str(i), Minimum_Income=rng.choice(incomes), Card_Type=rng.choice(card_types)) for i in range(200)]
+    compiled = CompiledCards(cards, FILTER_CONFIG)
+
+    for income, card_type in itertools.product(incomes + [5000, 20000], card_types + ["Titanium"]):
+        criteria = {"Minimum_Income": income, "Card_Type": card_type}
+        assert compiled.filter(criteria) == reference_filter(cards, criteria), criteria
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from Credit_Card_Selector.Server.jobs import (
+    JobManager, JobStore, STATUS_FAILED, STATUS_QUEUED, STATUS_RUNNING, STATUS_SUCCEEDED
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def wait_for(store, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(job_id)
+        if job["status"] not in (STATUS_QUEUED, STATUS_RUNNING):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_only_one_active_job_per_kind(store):
+    job, created = store.create_or_get_active("merge")
+    same, created_again = store.create_or_get_active("merge")
+    other, created_other = store.create_or_get_active("refresh")
+
+    assert created and not created_again and created_other
+    assert same["id"] == job["id"] and other["id"] != job["id"]
+
+    store.update(job["id"], status=STATUS_SUCCEEDED)
+    assert store.create_or_get_active("merge")[1]
+
+
+def test_job_of_a_dead_process_is_reported_failed(store):
+    job, _ = store.create_or_get_active("merge")
+    store.update(job["id"], owner_pid=2 ** 22 + 12345)  # no such process
+
+    assert store.get(job["id"])["status"] == STATUS_FAILED
+    assert store.create_or_get_active("merge")[1]
+
+
+def test_manager_records_progress_and_result(store):
+    manager = JobManager(store, max_workers=1)
+
+    def work(progress):
+        for i in range(1, 4):
+            progress(i, 3)
+        return True, "done", {"cards": 3}
+
+    job, _ = manager.submit("refresh", work)
+    finished = wait_for(store, job["id"])
+
+    assert finished["status"] == STATUS_SUCCEEDED
+    assert finished["message"] == "done"
+    assert finished["result"] == {"cards": 3}
+    assert finished["progress"] == {"current": 3, "total": 3}
+
+
+def test_manager_reports_failures_and_exceptions(store):
+    manager = JobManager(store, max_workers=2)
+
+    def fail(progress):
+        return False, "no data", None
+
+    def crash(progress):
+        raise RuntimeError("boom")
+
+    failed = wait_for(store, manager.submit("merge", fail)[0]["id"])
+    crashed = wait_for(store, manager.submit("refresh", crash)[0]["id"])
+
+    assert (failed["status"], failed["error"]) == (STATUS_FAILED, "no data")
+    assert (crashed["status"], crashed["error"]) == (STATUS_FAILED, "boom")
+
+
+def test_manager_returns_running_job_instead_of_starting_another(store):
+    manager = JobManager(store, max_workers=2)
+    release = threading.Event()
+    runs = []
+
+    def work(progress):
+        runs.append(1)
+        release.wait(5)
+        return True, "done", None
+
+    first, created = manager.submit("merge", work)
+    second, created_again = manager.submit("merge", work)
+    release.set()
+    wait_for(store, first["id"])
+
+    assert created and not created_again
+    assert second["id"] == first["id"]
+    assert len(runs) == 1
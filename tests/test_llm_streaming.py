@@ -0,0 +1,174 @@
+import json
+
+import pytest
+from requests.exceptions import ChunkedEncodingError, ConnectionError
+
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler import llm_interaction
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler import credit_card_profiles_handler as profiles_handler
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.llm_interaction import (
+    LLMStreamError, StreamingCardParser, stream_llm_recommendations
+)
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.survey_api import stream_survey
+
+OUTPUT = (
+    'Here are the cards:\n```json\n['
+    '{"Card_ID": "Visa {Gold}", "Reason": "Says \\"no fees\\" }"},'
+    '{"Card_ID": "Cashback", "Details": {"Dining": {"Rate": 5}}},'
+    '{"Note": "no card id"},'
+    '{"Card_ID": broken},'
+    '{"Card_ID": "Miles"}'
+    ']\n```'
+)
+EXPECTED = [
+    {"Card_ID": "Visa {Gold}", "Reason": 'Says "no fees" }'},
+    {"Card_ID": "Cashback", "Details": {"Dining": {"Rate": 5}}},
+    {"Card_ID": "Miles"},
+]
+
+
+def test_parser_returns_complete_card_objects():
+    assert StreamingCardParser().feed(OUTPUT) == EXPECTED
+
+
+@pytest.mark.parametrize("piece_size", [1, 2, 3, 7, 16])
+def test_parser_result_does_not_depend_on_how_the_text_is_split(piece_size):
+    parser = StreamingCardParser()
+    cards = []
+    for start in range(0, len(OUTPUT), piece_size):
+        cards.extend(parser.feed(OUTPUT[start:start + piece_size]))
+
+    assert cards == EXPECTED
+
+
+def test_parser_returns_a_card_as_soon_as_it_is_closed():
+    parser = StreamingCardParser()
+
+    assert parser.feed('[{"Card_ID": "A"') == []
+    assert parser.feed('}, {"Card_ID"') == [{"Card_ID": "A"}]
+
+
+class FakeStreamResponse:
+    status_code = 200
+
+    def __init__(self, pieces):
+        self.lines = [json.dumps({"response": piece, "done": False}) for piece in pieces]
+        self.lines.append(json.dumps({"response": "", "done": True}))
+        self.read = 0
+        self.closed = False
+
+    def iter_lines(self, decode_unicode=True):
+        for line in self.lines:
+            self.read += 1
+            yield line
+
+    def close(self):
+        self.closed = True
+
+
+def test_stream_stops_reading_after_max_cards(monkeypatch):
+    pieces = ['[{"Card_ID": "A"},', '{"Card_ID": "B"},', '{"Card_ID": "C"},', '{"Card_ID": "D"}]']
+    response = FakeStreamResponse(pieces)
+    monkeypatch.setattr(llm_interaction.ollama_client, "generate", lambda payload, timeout, stream: response)
+
+    cards = list(stream_llm_recommendations("prompt", max_cards=2))
+
+    assert [card["Card_ID"] for card in cards] == ["A", "B"]
+    assert response.read == 2
+    assert response.closed
+
+
+class BrokenStreamResponse(FakeStreamResponse):
+    """Breaks off after the given number of lines, like a dropped connection."""
+
+    def __init__(self, pieces, break_after):
+        super().__init__(pieces)
+        self.break_after = break_after
+
+    def iter_lines(self, decode_unicode=True):
+        for line in self.lines[:self.break_after]:
+            self.read += 1
+            yield line
+        raise ChunkedEncodingError("connection dropped")
+
+
+def test_stream_is_retried_until_the_first_card(monkeypatch):
+    responses = [BrokenStreamResponse(['[{"Card_ID": "A"'], break_after=1),
+                 FakeStreamResponse(['[{"Card_ID": "A"}, ', '{"Card_ID": "B"}]'])]
+    calls = []
+
+    def generate(payload, timeout, stream):
+        calls.append(payload)
+        if len(calls) == 1:
+            raise ConnectionError("refused")
+        return responses.pop(0)
+
+    monkeypatch.setattr(llm_interaction.ollama_client, "generate", generate)
+
+    cards = list(stream_llm_recommendations("prompt", retry_delay=0))
+
+    assert [card["Card_ID"] for card in cards] == ["A", "B"]
+    assert len(calls) == 3
+
+
+def test_stream_that_breaks_after_a_card_raises(monkeypatch):
+    response = BrokenStreamResponse(['[{"Card_ID": "A"},', '{"Card_ID": "B"'], break_after=2)
+    calls = []
+    monkeypatch.setattr(llm_interaction.ollama_client, "generate",
+                        lambda payload, timeout, stream: calls.append(payload) or response)
+
+    cards = []
+    with pytest.raises(LLMStreamError):
+        for card in stream_llm_recommendations("prompt", retry_delay=0):
+            cards.append(card)
+
+    assert cards == [{"Card_ID": "A"}]
+    assert len(calls) == 1
+    assert response.closed
+
+
+def test_stream_that_ends_before_done_raises(monkeypatch):
+    response = FakeStreamResponse(['[{"Card_ID": "A"},'])
+    response.lines.pop()
+    monkeypatch.setattr(llm_interaction.ollama_client, "generate", lambda payload, timeout, stream: response)
+
+    with pytest.raises(LLMStreamError):
+        list(stream_llm_recommendations("prompt", retry_delay=0))
+
+
+@pytest.fixture
+def survey_pipeline(monkeypatch):
+    """Stubs every step of the survey handler except the LLM call; returns the stored recommendations."""
+    stored = []
+    monkeypatch.setattr(profiles_handler, "create_collection_if_not_exists", lambda name: None)
+    monkeypatch.setattr(profiles_handler, "build_survey_vector", lambda response: [0.0])
+    monkeypatch.setattr(profiles_handler, "is_similar_survey_existing", lambda vector: None)
+    monkeypatch.setattr(profiles_handler, "retrieve_filtered_cards", lambda response: [{"Card_ID": "A"}])
+    monkeypatch.setattr(profiles_handler, "store_recommendation_in_qdrant",
+                        lambda cards, response, vector: stored.append(cards) or True)
+    return stored
+
+
+def broken_llm_stream(cards, survey_response):
+    yield {"Card_ID": "A"}
+    raise LLMStreamError("connection dropped")
+
+
+def test_broken_stream_is_reported_and_not_stored(survey_pipeline, monkeypatch):
+    monkeypatch.setattr(profiles_handler, "stream_top_5_with_llm", broken_llm_stream)
+
+    events = list(stream_survey({"Survey_ID": "s1"}))
+
+    assert events[0] == ("card", {"Card_ID": "A"})
+    assert events[-1][0] == "error"
+    assert survey_pipeline == []
+
+
+def test_handle_survey_response_does_not_stream(survey_pipeline, monkeypatch):
+    monkeypatch.setattr(profiles_handler, "stream_top_5_with_llm", broken_llm_stream)
+    monkeypatch.setattr(profiles_handler, "generate_top_5_with_llm",
+                        lambda cards, survey_response: [{"Card_ID": "A"}, {"Card_ID": "B"}])
+
+    cards = profiles_handler.handle_survey_response({"Survey_ID": "s1"})
+
+    assert [card["Card_ID"] for card in cards] == ["A", "B"]
+    assert survey_pipeline == [cards]
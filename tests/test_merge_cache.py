@@ -0,0 +1,103 @@
+import os
+
+import pandas as pd
+import pytest
+
+from Data_Handler.PreProcessor import merge_cache
+from Data_Handler.PreProcessor.merge_cache import MergeCache, load_categorized_dataframe
+
+
+ADCB_KEY = os.path.join("Adcb", "credit_cards.csv")
+HSBC_KEY = os.path.join("Hsbc", "credit_cards.csv")
+
+
+def write_bank(scrapers, bank, rows):
+    folder = scrapers / bank
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / "credit_cards.csv"
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def banks(tmp_path):
+    scrapers = tmp_path / "Scrapers"
+    files = [
+        write_bank(scrapers, "Adcb", [{"Card_ID": "Adcb Dining", "Eligibility_Requirements": "restaurant cashback"}]),
+        write_bank(scrapers, "Hsbc", [{"Card_ID": "Hsbc Travel", "Eligibility_Requirements": "airline miles"}]),
+    ]
+    return scrapers, files
+
+
+def run_merge(cache_dir, scrapers, files):
+    """One merge as merge_and_categorize does it; returns the changed banks and the frames."""
+    cache = MergeCache(str(cache_dir))
+    sources, changed = cache.scan(files, str(scrapers))
+    frames = cache.load_frames(sources, changed)
+    cache.save(sources, outputs_written=True)
+    return changed, frames
+
+
+def test_unchanged_banks_are_not_reprocessed(tmp_path, banks):
+    scrapers, files = banks
+    changed, _ = run_merge(tmp_path / "cache", scrapers, files)
+    assert sorted(changed) == [ADCB_KEY, HSBC_KEY]
+
+    # Touching a file without changing its content does not count as a change
+    os.utime(files[0], (1, 1))
+    cache = MergeCache(str(tmp_path / "cache"))
+    sources, changed = cache.scan(files, str(scrapers))
+    assert changed == []
+
+    output = tmp_path / "merged.csv"
+    output.write_text("")
+    assert cache.is_up_to_date(sources, changed, [str(output)])
+    assert not cache.is_up_to_date(sources, changed, [str(tmp_path / "missing.csv")])
+
+
+def test_only_changed_bank_is_reloaded_and_result_matches_full_load(tmp_path, banks):
+    scrapers, files = banks
+    run_merge(tmp_path / "cache", scrapers, files)
+
+    write_bank(scrapers, "Hsbc", [{"Card_ID": "Hsbc Shopping", "Eligibility_Requirements": "mall discount"}])
+    changed, frames = run_merge(tmp_path / "cache", scrapers, files)
+
+    assert changed == [HSBC_KEY]
+    for frame, csv_file in zip(frames, files):
+        pd.testing.assert_frame_equal(frame, load_categorized_dataframe(csv_file))
+
+
+def test_removed_bank_is_dropped_from_the_cache(tmp_path, banks):
+    scrapers, files = banks
+    run_merge(tmp_path / "cache", scrapers, files)
+    pickles = set((tmp_path / "cache").glob("*.pkl"))
+
+    changed, frames = run_merge(tmp_path / "cache", scrapers, files[:1])
+
+    assert changed == [] and len(frames) == 1
+    assert len(set((tmp_path / "cache").glob("*.pkl"))) == len(pickles) - 1
+    assert list(MergeCache(str(tmp_path / "cache")).manifest["sources"]) == [ADCB_KEY]
+
+
+def test_schema_change_reprocesses_every_bank(tmp_path, banks, monkeypatch):
+    scrapers, files = banks
+    run_merge(tmp_path / "cache", scrapers, files)
+
+    monkeypatch.setattr(merge_cache, "schema_fingerprint", lambda: "other schema")
+    changed, _ = run_merge(tmp_path / "cache", scrapers, files)
+
+    assert len(changed) == 2
+
+
+def test_forced_merge_on_a_warm_cache_reloads_every_bank(tmp_path, banks):
+    scrapers, files = banks
+    run_merge(tmp_path / "cache", scrapers, files)
+
+    # As merge_and_categorize(force=True): every bank counts as changed
+    cache = MergeCache(str(tmp_path / "cache"))
+    sources, changed = cache.scan(files, str(scrapers))
+    assert changed == []
+    frames = cache.load_frames(sources, list(sources))
+
+    for frame, csv_file in zip(frames, files):
+        pd.testing.assert_frame_equal(frame, load_categorized_dataframe(csv_file))
@@ -0,0 +1,61 @@
+import uuid
+
+import numpy as np
+from qdrant_client.models import PointStruct
+
+from Credit_Card_Selector.Database.general_utils import VECTOR_SIZE, create_collection_if_not_exists
+from Credit_Card_Selector.Database.migrations import migrate_card_point_ids
+from Credit_Card_Selector.Database.Credit_Card_Handler.credit_card_handler import CREDIT_CARDS_COLLECTION, card_point_id
+
+
+def vector(index):
+    """One-hot vector; survives the normalization of the cosine collection."""
+    values = np.zeros(VECTOR_SIZE, dtype=np.float32)
+    values[index] = 1.0
+    return values.tolist()
+
+
+def stored_points(client):
+    points, _ = client.scroll(CREDIT_CARDS_COLLECTION, limit=100, with_payload=True, with_vectors=True)
+    return points
+
+
+def test_legacy_card_points_move_to_their_deterministic_id(memory_qdrant):
+    create_collection_if_not_exists(CREDIT_CARDS_COLLECTION)
+    legacy = [
+        ({"Card_ID": "Card A"}, 1),
+        ({"Card_ID": "Card A"}, 2),  # Duplicate of the same card
+        ({"Card_ID": "Card B"}, 3),
+        ({"Card_Link": "https://bank.example/card-c"}, 4),
+        ({"Card_Name": "No identifier"}, 5),
+    ]
+    memory_qdrant.upsert(CREDIT_CARDS_COLLECTION, points=[
+        PointStruct(id=str(uuid.uuid4()), vector=vector(value), payload=payload) for payload, value in legacy
+    ])
+    # Already migrated earlier
+    memory_qdrant.upsert(CREDIT_CARDS_COLLECTION, points=[
+        PointStruct(id=card_point_id({"Card_ID": "Card D"}), vector=vector(6), payload={"Card_ID": "Card D"})
+    ])
+
+    stats = migrate_card_point_ids(batch_size=2)
+
+    assert stats == {"checked": 6, "moved": 3, "duplicates_removed": 1, "without_identifier": 1}
+    points = stored_points(memory_qdrant)
+    by_id = {str(point.id): point for point in points}
+    assert len(points) == 5
+    for payload in ({"Card_ID": "Card A"}, {"Card_ID": "Card B"},
+                    {"Card_Link": "https://bank.example/card-c"}, {"Card_ID": "Card D"}):
+        point = by_id[card_point_id(payload)]
+        assert point.payload == payload
+        assert sum(1 for other in points if other.payload == payload) == 1
+
+    # The vectors are copied, not re-encoded
+    hot_index = {key: int(np.argmax(point.vector)) for key, point in by_id.items()}
+    assert hot_index[card_point_id({"Card_ID": "Card A"})] in (1, 2)
+    assert hot_index[card_point_id({"Card_ID": "Card B"})] == 3
+    assert hot_index[card_point_id({"Card_Link": "https://bank.example/card-c"})] == 4
+    assert hot_index[card_point_id({"Card_ID": "Card D"})] == 6
+
+    # A second run has nothing left to move
+    assert migrate_card_point_ids()["moved"] == 0
+    assert len(stored_points(memory_qdrant)) == 5
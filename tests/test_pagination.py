@@ -0,0 +1,69 @@
+import base64
+import json
+import uuid
+
+import pytest
+from flask import Flask
+
+from Credit_Card_Selector.Server.server_config import MAX_PAGE_SIZE, PAGE_SIZE
+from Credit_Card_Selector.Server.server_utils import decode_cursor, encode_cursor, extract_pagination_params
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.database_operations import page_point_ids
+
+app = Flask(__name__)
+
+
+def raw_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("offset", [0, 7, 2 ** 40, str(uuid.uuid4()), str(uuid.uuid5(uuid.NAMESPACE_URL, "card"))])
+def test_cursor_round_trips(offset):
+    cursor = encode_cursor(offset)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == offset
+
+
+def test_last_page_has_no_cursor():
+    assert encode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor!", "e30", "%%%", raw_cursor(True), raw_cursor({"id": 1}),
+                                    raw_cursor([1]), raw_cursor(None), raw_cursor(1.5)])
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("", (PAGE_SIZE, None)),
+    ("?limit=1", (1, None)),
+    (f"?limit={MAX_PAGE_SIZE}&cursor={encode_cursor(42)}", (MAX_PAGE_SIZE, 42)),
+])
+def test_pagination_params(query, expected):
+    with app.test_request_context(f"/cards{query}"):
+        assert extract_pagination_params() == expected
+
+
+@pytest.mark.parametrize("query", ["?limit=0", "?limit=-1", f"?limit={MAX_PAGE_SIZE + 1}", "?limit=ten",
+                                   "?limit=1.5", f"?cursor={raw_cursor(False)}"])
+def test_invalid_pagination_params_are_rejected(query):
+    with app.test_request_context(f"/cards{query}"):
+        with pytest.raises(ValueError):
+            extract_pagination_params()
+
+
+@pytest.mark.parametrize("limit", [1, 3, 10, 25])
+def test_pages_return_every_point_id_once(limit):
+    point_ids = [str(uuid.uuid4()) for _ in range(10)] + list(range(10))
+
+    seen = []
+    page, offset = page_point_ids(point_ids, limit)
+    seen.extend(page)
+    while offset is not None:
+        page, offset = page_point_ids(point_ids, limit, decode_cursor(encode_cursor(offset)))
+        assert 0 < len(page) <= limit
+        seen.extend(page)
+
+    assert sorted(seen, key=str) == sorted(point_ids, key=str)
+    assert len(seen) == len(set(seen))
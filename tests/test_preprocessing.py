@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+import pytest
+
+from Data_Handler.PreProcessor.PreProcessing import save_dataframe
+from Credit_Card_Selector.Database.Credit_Card_Handler import credit_card_handler
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"Card_ID": ["Card A", "Card B"], "Islamic": pd.array([True, None], dtype="boolean")})
+
+
+def test_save_dataframe_writes_typed_parquet_next_to_csv(tmp_path, frame):
+    pytest.importorskip("pyarrow")
+    csv_file = tmp_path / "merged_credit_cards.csv"
+
+    save_dataframe(frame, str(csv_file))
+
+    assert pd.read_csv(csv_file)["Card_ID"].tolist() == ["Card A", "Card B"]
+    parquet = pd.read_parquet(tmp_path / "merged_credit_cards.parquet")
+    assert str(parquet["Islamic"].dtype) == "boolean"
+
+
+def test_failed_parquet_write_removes_outdated_parquet(tmp_path, frame, monkeypatch):
+    csv_file = tmp_path / "merged_credit_cards.csv"
+    parquet_file = tmp_path / "merged_credit_cards.parquet"
+    parquet_file.write_bytes(b"partial")
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", fail)
+    save_dataframe(frame, str(csv_file))
+
+    assert csv_file.exists()
+    assert not parquet_file.exists()
+
+    # Without the Parquet file the database loader reads the CSV
+    monkeypatch.setattr(credit_card_handler, "CSV_PATH", str(csv_file))
+    monkeypatch.setattr(credit_card_handler, "PARQUET_PATH", str(parquet_file))
+    assert credit_card_handler.default_data_path() == str(csv_file)
+
+
+def test_loader_prefers_parquet_written_with_the_csv(tmp_path, monkeypatch):
+    csv_file, parquet_file = tmp_path / "cards.csv", tmp_path / "cards.parquet"
+    csv_file.write_text("Card_ID\n")
+    parquet_file.write_bytes(b"")
+    monkeypatch.setattr(credit_card_handler, "CSV_PATH", str(csv_file))
+    monkeypatch.setattr(credit_card_handler, "PARQUET_PATH", str(parquet_file))
+
+    os.utime(csv_file, (1000, 1000))
+    os.utime(parquet_file, (1000, 1000))
+    assert credit_card_handler.default_data_path() == str(parquet_file)
+
+    # A CSV that is newer than the Parquet file (e.g. after a pull) wins
+    os.utime(csv_file, (2000, 2000))
+    assert credit_card_handler.default_data_path() == str(csv_file)
@@ -0,0 +1,44 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler import async_pipeline
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler import credit_card_profiles_handler as profiles_handler
+
+GENERATED = [{"Card_ID": "Generated A"}, {"Card_ID": "Generated B"}]
+
+
+def similar_survey(cards):
+    return SimpleNamespace(score=0.99, payload={"Recommended_Cards": cards})
+
+
+@pytest.fixture
+def stub_pipelines(monkeypatch):
+    """Gives both survey handlers the same stubbed steps; returns a setter for the similar survey."""
+    similar = {"survey": None}
+    for module in (profiles_handler, async_pipeline):
+        monkeypatch.setattr(module, "create_collection_if_not_exists", lambda name: None)
+        monkeypatch.setattr(module, "build_survey_vector", lambda response: [0.0])
+        monkeypatch.setattr(module, "is_similar_survey_existing", lambda vector: similar["survey"])
+        monkeypatch.setattr(module, "retrieve_filtered_cards", lambda response: [{"Card_ID": "Candidate"}])
+        monkeypatch.setattr(module, "generate_top_5_with_llm", lambda cards, response: list(GENERATED))
+    monkeypatch.setattr(profiles_handler, "store_recommendation_in_qdrant", lambda cards, response, vector: True)
+    monkeypatch.setattr(async_pipeline.recommendation_writer, "submit", lambda cards, response, vector: None)
+    return lambda survey: similar.update(survey=survey)
+
+
+@pytest.mark.parametrize("survey, expected", [
+    (None, GENERATED),
+    (similar_survey([{"Card_ID": "Stored"}, {"Name": "no id"}, "text"]), [{"Card_ID": "Stored"}]),
+    (similar_survey([{"Name": "no id"}]), GENERATED),
+    (similar_survey("not a list"), GENERATED),
+    (SimpleNamespace(score=0.99, payload=None), GENERATED),
+])
+def test_sync_and_async_handlers_return_the_same_cards(stub_pipelines, survey, expected):
+    stub_pipelines(survey)
+
+    sync_cards = profiles_handler.handle_survey_response({"Survey_ID": "s1"})
+    async_cards = asyncio.run(async_pipeline.handle_survey_response_async({"Survey_ID": "s1"}))
+
+    assert sync_cards == async_cards == expected
@@ -0,0 +1,79 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from Credit_Card_Selector.Database.Credit_Card_Profiles_Handler.text_index import (
+    CollectionTextIndex, TextIndex, card_search_texts
+)
+
+DOCS = {
+    1: ["visa platinum", "cashback on dining"],
+    2: ["mastercard gold", "airport lounge access"],
+    3: ["visa signature", "travel miles", "12000"],
+}
+
+
+@pytest.fixture
+def index():
+    index = TextIndex()
+    for doc_id, texts in DOCS.items():
+        index.add(doc_id, texts)
+    return index
+
+
+def substring_search(docs, term):
+    return {doc_id for doc_id, texts in docs.items() if any(term.lower() in text for text in texts)}
+
+
+@pytest.mark.parametrize("term", ["", "v", "VISA", "isa s", "lounge access", "200", "dining x", "zzz"])
+def test_search_equals_substring_scan(index, term):
+    assert index.search(term) == substring_search(DOCS, term)
+
+
+def test_search_equals_substring_scan_on_random_texts():
+    rng = random.Random(3)
+    alphabet = "abc de"
+    docs = {i: ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))] for i in range(100)}
+    index = TextIndex()
+    index.sync(docs)
+
+    for term in {"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))) for _ in range(200)}:
+        assert index.search(term) == substring_search(docs, term), term
+
+
+def test_prefix_search_matches_word_starts(index):
+    assert index.search_prefix("sig") == {3}
+    assert index.search_prefix("A") == {2}
+    assert index.search_prefix("ash") == set()
+
+
+def test_replaced_and_removed_documents_are_not_found(index):
+    index.add(1, ["classic card"])
+    index.remove(2)
+
+    assert index.search("visa") == {3}
+    assert index.search("classic") == {1}
+    assert index.search("lounge") == set()
+    assert index.search_prefix("master") == set()
+
+
+def test_sync_only_reindexes_changed_documents(index):
+    docs = dict(DOCS)
+    docs[3] = ["visa infinite"]
+    del docs[2]
+
+    assert index.sync(docs) == (1, 1)
+    assert index.search("infinite") == {3}
+    assert len(index) == 2
+
+
+def test_collection_index_returns_collection_order():
+    points = [SimpleNamespace(id=point_id, payload={"Card_ID": name})
+              for point_id, name in [("p3", "Visa Gold"), ("p1", "Visa Classic"), ("p2", "Mastercard")]]
+    index = CollectionTextIndex(lambda: points, card_search_texts, ttl_seconds=300)
+
+    assert index.search("visa") == ["p3", "p1"]
+
+    index.add("p4", {"Card_ID": "Visa Infinite"})
+    assert index.search("visa") == ["p3", "p1", "p4"]